@@ -0,0 +1,35 @@
+"""
+Подготовка Django для бенчмарков: отдельная временная SQLite-база, чтобы не трогать db.sqlite3.
+Запуск из каталога backend: python -m benchmarks.<имя>
+"""
+import atexit
+import os
+import tempfile
+
+import django
+
+
+def setup(db_path=None):
+    """
+    Настраивает Django на файл базы db_path (по умолчанию — новый временный файл) и возвращает путь к нему.
+    Временный файл удаляется при завершении процесса.
+    """
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'car_dealership_backend.settings')
+    if db_path is None:
+        fd, db_path = tempfile.mkstemp(prefix='cars-bench-', suffix='.sqlite3')
+        os.close(fd)
+        atexit.register(_remove_database, db_path)
+    from django.conf import settings
+    settings.DATABASES['default']['NAME'] = db_path
+    # Бенчмарки шлют тысячи запросов с одного адреса; ограничение частоты включают только те, что его измеряют
+    settings.CARS_THROTTLE = {**settings.CARS_THROTTLE, 'ENABLED': False}
+    django.setup()
+    return db_path
+
+
+def _remove_database(db_path):
+    for suffix in ('', '-wal', '-shm', '-journal'):
+        try:
+            os.remove(db_path + suffix)
+        except FileNotFoundError:
+            pass
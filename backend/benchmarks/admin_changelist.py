@@ -0,0 +1,79 @@
+"""
+Список автомобилей в админке на большой таблице: прежняя конфигурация CarAdmin (полный COUNT(*),
+SELECT DISTINCT для фильтров по марке, году и владельцу, date_hierarchy, icontains-поиск, JOIN с auth_user)
+против текущей (cars/admin.py). Представление вызывается напрямую и рендерится целиком,
+для каждого сценария выводятся число SQL-запросов и медиана времени.
+
+    python -m benchmarks.admin_changelist --cars 500000 --repeat 5
+"""
+import argparse
+import statistics
+import time
+
+from benchmarks import _bootstrap
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cars', type=int, default=500000, help='Автомобилей в таблице')
+    parser.add_argument('--users', type=int, default=2000, help='Пользователей (варианты фильтра по владельцу)')
+    parser.add_argument('--repeat', type=int, default=5, help='Повторов каждого сценария')
+    parser.add_argument('--db', help='Путь к файлу SQLite (по умолчанию временный файл)')
+    args = parser.parse_args()
+
+    _bootstrap.setup(args.db)
+    from django.conf import settings
+    from django.contrib import admin
+    from django.contrib.auth.models import User
+    from django.core.management import call_command
+    from django.db import connection
+    from django.test import RequestFactory
+    from django.test.utils import CaptureQueriesContext
+    from benchmarks.data import make_users, seed_cars
+    from cars.admin import CarAdmin
+    from cars.models import Car
+
+    class LegacyCarAdmin(admin.ModelAdmin):
+        list_display = ('make', 'model', 'year', 'price', 'is_available', 'owner', 'created_at')
+        list_filter = ('is_available', 'make', 'year', 'owner')
+        search_fields = ('make', 'model', 'description')
+        date_hierarchy = 'created_at'
+
+    settings.ALLOWED_HOSTS = ['testserver']
+    call_command('migrate', verbosity=0)
+    make_users(args.users, prefix='user')
+    seed_cars(args.cars)
+    superuser = User.objects.create_superuser('bench-admin', 'admin@example.com', 'password')
+    car = Car.objects.order_by('pk').first()
+    factory = RequestFactory()
+
+    scenarios = [
+        ('список', {}),
+        ('марка', {'make': car.make}),
+        ('год', {'year': car.year}),
+        ('владелец', {'owner__id__exact': car.owner_id}),
+        ('поиск', {'q': car.model}),
+        ('страница 50', {'p': 50}),
+    ]
+    print(f'{args.cars} автомобилей, {args.users} пользователей')
+    print(f'{"сценарий":14} {"было: запросов":>15} {"мс":>9} {"стало: запросов":>16} {"мс":>9}')
+    for label, params in scenarios:
+        row = []
+        for admin_class in (LegacyCarAdmin, CarAdmin):
+            model_admin = admin_class(Car, admin.site)
+            timings = []
+            for _ in range(args.repeat):
+                request = factory.get('/admin/cars/car/', params)
+                request.user = superuser
+                with CaptureQueriesContext(connection) as queries:
+                    start = time.perf_counter()
+                    response = model_admin.changelist_view(request)
+                    response.render()
+                    timings.append(time.perf_counter() - start)
+                assert response.status_code == 200, response.status_code
+            row += [len(queries), statistics.median(timings) * 1000]
+        print(f'{label:14} {row[0]:>15} {row[1]:>9.1f} {row[2]:>16} {row[3]:>9.1f}')
+
+
+if __name__ == '__main__':
+    main()
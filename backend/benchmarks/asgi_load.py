@@ -0,0 +1,114 @@
+"""
+Нагрузочный тест чтения каталога под ASGI: синхронный CarViewSet (/api/cars/, каждый запрос уходит
+в поток через sync_to_async) против асинхронных представлений (/api/async/cars/).
+Запросы подаются прямо в ASGI-приложение проекта (car_dealership_backend.asgi) из N конкурентных
+корутин, без сетевого сервера, поэтому сравнивается именно обработка запроса Django.
+Кэш ответов по умолчанию отключён, чтобы оба пути обращались к базе.
+
+    python -m benchmarks.asgi_load --rows 20000 --concurrency 50 --requests 2000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from benchmarks import _bootstrap
+
+QUERIES = [
+    '',
+    'make=toyota&ordering=-price',
+    'year_min=2015&page=3',
+    'pagination=cursor&ordering=price',
+]
+
+
+async def asgi_get(app, path, query_string):
+    """
+    Один GET-запрос к ASGI-приложению; возвращает HTTP-статус.
+    """
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+        'path': path, 'raw_path': path.encode(), 'query_string': query_string.encode(), 'root_path': '',
+        'headers': [(b'host', b'testserver'), (b'accept', b'application/json')],
+        'client': ('127.0.0.1', 50000), 'server': ('testserver', 80),
+    }
+    request_sent = False
+    result = {}
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        # Клиент не отключается: ждём, пока Django сам отменит ожидание после ответа
+        await asyncio.Future()
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            result['status'] = message['status']
+
+    await app(scope, receive, send)
+    return result.get('status')
+
+
+async def run_load(app, path, total, concurrency):
+    latencies, errors = [], 0
+    counter = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for number in counter:
+            query = QUERIES[number % len(QUERIES)]
+            start = time.perf_counter()
+            status = await asgi_get(app, path, query)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if status != 200:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        'rps': total / elapsed,
+        'p50': statistics.median(latencies),
+        'p99': latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+        'errors': errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=20000, help='Количество синтетических автомобилей')
+    parser.add_argument('--requests', type=int, default=2000, help='Запросов на каждый путь')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 10, 50], help='Число конкурентных клиентов')
+    parser.add_argument('--cache', action='store_true', help='Не отключать кэш ответов на синхронном пути')
+    parser.add_argument('--db', help='Путь к файлу SQLite (по умолчанию временный файл)')
+    args = parser.parse_args()
+
+    _bootstrap.setup(args.db)
+    from django.conf import settings
+    from django.core.management import call_command
+    from benchmarks.data import seed_cars
+
+    settings.ALLOWED_HOSTS = ['testserver']
+    if not args.cache:
+        settings.CARS_RESPONSE_CACHE = {**settings.CARS_RESPONSE_CACHE, 'ENABLED': False}
+    call_command('migrate', verbosity=0)
+    seed_cars(args.rows)
+
+    from car_dealership_backend.asgi import application
+
+    print(f'{"путь":18} {"клиентов":>8} {"запросов/с":>11} {"p50, мс":>9} {"p99, мс":>9} {"ошибок":>7}')
+    for concurrency in args.concurrency:
+        for path in ('/api/cars/', '/api/async/cars/'):
+            asyncio.run(run_load(application, path, min(50, args.requests), concurrency))  # прогрев
+            result = asyncio.run(run_load(application, path, args.requests, concurrency))
+            print(
+                f'{path:18} {concurrency:>8} {result["rps"]:>11.0f} {result["p50"]:>9.1f} '
+                f'{result["p99"]:>9.1f} {result["errors"]:>7}'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Бенчмарк пакетной синхронизации склада через /api/cars/bulk/ против поштучных запросов.
+
+    python -m benchmarks.bulk --rows 10000
+"""
+import argparse
+import time
+
+from benchmarks import _bootstrap
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10000, help='Автомобилей в пакете')
+    parser.add_argument('--single', type=int, default=200, help='Сколько поштучных POST выполнить для сравнения')
+    parser.add_argument('--db', help='Путь к файлу SQLite (по умолчанию временный файл)')
+    args = parser.parse_args()
+
+    _bootstrap.setup(args.db)
+    from django.conf import settings
+    from django.core.management import call_command
+    from rest_framework.test import APIClient
+    from benchmarks.data import iter_car_kwargs, make_users
+
+    settings.ALLOWED_HOSTS = ['testserver']
+    call_command('migrate', verbosity=0)
+    dealer = make_users(1)[0]
+    client = APIClient()
+    client.force_authenticate(user=dealer)
+
+    def payload(count, seed):
+        rows = []
+        for kwargs in iter_car_kwargs(count, [dealer.pk], seed=seed):
+            kwargs.pop('owner_id')
+            kwargs['price'] = str(kwargs['price'])
+            rows.append(kwargs)
+        return rows
+
+    start = time.perf_counter()
+    for row in payload(args.single, seed=1):
+        client.post('/api/cars/', row, format='json')
+    single = (time.perf_counter() - start) / args.single
+    print(f'Поштучный POST: {single * 1000:.2f} мс/шт, оценка для {args.rows}: {single * args.rows:.1f} s')
+
+    start = time.perf_counter()
+    response = client.post('/api/cars/bulk/', payload(args.rows, seed=2), format='json')
+    print(f'Пакетный POST {args.rows}: {time.perf_counter() - start:.2f} s (HTTP {response.status_code})')
+    ids = [car['id'] for car in response.json()]
+
+    changes = [{'id': pk, 'price': '12345.00', 'is_available': False} for pk in ids]
+    start = time.perf_counter()
+    response = client.patch('/api/cars/bulk/', changes, format='json')
+    print(f'Пакетный PATCH {args.rows}: {time.perf_counter() - start:.2f} s (HTTP {response.status_code})')
+
+    start = time.perf_counter()
+    response = client.delete('/api/cars/bulk/', ids, format='json')
+    print(f'Пакетный DELETE {args.rows}: {time.perf_counter() - start:.2f} s (HTTP {response.status_code})')
+
+
+if __name__ == '__main__':
+    main()
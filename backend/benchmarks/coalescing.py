@@ -0,0 +1,158 @@
+"""
+Нагрузочный тест всплеска одинаковых анонимных запросов к /api/cars/ (краулеры с одними и теми же фильтрами).
+Приложение обслуживается многопоточным WSGI-сервером в этом же процессе; в каждом раунде каталог
+помечается изменённым (cache.bump_generation), и --clients потоков одновременно отправляют один и тот же запрос.
+Сравниваются раунды без объединения промахов и с ним (CARS_RESPONSE_CACHE['COALESCE']): SQL-запросы
+на раунд (по всем соединениям) и время раунда. Затем — доля ответов 429 для одного анонимного клиента,
+который шлёт вдвое больше ставки 'anon' (CARS_THROTTLE).
+
+    python -m benchmarks.coalescing --rows 50000 --clients 32 --rounds 20
+"""
+import argparse
+import http.client
+import logging
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+from benchmarks import _bootstrap
+
+QUERY = '/api/cars/?make=toyota&year_min=2012&ordering=-price&page=3'
+
+
+class ThreadPoolServer(WSGIServer):
+    """
+    Сервер с постоянным пулом потоков, как gthread-воркер gunicorn: соединения с базой (CONN_MAX_AGE)
+    живут в потоках пула, а не открываются заново для каждого запроса.
+    """
+    pool = None
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self._handle, request, client_address)
+
+    def _handle(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+class QueryCounter:
+    """
+    Обёртка выполнения SQL для всех соединений: общее число запросов.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        with self.lock:
+            self.count += 1
+        return execute(sql, params, many, context)
+
+    def install(self, sender=None, connection=None, **kwargs):
+        connection.execute_wrappers.append(self)
+
+
+def get(port, path):
+    connection = http.client.HTTPConnection('127.0.0.1', port)
+    try:
+        connection.request('GET', path)
+        response = connection.getresponse()
+        response.read()
+        return response.status, response.getheader('X-Cache')
+    finally:
+        connection.close()
+
+
+def burst(port, clients):
+    """
+    Один раунд: clients потоков стартуют одновременно; возвращает (время раунда, статусы X-Cache).
+    """
+    barrier, results = threading.Barrier(clients + 1), []
+
+    def client():
+        barrier.wait()
+        results.append(get(port, QUERY))
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    assert all(status == 200 for status, _ in results), results
+    return elapsed, [outcome for _, outcome in results]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=50000, help='Количество синтетических автомобилей')
+    parser.add_argument('--clients', type=int, default=32, help='Одновременных одинаковых запросов в раунде')
+    parser.add_argument('--rounds', type=int, default=20, help='Раундов в каждом режиме')
+    parser.add_argument('--db', help='Путь к файлу SQLite (по умолчанию временный файл)')
+    args = parser.parse_args()
+
+    _bootstrap.setup(args.db)
+    from django.conf import settings
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.core.management import call_command
+    from django.db.backends.signals import connection_created
+    from rest_framework.settings import api_settings
+    from benchmarks.data import seed_cars
+    from cars import cache
+
+    settings.ALLOWED_HOSTS = ['*']
+    settings.CARS_METRICS = {**settings.CARS_METRICS, 'ENABLED': False}
+    call_command('migrate', verbosity=0)
+    seed_cars(args.rows)
+
+    counter = QueryCounter()
+    connection_created.connect(counter.install, weak=False)
+    logging.getLogger('django.request').setLevel(logging.ERROR)  # Ответы 429 не печатаются
+    ThreadPoolServer.request_queue_size = args.clients * 2
+    server = make_server('127.0.0.1', 0, WSGIHandler(), server_class=ThreadPoolServer, handler_class=QuietHandler)
+    server.pool = ThreadPoolExecutor(max_workers=args.clients)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+
+    print(f'{args.clients} одновременных запросов {QUERY}, {args.rounds} раундов')
+    print(f'{"объединение":12} {"SQL/раунд":>10} {"раунд, мс":>10} {"MISS":>6} {"COALESCED":>10}')
+    for coalesce in (False, True):
+        settings.CARS_RESPONSE_CACHE = {**settings.CARS_RESPONSE_CACHE, 'COALESCE': coalesce}
+        burst(port, args.clients)  # Прогрев: каждый поток пула открывает своё соединение с базой
+        queries, timings, outcomes = [], [], []
+        for _ in range(args.rounds):
+            cache.bump_generation()
+            before = counter.count
+            elapsed, round_outcomes = burst(port, args.clients)
+            queries.append(counter.count - before)
+            timings.append(elapsed * 1000)
+            outcomes += round_outcomes
+        label = 'включено' if coalesce else 'выключено'
+        print(
+            f'{label:12} {statistics.median(queries):>10.0f} {statistics.median(timings):>10.1f} '
+            f'{outcomes.count("MISS") / args.rounds:>6.1f} {outcomes.count("COALESCED") / args.rounds:>10.1f}'
+        )
+
+    settings.CARS_THROTTLE = {**settings.CARS_THROTTLE, 'ENABLED': True}
+    limit = int(api_settings.DEFAULT_THROTTLE_RATES['anon'].split('/')[0])
+    statuses = [get(port, QUERY)[0] for _ in range(limit * 2)]
+    print(f'\nОдин анонимный клиент, {limit * 2} запросов при ставке {api_settings.DEFAULT_THROTTLE_RATES["anon"]}: '
+          f'{statuses.count(200)} x 200, {statuses.count(429)} x 429')
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Детерминированный генератор синтетических объявлений для бенчмарков.
+"""
+import random
+from decimal import Decimal
+
+MAKES = {
+    'Toyota': ['Camry', 'Corolla', 'RAV4', 'Land Cruiser', 'Prius'],
+    'BMW': ['X5', 'X3', '320i', '530d', 'M3'],
+    'Honda': ['CRV', 'Civic', 'Accord', 'Pilot'],
+    'Audi': ['A4', 'A6', 'Q5', 'Q7'],
+    'Lada': ['Vesta', 'Granta', 'Niva', 'Largus'],
+    'Kia': ['Rio', 'Sportage', 'Ceed', 'Sorento'],
+    'Hyundai': ['Solaris', 'Creta', 'Tucson', 'Santa Fe'],
+    'Volkswagen': ['Polo', 'Golf', 'Tiguan', 'Passat'],
+    'Mercedes-Benz': ['C200', 'E300', 'GLC', 'GLE'],
+    'Tesla': ['Model 3', 'Model Y', 'Model S'],
+}
+COLORS = ['Black', 'White', 'Silver', 'Grey', 'Blue', 'Red', 'Green', 'Brown', None]
+WORDS = [
+    'reliable', 'family', 'sedan', 'suv', 'luxury', 'sporty', 'economical', 'diesel', 'hybrid',
+    'electric', 'leather', 'sunroof', 'navigation', 'camera', 'warranty', 'serviced', 'garage',
+    'winter', 'tires', 'automatic', 'manual', 'turbo', 'panoramic', 'heated', 'seats', 'owner',
+    'accident', 'free', 'original', 'paint', 'low', 'mileage', 'dealer', 'certified', 'cruise',
+]
+
+
+def make_users(count, prefix='dealer'):
+    """
+    Создаёт (или возвращает существующих) пользователей-владельцев объявлений.
+    """
+    from django.contrib.auth.models import User
+    existing = {u.username: u for u in User.objects.filter(username__startswith=prefix)}
+    missing = [
+        User(username=f'{prefix}{i}', email=f'{prefix}{i}@example.com', password='!')
+        for i in range(count) if f'{prefix}{i}' not in existing
+    ]
+    User.objects.bulk_create(missing)
+    return list(User.objects.filter(username__startswith=prefix).order_by('id'))
+
+
+def iter_car_kwargs(count, owner_ids, seed=42):
+    """
+    Генерирует значения полей Car; при одинаковом seed последовательность всегда одна и та же.
+    """
+    rnd = random.Random(seed)
+    makes = sorted(MAKES)
+    for _ in range(count):
+        make = rnd.choice(makes)
+        yield {
+            'make': make,
+            'model': rnd.choice(MAKES[make]),
+            'year': rnd.randint(1995, 2025),
+            'price': Decimal(rnd.randint(1500, 900000)) * 10,
+            'mileage': rnd.choice([None, rnd.randint(0, 400000)]),
+            'color': rnd.choice(COLORS),
+            'description': ' '.join(rnd.choice(WORDS) for _ in range(rnd.randint(5, 40))),
+            'is_available': rnd.random() < 0.8,
+            'owner_id': rnd.choice(owner_ids),
+        }
+
+
+def seed_cars(count, owners=50, seed=42, batch_size=5000):
+    """
+    Заполняет таблицу cars_car count синтетическими автомобилями.
+    """
+    from cars.models import Car
+    usernames = {u.pk: u.username for u in make_users(owners)}
+    batch = []
+    for kwargs in iter_car_kwargs(count, list(usernames), seed=seed):
+        # bulk_create обходит Car.save(), поэтому owner_username заполняем сами
+        batch.append(Car(owner_username=usernames[kwargs['owner_id']], **kwargs))
+        if len(batch) >= batch_size:
+            Car.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        Car.objects.bulk_create(batch)
+    # bulk_create обходит и сводки статистики (cars/summaries.py)
+    from cars import summaries
+    summaries.rebuild()
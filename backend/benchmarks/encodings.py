@@ -0,0 +1,78 @@
+"""
+Форматы ответа списка: размер тела и время кодирования страницы /api/cars/ в каждом формате —
+JSONRenderer DRF (json из стандартной библиотеки), FastJSONRenderer (orjson), столбцовый ?format=compact
+и MessagePack (если установлен msgpack); для каждого — размер после gzip и brotli (если установлен brotli)
+и время сжатия с настройками CARS_COMPRESSION.
+
+    python -m benchmarks.encodings --rows 5000 --page-sizes 10 100 1000
+"""
+import argparse
+import statistics
+import time
+
+from benchmarks import _bootstrap
+
+
+def median_ms(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=5000, help='Количество синтетических автомобилей')
+    parser.add_argument('--page-sizes', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--repeat', type=int, default=20, help='Повторов каждого замера')
+    parser.add_argument('--db', help='Путь к файлу SQLite (по умолчанию временный файл)')
+    args = parser.parse_args()
+
+    _bootstrap.setup(args.db)
+    from django.core.management import call_command
+    from rest_framework.renderers import JSONRenderer
+    from benchmarks.data import seed_cars
+    from cars import compression
+    from cars.models import Car
+    from cars.renderers import CompactJSONRenderer, FastJSONRenderer, MessagePackRenderer, msgpack, orjson
+    from cars.serializers import CarReadSerializer
+
+    call_command('migrate', verbosity=0)
+    seed_cars(args.rows)
+    config = compression.get_config()
+    renderers = [('DRF JSON', JSONRenderer()), ('orjson' if orjson else 'fast (json)', FastJSONRenderer()),
+                 ('compact', CompactJSONRenderer())]
+    if msgpack is not None:
+        renderers.append(('msgpack', MessagePackRenderer()))
+    encodings = list(reversed(compression.ENCODINGS))  # gzip, затем br
+    print(f'orjson: {"есть" if orjson else "нет"}, msgpack: {"есть" if msgpack else "нет"}, '
+          f'brotli: {"есть" if "br" in encodings else "нет"}')
+
+    header = f'{"строк":>6} {"формат":>12} {"байт":>9} {"кодир., мс":>11}'
+    for encoding in encodings:
+        header += f' {encoding + ", байт":>11} {encoding + ", мс":>9}'
+    print(header + '   кодир. быстрее DRF')
+    for page_size in args.page_sizes:
+        rows = Car.objects.order_by('-created_at').values(*CarReadSerializer.value_fields)[:page_size]
+        # Страница в том виде, в каком её отдаёт CarPagination
+        data = {
+            'count': args.rows, 'next': 'http://testserver/api/cars/?page=2', 'previous': None,
+            'results': CarReadSerializer(list(rows), many=True).data,
+        }
+        baseline = None
+        for name, renderer in renderers:
+            body = renderer.render(data)
+            encode_ms = median_ms(lambda: renderer.render(data), args.repeat)
+            baseline = baseline or encode_ms
+            line = f'{page_size:>6} {name:>12} {len(body):>9} {encode_ms:>11.3f}'
+            for encoding in encodings:
+                compressed = compression.compress(body, encoding, config)
+                compress_ms = median_ms(lambda: compression.compress(body, encoding, config), args.repeat)
+                line += f' {len(compressed):>11} {compress_ms:>9.3f}'
+            print(line + f'   {baseline / encode_ms:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Бенчмарк потоковой выгрузки /api/cars/export/: время до первого куска, общее время и пик памяти Python
+(tracemalloc) при разном размере выборки. Пик памяти не должен расти вместе с числом строк.
+
+    python -m benchmarks.export --rows 200000
+"""
+import argparse
+import time
+import tracemalloc
+
+from benchmarks import _bootstrap
+
+
+def measure(client, url):
+    start = time.perf_counter()
+    response = client.get(url)
+    stream = iter(response.streaming_content)
+    size = len(next(stream))
+    first_chunk = time.perf_counter() - start
+    for chunk in stream:
+        size += len(chunk)
+    total = time.perf_counter() - start
+
+    # Память — отдельным проходом: tracemalloc сильно замедляет выполнение
+    tracemalloc.start()
+    for chunk in client.get(url).streaming_content:
+        pass
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return first_chunk, total, size, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=200000, help='Количество синтетических автомобилей')
+    parser.add_argument('--db', help='Путь к файлу SQLite (по умолчанию временный файл)')
+    args = parser.parse_args()
+
+    _bootstrap.setup(args.db)
+    from django.conf import settings
+    from django.core.management import call_command
+    from rest_framework.test import APIClient
+    from benchmarks.data import make_users, seed_cars
+
+    settings.ALLOWED_HOSTS = ['testserver']
+    call_command('migrate', verbosity=0)
+    print(f'Генерация {args.rows} автомобилей...')
+    seed_cars(args.rows)
+
+    # Выгрузка доступна только аутентифицированным пользователям
+    client = APIClient()
+    client.force_authenticate(user=make_users(1)[0])
+    queries = [
+        ('make=toyota&year_min=2020', 'выборка по фильтру'),
+        ('', 'весь каталог'),
+    ]
+    for fmt in ('ndjson', 'csv'):
+        for query, label in queries:
+            first_chunk, total, size, peak = measure(client, f'/api/cars/export/?fmt={fmt}&{query}')
+            print(
+                f'{fmt:6} {label:20} первый кусок {first_chunk * 1000:7.1f} мс, всего {total:6.2f} s, '
+                f'{size / 2 ** 20:7.1f} МБ, пик памяти {peak / 2 ** 20:5.1f} МБ'
+            )
+
+
+if __name__ == '__main__':
+    main()
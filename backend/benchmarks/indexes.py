@@ -0,0 +1,110 @@
+"""
+Бенчмарк индексов cars_car: планы EXPLAIN и задержки типичных запросов CarViewSet
+без индексов из Car.Meta.indexes (как до миграции 0002_car_indexes) и с ними.
+
+    python -m benchmarks.indexes --rows 300000
+"""
+import argparse
+import statistics
+import time
+
+from benchmarks import _bootstrap
+
+# Формы запросов списка: параметры CarFilter и сортировка, как их присылает фронтенд
+SCENARIOS = [
+    ('default ordering', {}, '-created_at'),
+    ('available, newest', {'is_available': 'true'}, '-created_at'),
+    ('available, cheapest', {'is_available': 'true'}, 'price'),
+    ('available, by year', {'is_available': 'true'}, '-year'),
+    ('make', {'make': 'toyota'}, '-created_at'),
+    ('make + model', {'make': 'bmw', 'model': 'x5'}, '-created_at'),
+    ('price range', {'price_min': '100000', 'price_max': '150000'}, 'price'),
+    ('year range', {'year_min': '2020', 'year_max': '2021'}, '-year'),
+]
+
+
+def build_queryset(params, ordering):
+    from cars.filters import CarFilter
+    from cars.models import Car
+    return CarFilter(params, queryset=Car.objects.order_by(ordering)).qs
+
+
+def run_scenarios(repeat, page_size):
+    """
+    Для каждого сценария возвращает план запроса страницы и медианы COUNT(*) и выборки страницы (мс).
+    """
+    results = []
+    for name, params, ordering in SCENARIOS:
+        queryset = build_queryset(params, ordering)
+        page = queryset[:page_size]
+        count_times, page_times = [], []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            queryset.count()
+            count_times.append((time.perf_counter() - start) * 1000)
+            start = time.perf_counter()
+            list(page.all())
+            page_times.append((time.perf_counter() - start) * 1000)
+        results.append({
+            'name': name,
+            'plan': page.explain(),
+            'count_ms': statistics.median(count_times),
+            'page_ms': statistics.median(page_times),
+        })
+    return results
+
+
+def print_results(title, results):
+    print(f'\n=== {title} ===')
+    for result in results:
+        print(f"\n[{result['name']}] count: {result['count_ms']:.2f} ms, page: {result['page_ms']:.2f} ms")
+        for line in result['plan'].splitlines():
+            print(f'    {line}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=200000, help='Количество синтетических автомобилей')
+    parser.add_argument('--repeat', type=int, default=5, help='Повторов каждого запроса')
+    parser.add_argument('--page-size', type=int, default=10)
+    parser.add_argument('--db', help='Путь к файлу SQLite (по умолчанию временный файл)')
+    args = parser.parse_args()
+
+    db_path = _bootstrap.setup(args.db)
+    from django.core.management import call_command
+    from django.db import connection
+    from benchmarks.data import seed_cars
+    from cars.models import Car
+
+    print(f'База: {db_path}')
+    call_command('migrate', verbosity=0)
+    print(f'Генерация {args.rows} автомобилей...')
+    seed_cars(args.rows)
+
+    # Снимаем индексы модели, чтобы получить состояние до 0002_car_indexes, затем создаём их заново
+    with connection.schema_editor() as schema_editor:
+        for index in Car._meta.indexes:
+            schema_editor.remove_index(Car, index)
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+    before = run_scenarios(args.repeat, args.page_size)
+
+    with connection.schema_editor() as schema_editor:
+        for index in Car._meta.indexes:
+            schema_editor.add_index(Car, index)
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+    after = run_scenarios(args.repeat, args.page_size)
+
+    print_results('Без индексов', before)
+    print_results('С индексами Car.Meta.indexes', after)
+    print('\n=== Сводка (медиана, мс: count / page) ===')
+    for old, new in zip(before, after):
+        print(
+            f"{old['name']:<22} {old['count_ms']:>9.2f} / {old['page_ms']:<9.2f} -> "
+            f"{new['count_ms']:>9.2f} / {new['page_ms']:.2f}"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Фоновые задачи (cars/jobs.py): сколько стоит запись через API, когда после неё есть медленная работа,
+и с какой скоростью воркер разбирает очередь.
+Медленная работа имитируется задачей, которая спит --task-ms миллисекунд (как запрос к партнёру).
+Сравниваются PATCH /api/cars/<id>/ без задач, с задачей в очереди и с задачей, выполняемой сразу (EAGER),
+затем — время разбора очереди воркером с разным числом потоков.
+
+    python -m benchmarks.jobs_queue --requests 200 --jobs 400 --task-ms 20
+"""
+import argparse
+import statistics
+import time
+
+from benchmarks import _bootstrap
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=200, help='PATCH-запросов в каждом режиме')
+    parser.add_argument('--jobs', type=int, default=400, help='Заданий в очереди для воркера')
+    parser.add_argument('--task-ms', type=float, default=20, help='Длительность имитируемой задачи, мс')
+    parser.add_argument('--db', help='Путь к файлу SQLite (по умолчанию временный файл)')
+    args = parser.parse_args()
+
+    _bootstrap.setup(args.db)
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.test import Client
+    from rest_framework.authtoken.models import Token
+    from benchmarks.data import seed_cars
+    from cars import jobs
+    from cars.models import Car, Job
+
+    @jobs.task('benchmarks.slow')
+    def slow(car_id, **payload):
+        time.sleep(args.task_ms / 1000)
+
+    settings.ALLOWED_HOSTS = ['testserver']
+    call_command('migrate', verbosity=0)
+    seed_cars(max(args.jobs, 1000))
+    car = Car.objects.order_by('pk').first()
+    client = Client(HTTP_AUTHORIZATION=f'Token {Token.objects.get_or_create(user_id=car.owner_id)[0].key}')
+    url = f'/api/cars/{car.pk}/'
+
+    print(f'{"PATCH " + url:28} {"мс (медиана)":>13}')
+    for label, config in (
+        ('без задач', {'CAR_HOOKS': []}),
+        ('задача в очереди', {'CAR_HOOKS': ['benchmarks.slow']}),
+        ('задача сразу (EAGER)', {'CAR_HOOKS': ['benchmarks.slow'], 'EAGER': True}),
+    ):
+        settings.CARS_JOBS = {**settings.CARS_JOBS, **config}
+        timings = []
+        for number in range(args.requests):
+            start = time.perf_counter()
+            response = client.patch(url, {'price': f'{500000 + number}.00'}, content_type='application/json')
+            timings.append(time.perf_counter() - start)
+            assert response.status_code == 200, response.status_code
+        print(f'{label:28} {statistics.median(timings) * 1000:>13.2f}')
+
+    print(f'\n{args.jobs} заданий по {args.task_ms:g} мс')
+    print(f'{"потоков":>8} {"время, с":>9} {"заданий/с":>10}')
+    car_ids = list(Car.objects.values_list('pk', flat=True)[:args.jobs])
+    for concurrency in (1, 4, 8):
+        Job.objects.all().delete()
+        jobs.enqueue('benchmarks.slow', car_ids)
+        start = time.perf_counter()
+        done, failed = jobs.Worker(concurrency=concurrency, batch_size=20).run(once=True)
+        elapsed = time.perf_counter() - start
+        assert (done, failed) == (len(car_ids), 0), (done, failed)
+        print(f'{concurrency:>8} {elapsed:>9.2f} {done / elapsed:>10.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Пропускная способность выборки страницы списка на больших страницах (строк/с, выборка + сериализация + JSON):
+  модели + select_related('owner')  — полные строки cars_car и auth_user (пароль, e-mail и т. д.);
+  .values() + owner__username       — только нужные колонки, но JOIN с auth_user;
+  .values() + owner_username        — только нужные колонки одной таблицы (CarViewSet сейчас).
+
+    python -m benchmarks.list_projection --rows 50000 --page-sizes 500 2000 10000
+"""
+import argparse
+import statistics
+import time
+
+from benchmarks import _bootstrap
+
+
+def median_seconds(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=50000, help='Количество синтетических автомобилей')
+    parser.add_argument('--page-sizes', type=int, nargs='+', default=[500, 2000, 10000])
+    parser.add_argument('--repeat', type=int, default=10, help='Повторов каждого замера')
+    parser.add_argument('--db', help='Путь к файлу SQLite (по умолчанию временный файл)')
+    args = parser.parse_args()
+
+    _bootstrap.setup(args.db)
+    from django.core.management import call_command
+    from rest_framework.renderers import JSONRenderer
+    from benchmarks.data import seed_cars
+    from cars.models import Car
+    from cars.serializers import CarReadSerializer, CarSerializer
+
+    call_command('migrate', verbosity=0)
+    seed_cars(args.rows)
+    renderer = JSONRenderer()
+    base = Car.objects.order_by('-created_at')
+    joined_fields = [*CarReadSerializer.value_fields[:-1], 'owner__username']
+
+    class JoinedReadSerializer(CarReadSerializer):
+        # Прежняя проекция: имя владельца через JOIN с auth_user
+        value_fields = joined_fields
+
+        def to_representation(self, row):
+            return super().to_representation({**row, 'owner_username': row['owner__username']})
+
+    variants = {
+        'select_related': lambda size: CarSerializer(base.select_related('owner')[:size], many=True).data,
+        'values + JOIN': lambda size: JoinedReadSerializer(base.values(*joined_fields)[:size], many=True).data,
+        'owner_username': lambda size: CarReadSerializer(
+            base.values(*CarReadSerializer.value_fields)[:size], many=True).data,
+    }
+
+    print(f'{"строк":>6} {"вариант":>16} {"мс":>9} {"строк/с":>10}')
+    for page_size in args.page_sizes:
+        outputs = {name: renderer.render(build(page_size)) for name, build in variants.items()}
+        assert len(set(outputs.values())) == 1, 'Варианты дают разный JSON'
+        for name, build in variants.items():
+            seconds = median_seconds(lambda: renderer.render(build(page_size)), args.repeat)
+            rows = min(page_size, args.rows)
+            print(f'{page_size:>6} {name:>16} {seconds * 1000:>9.1f} {rows / seconds:>10.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Накладные расходы PerformanceMiddleware (cars/middleware.py): время запроса к /api/cars/ с включёнными
+и отключёнными метриками (CARS_METRICS['ENABLED']). Запросы идут через WSGI-обработчик тестового клиента
+Django попеременно в двух режимах, чтобы фоновые колебания нагрузки влияли на оба одинаково.
+Порядок режимов в паре тоже чередуется: второй запрос пары систематически медленнее на 15–25 мкс,
+и при постоянном порядке это смещение выдавалось бы за расходы метрик (сравнение «без метрик / без метрик»
+с постоянным порядком показывает те же ~2% на ответах из кэша).
+Сравниваются медианы; с кэшем ответов запрос короткий, и относительные расходы получаются наибольшими.
+Ориентир (--rows 5000 --requests 5000): без кэша 0.2–1.1%, с кэшем 1.7–2.1% (около 15 мкс на запрос);
+разброс между запусками того же порядка, поэтому сравнивать стоит несколько запусков.
+
+    python -m benchmarks.metrics_overhead --rows 20000 --requests 3000
+"""
+import argparse
+import statistics
+import time
+
+from benchmarks import _bootstrap
+
+QUERIES = ['', 'make=toyota&ordering=-price', 'year_min=2015&page=3', 'pagination=cursor&ordering=price']
+
+
+def make_client(enabled, server_timing=False):
+    """
+    Клиент с собственным обработчиком: цепочка middleware собирается при первом запросе по текущим настройкам.
+    """
+    from django.conf import settings
+    from django.test import Client
+
+    settings.CARS_METRICS = {**settings.CARS_METRICS, 'ENABLED': enabled, 'LOG': True, 'SERVER_TIMING': server_timing}
+    client = Client()
+    client.get('/api/cars/')
+    return client
+
+
+def measure(clients, total):
+    timings = {name: [] for name in clients}
+    for number in range(total):
+        query = QUERIES[number % len(QUERIES)]
+        order = list(clients.items())
+        if number % 2:
+            order.reverse()
+        for name, client in order:
+            start = time.perf_counter()
+            response = client.get('/api/cars/', QUERY_STRING=query)
+            timings[name].append(time.perf_counter() - start)
+            assert response.status_code == 200, response.status_code
+    return {name: statistics.median(values) * 1000 for name, values in timings.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=20000, help='Количество синтетических автомобилей')
+    parser.add_argument('--requests', type=int, default=3000, help='Запросов в каждом режиме')
+    parser.add_argument('--db', help='Путь к файлу SQLite (по умолчанию временный файл)')
+    args = parser.parse_args()
+
+    _bootstrap.setup(args.db)
+    from django.conf import settings
+    from django.core.management import call_command
+    from benchmarks.data import seed_cars
+
+    settings.ALLOWED_HOSTS = ['testserver']
+    call_command('migrate', verbosity=0)
+    seed_cars(args.rows)
+
+    print(f'{"кэш ответов":12} {"без метрик, мс":>15} {"с метриками, мс":>16} {"расходы":>8}')
+    for cache_enabled in (False, True):
+        settings.CARS_RESPONSE_CACHE = {**settings.CARS_RESPONSE_CACHE, 'ENABLED': cache_enabled}
+        clients = {'off': make_client(False), 'on': make_client(True)}
+        result = measure(clients, args.requests)
+        overhead = (result['on'] - result['off']) / result['off'] * 100
+        label = 'включён' if cache_enabled else 'отключён'
+        print(f'{label:12} {result["off"]:>15.3f} {result["on"]:>16.3f} {overhead:>7.1f}%')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""
+Сценарии нагрузочного набора (benchmarks.suite): запросы к /api/cars/, как их делают фронтенд и интеграции.
+Имена сценариев стабильны — по ним сравниваются результаты разных коммитов.
+Путь, параметры и тело запроса могут зависеть от номера запроса i и контекста набора данных
+(id автомобилей, токен, число страниц), поэтому задаются значением или функцией (i, context).
+"""
+import json
+from urllib.parse import parse_qs, urlsplit
+
+LIST_URL = '/api/cars/'
+
+
+class Scenario:
+    """
+    Один сценарий: метод, путь, параметры строки запроса, тело (JSON) и нужна ли аутентификация.
+    after(status, content, context) вызывается после каждого ответа, например чтобы запомнить созданный id.
+    """
+    def __init__(self, name, path=LIST_URL, params=None, method='GET', auth=False, body=None, after=None):
+        self.name = name
+        self.path = path
+        self.params = params or {}
+        self.method = method
+        self.auth = auth
+        self.body = body
+        self.after = after
+
+    @property
+    def is_write(self):
+        return self.method not in ('GET', 'HEAD', 'OPTIONS')
+
+    def build(self, i, context):
+        """
+        Возвращает (метод, путь, параметры, тело в байтах или None) для i-го запроса.
+        """
+        path = self.path(i, context) if callable(self.path) else self.path
+        params = self.params(i, context) if callable(self.params) else self.params
+        body = self.body(i, context) if callable(self.body) else self.body
+        return self.method, path, params, None if body is None else json.dumps(body).encode('utf-8')
+
+
+def _cycle(key):
+    # Значения из контекста по кругу: i-й запрос берёт i-й элемент списка
+    return lambda i, context: context[key][i % len(context[key])]
+
+
+def _detail_path(key):
+    return lambda i, context: f'{LIST_URL}{_cycle(key)(i, context)}/'
+
+
+def _cursor_params(i, context):
+    # Курсорный обход: каждый запрос продолжает с курсора предыдущего ответа, в конце — сначала
+    params = {'pagination': 'cursor'}
+    if context.get('cursor'):
+        params['cursor'] = context['cursor']
+    return params
+
+
+def _remember_cursor(status, content, context):
+    next_link = json.loads(content).get('next') if status == 200 else None
+    context['cursor'] = parse_qs(urlsplit(next_link).query)['cursor'][0] if next_link else None
+
+
+def _remember_created(status, content, context):
+    if status == 201:
+        context['created_ids'].append(json.loads(content)['id'])
+
+
+def _pop_created(i, context):
+    # Удаляются автомобили, созданные сценарием write: create, поэтому набор данных не растёт от прогона к прогону
+    created = context['created_ids']
+    return f'{LIST_URL}{created.pop() if created else 0}/'
+
+
+def _new_car(i, context):
+    return {'make': 'Benchmark', 'model': f'Model {i % 10}', 'year': 2000 + i % 25, 'price': f'{100000 + i}.00'}
+
+
+def _price_patch(i, context):
+    # Цена меняется по кругу в фиксированном диапазоне, чтобы повторные прогоны давали те же данные
+    return {'price': f'{500000 + i % 100}.00'}
+
+
+def build_scenarios(context):
+    """
+    Полный список сценариев. context — сведения о наборе данных (см. benchmarks.suite.build_context).
+    """
+    scenarios = [
+        Scenario('list: default'),
+        Scenario('list: page 2', params={'page': 2}),
+        Scenario('pagination: middle page', params={'page': context['middle_page']}),
+        Scenario('pagination: last page', params={'page': 'last'}),
+        Scenario('pagination: cursor walk', params=_cursor_params, after=_remember_cursor),
+        Scenario('pagination: cursor by price', params={'pagination': 'cursor', 'ordering': 'price'}),
+        # Каждое поле CarFilter
+        Scenario('filter: make', params={'make': 'toyota'}),
+        Scenario('filter: model', params={'model': 'camry'}),
+        Scenario('filter: make + model', params={'make': 'bmw', 'model': 'x5'}),
+        Scenario('filter: year range', params={'year_min': 2018, 'year_max': 2020}),
+        Scenario('filter: price range', params={'price_min': 100000, 'price_max': 200000}),
+        Scenario('filter: is_available', params={'is_available': 'false'}),
+        Scenario('filter: color', params={'color': 'red'}),
+        Scenario('filter: combined', params={
+            'make': 'audi', 'is_available': 'true', 'year_min': 2010, 'price_max': 5000000, 'ordering': '-price',
+        }),
+        # Полнотекстовый поиск
+        Scenario('search: make', params={'search': 'toyota'}),
+        Scenario('search: description word', params={'search': 'panoramic'}),
+        Scenario('search: several words', params={'search': 'leather sunroof'}),
+        Scenario('search: prefix', params={'search': 'navig'}),
+        Scenario('search + filter', params={'search': 'diesel', 'is_available': 'true', 'ordering': 'price'}),
+        # Все поля сортировки
+        Scenario('ordering: price', params={'ordering': 'price'}),
+        Scenario('ordering: -price', params={'ordering': '-price'}),
+        Scenario('ordering: year', params={'ordering': 'year'}),
+        Scenario('ordering: -year', params={'ordering': '-year'}),
+        Scenario('ordering: created_at', params={'ordering': 'created_at'}),
+        Scenario('detail', path=_detail_path('detail_ids')),
+        Scenario('facets', path=f'{LIST_URL}facets/'),
+        # Запись от имени аутентифицированного дилера
+        Scenario('write: create', method='POST', auth=True, body=_new_car, after=_remember_created),
+        Scenario('write: update', path=_detail_path('owned_ids'), method='PATCH', auth=True, body=_price_patch),
+        Scenario('write: delete', path=_pop_created, method='DELETE', auth=True),
+    ]
+    return scenarios
@@ -0,0 +1,77 @@
+"""
+Бенчмарк поиска по объявлениям: DRF SearchFilter (LIKE '%...%' по make/model/description)
+против полнотекстового CarSearchFilter (FTS5) на синтетических данных.
+
+    python -m benchmarks.search --rows 500000
+"""
+import argparse
+import statistics
+import time
+
+from benchmarks import _bootstrap
+
+QUERIES = [
+    'toyota',              # частое слово в марке
+    'panoramic',           # слово из описания
+    'leather sunroof',     # несколько слов
+    'navig',               # префикс
+    'turbo diesel camera', # редкое сочетание
+]
+
+
+def time_queryset(queryset, repeat, page_size):
+    count_times, page_times = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        total = queryset.count()
+        count_times.append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        list(queryset[:page_size])
+        page_times.append((time.perf_counter() - start) * 1000)
+    return total, statistics.median(count_times), statistics.median(page_times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=500000, help='Количество синтетических автомобилей')
+    parser.add_argument('--repeat', type=int, default=5, help='Повторов каждого запроса')
+    parser.add_argument('--page-size', type=int, default=10)
+    parser.add_argument('--db', help='Путь к файлу SQLite (по умолчанию временный файл)')
+    args = parser.parse_args()
+
+    db_path = _bootstrap.setup(args.db)
+    from django.core.management import call_command
+    from rest_framework.filters import SearchFilter
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+    from benchmarks.data import seed_cars
+    from cars.models import Car
+    from cars.search import CarSearchFilter
+    from cars.views import CarViewSet
+
+    print(f'База: {db_path}')
+    call_command('migrate', verbosity=0)
+    print(f'Генерация {args.rows} автомобилей...')
+    start = time.perf_counter()
+    seed_cars(args.rows)
+    print(f'Вставка с обновлением FTS-индекса: {time.perf_counter() - start:.1f} s')
+
+    factory = APIRequestFactory()
+    view = CarViewSet()
+    base = Car.objects.order_by('-created_at')
+    print(f"\n{'запрос':<22} {'найдено':>8} {'LIKE count/page, мс':>24} {'FTS5 count/page, мс':>24}")
+    for query in QUERIES:
+        request = Request(factory.get('/api/cars/', {'search': query}))
+        like = SearchFilter().filter_queryset(request, base, view)
+        fts = CarSearchFilter().filter_queryset(request, base, view)
+        like_total, like_count, like_page = time_queryset(like, args.repeat, args.page_size)
+        fts_total, fts_count, fts_page = time_queryset(fts, args.repeat, args.page_size)
+        # LIKE ищет подстроки, FTS5 — слова и префиксы слов, поэтому количества могут немного различаться
+        print(
+            f'{query:<22} {fts_total:>8} {like_count:>11.1f} / {like_page:<10.1f} '
+            f'{fts_count:>11.1f} / {fts_page:.1f}   (LIKE нашёл {like_total})'
+        )
+
+
+if __name__ == '__main__':
+    main()
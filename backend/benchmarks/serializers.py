@@ -0,0 +1,64 @@
+"""
+Микробенчмарк сериализации страницы списка: CarSerializer (модели + select_related)
+против CarReadSerializer (словари .values()) на страницах 10/100/1000 строк.
+Отдельно меряется только сериализация и полный путь «выборка + сериализация + JSON».
+
+    python -m benchmarks.serializers --rows 5000
+"""
+import argparse
+import statistics
+import time
+
+from benchmarks import _bootstrap
+
+
+def median_ms(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=5000, help='Количество синтетических автомобилей')
+    parser.add_argument('--page-sizes', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--repeat', type=int, default=20, help='Повторов каждого замера')
+    parser.add_argument('--db', help='Путь к файлу SQLite (по умолчанию временный файл)')
+    args = parser.parse_args()
+
+    _bootstrap.setup(args.db)
+    from django.core.management import call_command
+    from rest_framework.renderers import JSONRenderer
+    from benchmarks.data import seed_cars
+    from cars.models import Car
+    from cars.serializers import CarReadSerializer, CarSerializer
+
+    call_command('migrate', verbosity=0)
+    seed_cars(args.rows)
+    renderer = JSONRenderer()
+    base = Car.objects.order_by('-created_at')
+
+    print(f'{"строк":>6} {"сериализатор":>14} {"только .data, мс":>17} {"выборка+JSON, мс":>17} {"ускорение":>10}')
+    for page_size in args.page_sizes:
+        instances = list(base.select_related('owner')[:page_size])
+        rows = list(base.values(*CarReadSerializer.value_fields)[:page_size])
+        assert renderer.render(CarSerializer(instances, many=True).data) == \
+            renderer.render(CarReadSerializer(rows, many=True).data)
+
+        full_data = median_ms(lambda: CarSerializer(instances, many=True).data, args.repeat)
+        full_total = median_ms(lambda: renderer.render(
+            CarSerializer(base.select_related('owner')[:page_size], many=True).data), args.repeat)
+        lean_data = median_ms(lambda: CarReadSerializer(rows, many=True).data, args.repeat)
+        lean_total = median_ms(lambda: renderer.render(
+            CarReadSerializer(base.values(*CarReadSerializer.value_fields)[:page_size], many=True).data), args.repeat)
+
+        print(f'{page_size:>6} {"CarSerializer":>14} {full_data:>17.2f} {full_total:>17.2f}')
+        print(f'{page_size:>6} {"CarRead...":>14} {lean_data:>17.2f} {lean_total:>17.2f} '
+              f'{full_total / lean_total:>9.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""
+Стресс-тест конкурентного чтения и записи в SQLite: настройки по умолчанию (журнал DELETE, обычный BEGIN,
+таймаут 5 s) против настроек проекта (WAL, BEGIN IMMEDIATE, SQLITE_PRAGMAS, см. cars/db.py).
+Писатели повторяют сценарий формы CarAdmin — чтение и сохранение автомобиля в одной транзакции,
+читатели — запросы страницы каталога. Считаются операции и ошибки "database is locked".
+
+    python -m benchmarks.sqlite_stress --writers 8 --readers 8 --seconds 10
+"""
+import argparse
+import atexit
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+
+from benchmarks import _bootstrap
+
+MODES = {
+    'по умолчанию': {
+        'OPTIONS': {},
+        'PRAGMAS': {'journal_mode': None, 'synchronous': None, 'cache_size': None, 'mmap_size': None,
+                    'temp_store': None},
+    },
+    'настройки проекта': None,  # OPTIONS и SQLITE_PRAGMAS из settings.py
+}
+
+
+def configure(db_path, options, pragmas):
+    """
+    Переключает базу 'default' на новый файл с заданными OPTIONS и SQLITE_PRAGMAS.
+    Соединения потоков создаются заново и читают эти же словари настроек.
+    """
+    from django.conf import settings
+    from django.db import connections
+
+    connections.close_all()
+    database = settings.DATABASES['default']
+    database['NAME'] = db_path
+    database['OPTIONS'] = dict(options)
+    settings.SQLITE_PRAGMAS = dict(pragmas)
+
+
+def run(seconds, writers, readers, car_ids):
+    from django.db import OperationalError, connection, transaction
+    from cars.models import Car
+
+    stats = {'writes': 0, 'reads': 0, 'locked': 0, 'other_errors': 0}
+    lock = threading.Lock()
+    deadline = time.monotonic() + seconds
+
+    def count(key):
+        with lock:
+            stats[key] += 1
+
+    def guarded(operation, key):
+        try:
+            operation()
+            count(key)
+        except OperationalError as exc:
+            count('locked' if 'locked' in str(exc) else 'other_errors')
+
+    def write():
+        with transaction.atomic():
+            car = Car.objects.get(pk=random.choice(car_ids))
+            car.price += 1
+            car.save()
+
+    def read():
+        queryset = Car.objects.filter(is_available=True).select_related('owner').order_by('-created_at')
+        queryset.count()
+        list(queryset[:20])
+
+    def worker(operation, key):
+        try:
+            while time.monotonic() < deadline:
+                guarded(operation, key)
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=worker, args=(write, 'writes')) for _ in range(writers)]
+    threads += [threading.Thread(target=worker, args=(read, 'reads')) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=5000, help='Количество синтетических автомобилей')
+    parser.add_argument('--writers', type=int, default=8)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=10)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix='cars-stress-')
+    atexit.register(shutil.rmtree, directory, True)
+    _bootstrap.setup(os.path.join(directory, 'setup.sqlite3'))
+    from django.conf import settings
+    from django.core.management import call_command
+    from benchmarks.data import seed_cars
+    from cars.models import Car
+
+    project = {'OPTIONS': dict(settings.DATABASES['default'].get('OPTIONS', {})), 'PRAGMAS': settings.SQLITE_PRAGMAS}
+    print(f'{"режим":20} {"записей/с":>10} {"чтений/с":>10} {"locked":>8} {"других ошибок":>14}')
+    for index, (name, mode) in enumerate(MODES.items()):
+        mode = mode or project
+        configure(os.path.join(directory, f'mode{index}.sqlite3'), mode['OPTIONS'], mode['PRAGMAS'])
+        call_command('migrate', verbosity=0)
+        seed_cars(args.rows)
+        car_ids = list(Car.objects.values_list('pk', flat=True))
+        stats = run(args.seconds, args.writers, args.readers, car_ids)
+        print(
+            f'{name:20} {stats["writes"] / args.seconds:>10.0f} {stats["reads"] / args.seconds:>10.0f} '
+            f'{stats["locked"]:>8} {stats["other_errors"]:>14}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+"""
+Холодный старт воркера: обычный settings.py (в том числе со сборкой документации drf_yasg при загрузке,
+как было до ленивых /swagger/ и /redoc/) против профиля settings_api без прогрева и с прогревом.
+Каждый запуск — новый процесс python, который импортирует car_dealership_backend.wsgi и отдаёт через WSGI
+два запроса GET /api/cars/. Меряются время загрузки приложения, первого и второго ответа, время процесса целиком,
+а по python -X importtime — суммарное время импорта и число модулей к первому ответу;
+--top показывает пакеты, импорт которых дороже всего в каждом варианте.
+
+    python -m benchmarks.startup --runs 5 --top 8
+"""
+import argparse
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+
+from benchmarks import _bootstrap
+
+# (название, модуль настроек, прогрев, документация строится при загрузке)
+VARIANTS = [
+    ('settings + drf_yasg сразу', 'car_dealership_backend.settings', False, True),
+    ('settings', 'car_dealership_backend.settings', False, False),
+    ('settings_api', 'car_dealership_backend.settings_api', False, False),
+    ('settings_api + прогрев', 'car_dealership_backend.settings_api', True, False),
+]
+
+
+def child(settings_module, db_path, prewarm, eager_docs):
+    """
+    Выполняется в дочернем процессе: загрузка приложения и первые запросы; результат — JSON в stdout.
+    """
+    started = time.perf_counter()
+    os.environ['DJANGO_SETTINGS_MODULE'] = settings_module
+    from django.conf import settings
+    settings.DATABASES['default']['NAME'] = db_path
+    settings.ALLOWED_HOSTS = ['testserver']
+    settings.CARS_THROTTLE = {**settings.CARS_THROTTLE, 'ENABLED': False}
+    settings.CARS_PREWARM = {'ENABLED': prewarm}
+    from car_dealership_backend.wsgi import application
+    if eager_docs:
+        from car_dealership_backend import urls
+        urls.docs_view('swagger')
+        urls.docs_view('redoc')
+    loaded = time.perf_counter()
+
+    def request():
+        environ = {
+            'REQUEST_METHOD': 'GET', 'PATH_INFO': '/api/cars/', 'QUERY_STRING': '', 'SERVER_NAME': 'testserver',
+            'SERVER_PORT': '80', 'HTTP_ACCEPT': 'application/json', 'wsgi.url_scheme': 'http',
+            'wsgi.input': io.BytesIO(), 'wsgi.errors': sys.stderr,
+        }
+        statuses = []
+        body = b''.join(application(environ, lambda status, headers, exc_info=None: statuses.append(status)))
+        assert statuses[0].startswith('200'), statuses[0]
+        return body
+
+    request()
+    first = time.perf_counter()
+    request()
+    second = time.perf_counter()
+    print(json.dumps({
+        'load': loaded - started,
+        'first': first - loaded,
+        'second': second - first,
+        'modules': len(sys.modules),
+    }))
+
+
+def run_child(settings_module, db_path, prewarm, eager_docs, importtime=False):
+    command = [sys.executable]
+    if importtime:
+        command += ['-X', 'importtime']
+    command += ['-m', 'benchmarks.startup', '--child', settings_module, '--db', db_path]
+    if prewarm:
+        command.append('--prewarm')
+    if eager_docs:
+        command.append('--eager-docs')
+    started = time.perf_counter()
+    result = subprocess.run(command, capture_output=True, text=True, check=True)
+    wall = time.perf_counter() - started
+    return json.loads(result.stdout.strip().splitlines()[-1]), wall, result.stderr
+
+
+def parse_importtime(stderr):
+    """
+    Строки «import time: self [us] | cumulative | module»: суммарное время и время по пакетам верхнего уровня.
+    """
+    total, packages = 0, Counter()
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        own, _, name = line[len('import time:'):].split('|')
+        name = name.strip()
+        parts = name.split('.')
+        package = '.'.join(parts[:3]) if parts[0] == 'django' and len(parts) > 2 else parts[0]
+        total += int(own)
+        packages[package] += int(own)
+    return total / 1000, packages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5, help='Запусков каждого варианта')
+    parser.add_argument('--cars', type=int, default=1000, help='Автомобилей в каталоге')
+    parser.add_argument('--top', type=int, default=8, help='Самых дорогих пакетов в выводе -X importtime')
+    parser.add_argument('--db', help='Путь к файлу SQLite (по умолчанию временный файл)')
+    parser.add_argument('--child', metavar='SETTINGS', help=argparse.SUPPRESS)
+    parser.add_argument('--prewarm', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--eager-docs', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.db, args.prewarm, args.eager_docs)
+        return
+
+    db_path = _bootstrap.setup(args.db)
+    from django.core.management import call_command
+    from benchmarks.data import seed_cars
+
+    call_command('migrate', verbosity=0)
+    seed_cars(args.cars)
+
+    print(f'{"вариант":>26} {"загрузка, мс":>13} {"1-й ответ, мс":>14} {"2-й ответ, мс":>14} '
+          f'{"процесс, мс":>12} {"импорт, мс":>11} {"модулей":>8}')
+    for name, settings_module, prewarm, eager_docs in VARIANTS:
+        runs = [run_child(settings_module, db_path, prewarm, eager_docs) for _ in range(args.runs)]
+        timings, walls = [run[0] for run in runs], [run[1] for run in runs]
+        _, _, stderr = run_child(settings_module, db_path, prewarm, eager_docs, importtime=True)
+        imports, packages = parse_importtime(stderr)
+
+        def median_ms(key):
+            return statistics.median(timing[key] for timing in timings) * 1000
+
+        print(f'{name:>26} {median_ms("load"):>13.1f} {median_ms("first"):>14.1f} {median_ms("second"):>14.1f} '
+              f'{statistics.median(walls) * 1000:>12.1f} {imports:>11.1f} {timings[0]["modules"]:>8}')
+        if args.top:
+            print(' ' * 27 + ', '.join(
+                f'{package} {own / 1000:.1f}' for package, own in packages.most_common(args.top)
+            ))
+
+
+if __name__ == '__main__':
+    main()
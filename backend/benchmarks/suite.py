@@ -0,0 +1,388 @@
+"""
+Воспроизводимый нагрузочный набор для API каталога: сценарии из benchmarks/scenarios.py (список, глубокая
+пагинация, каждое поле CarFilter, поиск, сортировка, детальная страница, запись) на детерминированном
+наборе данных (benchmarks/data.py) от тысяч до миллиона автомобилей у множества дилеров.
+
+Набор данных создаётся один раз и переиспользуется (файл SQLite в --data-dir с описанием рядом).
+Запросы идут либо внутри процесса через тестовый клиент Django, либо к запущенному серверу (--url).
+Результаты пишутся в JSON (--output), а два JSON-файла сравниваются командой compare; с --threshold
+команда завершается с кодом 1, если какой-то сценарий замедлился сильнее порога.
+
+    python -m benchmarks.suite run --rows 100000 --output base.json
+    python -m benchmarks.suite run --rows 100000 --output head.json --baseline base.json --threshold 15
+    python -m benchmarks.suite compare base.json head.json --threshold 15
+
+Против живого сервера (тот же набор данных; сервер запускается на нём командой serve):
+    python -m benchmarks.suite serve --rows 100000 --port 8001
+    python -m benchmarks.suite run --rows 100000 --url http://127.0.0.1:8001
+"""
+import argparse
+import http.client
+import json
+import math
+import os
+import platform
+import random
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from urllib.parse import urlencode, urlsplit
+
+from benchmarks import _bootstrap
+from benchmarks.scenarios import build_scenarios
+
+DEFAULT_DATA_DIR = os.path.join(tempfile.gettempdir(), 'cars-benchmarks')
+BENCH_USER = 'dealer0'  # Владелец части машин набора; от его имени выполняются сценарии записи
+SAMPLE_SIZE = 200  # Сколько разных id используют детальные запросы и обновления
+METRICS = ['p50_ms', 'p95_ms', 'p99_ms', 'mean_ms']
+
+
+def default_owners(rows):
+    # В среднем ~200 объявлений на дилера, но не меньше 50 дилеров
+    return max(50, rows // 200)
+
+
+def dataset_path(data_dir, rows, owners, seed):
+    return os.path.join(data_dir, f'cars-{rows}-{owners}-{seed}.sqlite3')
+
+
+def prepare_dataset(args):
+    """
+    Настраивает Django на файл набора данных и при необходимости создаёт его (migrate + seed_cars).
+    Готовый набор отмечается файлом .json рядом; без него (прерванное заполнение) база создаётся заново.
+    Миграции применяются всегда, так что набор, созданный на старом коммите, получает новую схему.
+    """
+    os.makedirs(args.data_dir, exist_ok=True)
+    path = dataset_path(args.data_dir, args.rows, args.owners, args.seed)
+    marker = path + '.json'
+    description = {'rows': args.rows, 'owners': args.owners, 'seed': args.seed}
+    ready = os.path.exists(marker) and _read_json(marker) == description
+    if not ready:
+        _bootstrap._remove_database(path)
+    _bootstrap.setup(path)
+
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0)
+    if not ready:
+        from benchmarks.data import seed_cars
+        print(f'Заполнение {path}: {args.rows} автомобилей, {args.owners} дилеров...', file=sys.stderr)
+        start = time.perf_counter()
+        seed_cars(args.rows, owners=args.owners, seed=args.seed)
+        print(f'Готово за {time.perf_counter() - start:.1f} s', file=sys.stderr)
+        with open(marker, 'w') as file:
+            json.dump(description, file)
+    return path
+
+
+def build_context(seed):
+    """
+    Сведения о наборе данных для сценариев: id для детальных запросов, машины и токен дилера BENCH_USER.
+    """
+    from django.db.models import Max, Min
+    from rest_framework.authtoken.models import Token
+    from rest_framework.settings import api_settings
+    from cars.models import Car
+
+    bounds = Car.objects.aggregate(low=Min('pk'), high=Max('pk'))
+    rnd = random.Random(seed)
+    candidates = [rnd.randint(bounds['low'], bounds['high']) for _ in range(SAMPLE_SIZE * 2)]
+    existing = set(Car.objects.filter(pk__in=candidates).values_list('pk', flat=True))
+    owner = Car.objects.filter(owner__username=BENCH_USER).values_list('owner', flat=True).first()
+    token, _ = Token.objects.get_or_create(user_id=owner)
+    return {
+        'detail_ids': [pk for pk in candidates if pk in existing][:SAMPLE_SIZE],
+        'owned_ids': list(
+            Car.objects.filter(owner_id=owner).exclude(make='Benchmark').order_by('pk')
+            .values_list('pk', flat=True)[:SAMPLE_SIZE]
+        ),
+        'middle_page': max(1, math.ceil(Car.objects.count() / api_settings.PAGE_SIZE) // 2),
+        'token': token.key,
+        'created_ids': [],
+        'cursor': None,
+    }
+
+
+class InProcessTarget:
+    """
+    Запросы через тестовый клиент Django в этом же процессе (полный стек middleware, без сети).
+    """
+    name = 'in-process'
+
+    def __init__(self):
+        from django.conf import settings
+        from django.test import Client
+        settings.ALLOWED_HOSTS = ['testserver']
+        self.client = Client()
+
+    def send(self, method, path, params, body, token):
+        headers = {'HTTP_AUTHORIZATION': f'Token {token}'} if token else {}
+        if params:
+            path = f'{path}?{urlencode(params)}'
+        response = self.client.generic(method, path, body or b'', content_type='application/json', **headers)
+        content = b''.join(response.streaming_content) if response.streaming else response.content
+        return response.status_code, response.get('Server-Timing'), content
+
+
+class LiveTarget:
+    """
+    Запросы к запущенному серверу по HTTP/1.1. По умолчанию — новое соединение на каждый запрос:
+    сервер разработки Django пишет ответ несколькими пакетами без TCP_NODELAY, и на повторно используемом
+    соединении алгоритм Нейгла вместе с отложенным ACK добавляет к каждому ответу ~40 мс.
+    keep_alive=True — одно постоянное соединение (для gunicorn/uvicorn и т. п.).
+    """
+    def __init__(self, url, keep_alive=False):
+        parts = urlsplit(url)
+        self.name = url
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.keep_alive = keep_alive
+        self.connection = None
+
+    def send(self, method, path, params, body, token):
+        headers = {'Accept': 'application/json', 'Content-Type': 'application/json'}
+        if token:
+            headers['Authorization'] = f'Token {token}'
+        if params:
+            path = f'{path}?{urlencode(params)}'
+        for attempt in range(2):
+            if self.connection is None:
+                self.connection = http.client.HTTPConnection(self.host, self.port, timeout=60)
+                self.connection.connect()
+                self.connection.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            try:
+                self.connection.request(method, path, body=body, headers=headers)
+                response = self.connection.getresponse()
+                content = response.read()
+                if not self.keep_alive or response.getheader('Connection', '').lower() == 'close':
+                    self.close()
+                return response.status, response.getheader('Server-Timing'), content
+            except (http.client.HTTPException, ConnectionError):
+                # Сервер закрыл постоянное соединение между запросами — повторяем один раз на новом
+                self.close()
+                if attempt:
+                    raise
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+
+def _db_queries(server_timing):
+    # Число SQL-запросов из заголовка Server-Timing (cars.middleware.PerformanceMiddleware), если он есть
+    match = re.search(r'db;[^,]*desc="(\d+) queries"', server_timing or '')
+    return int(match.group(1)) if match else None
+
+
+def run_scenario(target, scenario, context, requests, warmup):
+    latencies, queries, errors = [], [], 0
+    for i in range(warmup + requests):
+        method, path, params, body = scenario.build(i, context)
+        token = context['token'] if scenario.auth else None
+        start = time.perf_counter()
+        status, server_timing, content = target.send(method, path, params, body, token)
+        elapsed = time.perf_counter() - start
+        if scenario.after is not None:
+            scenario.after(status, content, context)
+        if i < warmup:
+            continue
+        latencies.append(elapsed * 1000)
+        if not 200 <= status < 300:
+            errors += 1
+        count = _db_queries(server_timing)
+        if count is not None:
+            queries.append(count)
+    return summarize(latencies, queries, errors)
+
+
+def summarize(latencies, queries, errors):
+    ordered = sorted(latencies)
+
+    def percentile(q):
+        return ordered[min(len(ordered) - 1, int(math.ceil(q * len(ordered))) - 1)]
+
+    return {
+        'requests': len(ordered),
+        'errors': errors,
+        'p50_ms': round(statistics.median(ordered), 3),
+        'p95_ms': round(percentile(0.95), 3),
+        'p99_ms': round(percentile(0.99), 3),
+        'mean_ms': round(statistics.fmean(ordered), 3),
+        'min_ms': round(ordered[0], 3),
+        'max_ms': round(ordered[-1], 3),
+        'rps': round(len(ordered) / (sum(ordered) / 1000), 1),
+        'db_queries': statistics.median(queries) if queries else None,
+    }
+
+
+def git_revision():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'],
+                                    capture_output=True, text=True, check=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return commit, dirty
+
+
+def run(args):
+    prepare_dataset(args)
+    import django
+    from django.conf import settings
+
+    if not args.cache:
+        settings.CARS_RESPONSE_CACHE = {**settings.CARS_RESPONSE_CACHE, 'ENABLED': False}
+    context = build_context(args.seed)
+    target = LiveTarget(args.url, args.keep_alive) if args.url else InProcessTarget()
+    scenarios = [
+        scenario for scenario in build_scenarios(context)
+        if (not args.only or re.search(args.only, scenario.name)) and not (args.read_only and scenario.is_write)
+    ]
+
+    commit, dirty = git_revision()
+    report = {
+        'meta': {
+            'commit': commit,
+            'dirty': dirty,
+            'target': target.name,
+            'rows': args.rows,
+            'owners': args.owners,
+            'seed': args.seed,
+            'requests': args.requests,
+            'warmup': args.warmup,
+            # Для живого сервера кэш задаётся его настройками, а не этим флагом
+            'response_cache': args.cache if not args.url else None,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'platform': platform.platform(),
+            'started_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        },
+        'scenarios': {},
+    }
+    print(f'{"сценарий":34} {"p50, мс":>9} {"p95, мс":>9} {"p99, мс":>9} {"запросов/с":>11} {"SQL":>5} {"ошибок":>7}')
+    for scenario in scenarios:
+        result = run_scenario(target, scenario, context, args.requests, args.warmup)
+        report['scenarios'][scenario.name] = result
+        queries = '' if result['db_queries'] is None else f'{result["db_queries"]:g}'
+        print(
+            f'{scenario.name:34} {result["p50_ms"]:>9.2f} {result["p95_ms"]:>9.2f} {result["p99_ms"]:>9.2f} '
+            f'{result["rps"]:>11.0f} {queries:>5} {result["errors"]:>7}'
+        )
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2, ensure_ascii=False)
+        print(f'Результаты: {args.output}')
+    if args.baseline:
+        return compare_reports(_read_json(args.baseline), report, args.metric, args.threshold, args.min_delta)
+    return 0
+
+
+def compare_reports(base, head, metric, threshold, min_delta):
+    """
+    Печатает изменение metric по сценариям и возвращает код выхода: 1, если при заданном threshold (в %)
+    какой-то сценарий замедлился сильнее порога и больше чем на min_delta мс (шум коротких запросов).
+    """
+    for key in ('rows', 'owners', 'seed', 'target'):
+        if base['meta'].get(key) != head['meta'].get(key):
+            print(f'Внимание: различается {key}: {base["meta"].get(key)} → {head["meta"].get(key)}')
+    base_commit, head_commit = (report['meta'].get('commit') or '?' for report in (base, head))
+    print(f'\n{metric}: {base_commit[:10]} → {head_commit[:10]}')
+    print(f'{"сценарий":34} {"было":>9} {"стало":>9} {"изменение":>10}')
+    regressions = []
+    for name, result in head['scenarios'].items():
+        previous = base['scenarios'].get(name)
+        if previous is None:
+            print(f'{name:34} {"—":>9} {result[metric]:>9.2f} {"новый":>10}')
+            continue
+        before, after = previous[metric], result[metric]
+        change = (after - before) / before * 100 if before else 0.0
+        flag = ''
+        if threshold is not None and change > threshold and after - before > min_delta:
+            flag = '  РЕГРЕССИЯ'
+            regressions.append(name)
+        print(f'{name:34} {before:>9.2f} {after:>9.2f} {change:>+9.1f}%{flag}')
+    missing = sorted(base['scenarios'].keys() - head['scenarios'].keys())
+    if missing:
+        print(f'Нет в новых результатах: {", ".join(missing)}')
+
+    if regressions:
+        print(f'\nЗамедлились сильнее {threshold:g}%: {", ".join(regressions)}')
+        return 1
+    return 0
+
+
+def serve(args):
+    """
+    Запускает сервер разработки Django на файле набора данных (для прогонов с --url).
+    """
+    prepare_dataset(args)
+    from django.conf import settings
+    from django.core.management import call_command
+
+    settings.ALLOWED_HOSTS = ['*']
+    if not args.cache:
+        settings.CARS_RESPONSE_CACHE = {**settings.CARS_RESPONSE_CACHE, 'ENABLED': False}
+    call_command('runserver', f'{args.host}:{args.port}', use_reloader=False)
+    return 0
+
+
+def _read_json(path):
+    with open(path) as file:
+        return json.load(file)
+
+
+def add_dataset_arguments(parser):
+    parser.add_argument('--rows', type=int, default=10000, help='Количество синтетических автомобилей (1000 … 1000000)')
+    parser.add_argument('--owners', type=int, help='Количество дилеров (по умолчанию rows / 200, не меньше 50)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR, help='Каталог для переиспользуемых наборов данных')
+    parser.add_argument('--cache', action='store_true', help='Не отключать кэш ответов каталога')
+
+
+def add_compare_arguments(parser):
+    parser.add_argument('--metric', choices=METRICS, default='p50_ms', help='Метрика для сравнения')
+    parser.add_argument('--threshold', type=float, help='Допустимое замедление, %%; сверх него код выхода 1')
+    parser.add_argument('--min-delta', type=float, default=0.5, help='Меньшие изменения (мс) регрессией не считаются')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='Прогнать сценарии')
+    add_dataset_arguments(run_parser)
+    run_parser.add_argument('--url', help='Адрес запущенного сервера; без него запросы идут внутри процесса')
+    run_parser.add_argument('--keep-alive', action='store_true', help='Одно постоянное соединение с сервером (--url)')
+    run_parser.add_argument('--requests', type=int, default=50, help='Замеряемых запросов на сценарий')
+    run_parser.add_argument('--warmup', type=int, default=5, help='Запросов прогрева на сценарий')
+    run_parser.add_argument('--only', help='Регулярное выражение для имён сценариев')
+    run_parser.add_argument('--read-only', action='store_true', help='Пропустить сценарии записи')
+    run_parser.add_argument('--output', help='Файл для результатов в JSON')
+    run_parser.add_argument('--baseline', help='JSON предыдущего прогона для сравнения')
+    add_compare_arguments(run_parser)
+
+    compare_parser = commands.add_parser('compare', help='Сравнить два JSON с результатами')
+    compare_parser.add_argument('base')
+    compare_parser.add_argument('head')
+    add_compare_arguments(compare_parser)
+
+    serve_parser = commands.add_parser('serve', help='Запустить сервер разработки на наборе данных')
+    add_dataset_arguments(serve_parser)
+    serve_parser.add_argument('--host', default='127.0.0.1')
+    serve_parser.add_argument('--port', type=int, default=8001)
+
+    args = parser.parse_args()
+    if args.command == 'compare':
+        return compare_reports(_read_json(args.base), _read_json(args.head), args.metric, args.threshold, args.min_delta)
+    if args.owners is None:
+        args.owners = default_owners(args.rows)
+    return run(args) if args.command == 'run' else serve(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
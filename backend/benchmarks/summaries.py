@@ -0,0 +1,71 @@
+"""
+Статистика каталога: GROUP BY по cars_car на каждый запрос против чтения сводных таблиц (cars/summaries.py),
+и цена поддержки сводок на записи (PATCH /api/cars/<id>/ со сводками и без).
+
+    python -m benchmarks.summaries --cars 200000 --repeat 20
+"""
+import argparse
+import statistics
+import time
+
+from benchmarks import _bootstrap
+
+
+def median_ms(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cars', type=int, default=200000, help='Автомобилей в каталоге')
+    parser.add_argument('--repeat', type=int, default=20, help='Повторов каждого замера')
+    parser.add_argument('--db', help='Путь к файлу SQLite (по умолчанию временный файл)')
+    args = parser.parse_args()
+
+    _bootstrap.setup(args.db)
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.test import Client
+    from rest_framework.authtoken.models import Token
+    from benchmarks.data import seed_cars
+    from cars import summaries
+    from cars.models import Car
+
+    settings.ALLOWED_HOSTS = ['testserver']
+    call_command('migrate', verbosity=0)
+    seed_cars(args.cars)
+
+    print(f'{args.cars} автомобилей')
+    print(f'{"запрос":32} {"GROUP BY, мс":>13} {"сводка, мс":>11}')
+    for summary in summaries.SUMMARIES:
+        label = f'{summary.model.__name__} ({len(summary.compute())} групп)'
+        group_by = median_ms(lambda: summary.compute(), args.repeat)
+        stored = median_ms(lambda: summary.stored(), args.repeat)
+        print(f'{label:32} {group_by:>13.2f} {stored:>11.2f}')
+
+    client = Client()
+    for url in ('/api/stats/prices/?make=toyota', '/api/stats/years/'):
+        elapsed = median_ms(lambda: client.get(url), args.repeat)
+        print(f'{"GET " + url:46} {elapsed:>11.2f}')
+
+    car = Car.objects.order_by('pk').first()
+    owner = Client(HTTP_AUTHORIZATION=f'Token {Token.objects.get_or_create(user_id=car.owner_id)[0].key}')
+    url = f'/api/cars/{car.pk}/'
+    print(f'\n{"PATCH " + url:32} {"мс (медиана)":>13}')
+    for label, enabled in (('без сводок', False), ('со сводками', True)):
+        settings.CARS_SUMMARIES = {'ENABLED': enabled}
+        counter = iter(range(10 ** 9))
+        elapsed = median_ms(
+            lambda: owner.patch(url, {'price': f'{500000 + next(counter)}.00'}, content_type='application/json'),
+            args.repeat * 5,
+        )
+        print(f'{label:32} {elapsed:>13.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Аутентификация по токену: TokenAuthentication против CachedTokenAuthentication (cars/authentication.py).
+Сначала сравнивается сама проверка токена (authenticate_credentials) на пуле токенов разных дилеров,
+затем — аутентифицированный GET /api/cars/<id>/ через WSGI-обработчик тестового клиента Django.
+
+    python -m benchmarks.token_auth --dealers 500 --requests 5000
+"""
+import argparse
+import statistics
+import time
+
+from benchmarks import _bootstrap
+
+
+def measure(function, keys, total):
+    timings = []
+    for number in range(total):
+        start = time.perf_counter()
+        function(keys[number % len(keys)])
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dealers', type=int, default=500, help='Количество дилеров с токенами')
+    parser.add_argument('--requests', type=int, default=5000, help='Проверок токена / HTTP-запросов в каждом режиме')
+    parser.add_argument('--db', help='Путь к файлу SQLite (по умолчанию временный файл)')
+    args = parser.parse_args()
+
+    _bootstrap.setup(args.db)
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.test import Client
+    from rest_framework.authentication import TokenAuthentication
+    from rest_framework.authtoken.models import Token
+    from benchmarks.data import make_users, seed_cars
+    from cars import authentication
+
+    settings.ALLOWED_HOSTS = ['testserver']
+    settings.CARS_RESPONSE_CACHE = {**settings.CARS_RESPONSE_CACHE, 'ENABLED': False}
+    call_command('migrate', verbosity=0)
+    seed_cars(1000)
+    keys = [Token.objects.get_or_create(user=user)[0].key for user in make_users(args.dealers)]
+
+    plain, cached = TokenAuthentication(), authentication.CachedTokenAuthentication()
+    print(f'{"проверка токена":24} {"мкс (медиана)":>14}')
+    print(f'{"TokenAuthentication":24} {measure(plain.authenticate_credentials, keys, args.requests):>14.1f}')
+    authentication.local_cache.clear()
+    for key in keys:
+        cached.authenticate_credentials(key)
+    print(f'{"CachedTokenAuthentication":24} {measure(cached.authenticate_credentials, keys, args.requests):>14.1f}')
+
+    from cars.models import Car
+    from cars.views import CarViewSet
+    url = f'/api/cars/{Car.objects.values_list("pk", flat=True).first()}/'
+    client = Client()
+    request = lambda key: client.get(url, HTTP_AUTHORIZATION=f'Token {key}')  # noqa: E731
+    print(f'\n{"GET " + url:24} {"мс (медиана)":>14}')
+    for auth_class in (TokenAuthentication, authentication.CachedTokenAuthentication):
+        # Классы аутентификации представления подменяются напрямую, остальная цепочка та же
+        CarViewSet.authentication_classes = [auth_class, *CarViewSet.authentication_classes[1:]]
+        print(f'{auth_class.__name__:24} {measure(request, keys, args.requests) / 1000:>14.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Запись через CarViewSet: SQL-запросы и медиана времени POST / PATCH / DELETE /api/cars/
+в полном и минимальном (?minimal, Prefer: return=minimal) режимах ответа.
+PATCH измеряется для изменения цены (поле сводок статистики), цвета (прочее поле) и без изменений.
+
+    python -m benchmarks.write_path --cars 10000 --requests 300
+"""
+import argparse
+import itertools
+import statistics
+import time
+
+from benchmarks import _bootstrap
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cars', type=int, default=10000, help='Автомобилей в каталоге')
+    parser.add_argument('--requests', type=int, default=300, help='Запросов в каждом сценарии')
+    parser.add_argument('--verbose', action='store_true', help='Показать SQL последнего запроса каждого сценария')
+    parser.add_argument('--db', help='Путь к файлу SQLite (по умолчанию временный файл)')
+    args = parser.parse_args()
+
+    _bootstrap.setup(args.db)
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import CaptureQueriesContext
+    from rest_framework.authtoken.models import Token
+    from benchmarks.data import seed_cars
+    from cars.models import Car
+
+    settings.ALLOWED_HOSTS = ['testserver']
+    call_command('migrate', verbosity=0)
+    seed_cars(args.cars)
+    car = Car.objects.order_by('pk').first()
+    client = Client(HTTP_AUTHORIZATION=f'Token {Token.objects.get_or_create(user_id=car.owner_id)[0].key}')
+    detail = f'/api/cars/{car.pk}/'
+    new_car = {'make': 'Toyota', 'model': 'Camry', 'year': 2020, 'price': '1500000.00', 'color': 'Black'}
+    prices = (f'{500000 + number}.00' for number in itertools.count())
+    colors = itertools.cycle(['Red', 'Blue'])
+    created = []
+
+    def post(suffix='', **headers):
+        response = client.post('/api/cars/' + suffix, new_car, content_type='application/json', headers=headers)
+        created.append(response.json()['id'] if response.content else int(response['Location'].rstrip('/').split('/')[-1]))
+        return response
+
+    def delete(suffix='', **headers):
+        return client.delete(f'/api/cars/{created.pop()}/' + suffix, headers=headers)
+
+    def patch(body, suffix='', **headers):
+        return lambda: client.patch(detail + suffix, body(), content_type='application/json', headers=headers)
+
+    scenarios = [
+        ('POST', post),
+        ('POST ?minimal', lambda: post('?minimal')),
+        ('POST Prefer: return=minimal', lambda: post(Prefer='return=minimal')),
+        ('PATCH цена', patch(lambda: {'price': next(prices)})),
+        ('PATCH цена ?minimal', patch(lambda: {'price': next(prices)}, '?minimal')),
+        ('PATCH цвет', patch(lambda: {'color': next(colors)})),
+        ('PATCH без изменений', patch(lambda: {'year': car.year})),
+        ('DELETE', delete),
+    ]
+    print(f'{"сценарий":30} {"SQL":>4} {"p50, мс":>8}')
+    for label, request in scenarios:
+        if label == 'DELETE':
+            # Удаляются автомобили, созданные сценариями POST
+            total = min(args.requests, len(created))
+        else:
+            total = args.requests
+        timings = []
+        for _ in range(total):
+            connection.queries_log.clear()
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                response = request()
+                timings.append(time.perf_counter() - start)
+            assert response.status_code < 300, (label, response.status_code)
+        print(f'{label:30} {len(queries):>4} {statistics.median(timings) * 1000:>8.2f}')
+        if args.verbose:
+            for query in queries:
+                print('    ', query['sql'][:150])
+
+
+if __name__ == '__main__':
+    main()
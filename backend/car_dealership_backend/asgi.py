@@ -5,6 +5,8 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
+
+For API-only worker processes use DJANGO_SETTINGS_MODULE=car_dealership_backend.settings_api.
 """
 
 import os
@@ -12,5 +14,12 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'car_dealership_backend.settings')
+# Отключает постоянные соединения с базой (CONN_MAX_AGE в settings.DATABASES)
+os.environ['CARS_ASGI'] = '1'
 
 application = get_asgi_application()
+
+# Прогрев URL-резолвера и сериализаторов до первого запроса (CARS_PREWARM, включён в settings_api)
+from cars import prewarm  # noqa: E402
+
+prewarm.startup()
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -48,6 +49,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'cars.middleware.PerformanceMiddleware', # Замеры запросов: Server-Timing, лог, /api/metrics/ (см. CARS_METRICS)
+    'cars.middleware.CompressionMiddleware', # Сжатие ответов gzip / brotli (см. CARS_COMPRESSION)
     'corsheaders.middleware.CorsMiddleware', # CORS
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -85,9 +88,39 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            'timeout': 20, # Сколько секунд ждать освобождения блокировки, прежде чем выдать "database is locked"
+            # BEGIN IMMEDIATE: транзакция сразу берёт блокировку на запись и при занятой базе ждёт timeout.
+            # При обычном BEGIN транзакция, которая сначала читает, а потом пишет (формы CarAdmin),
+            # получает "database is locked" сразу, без ожидания
+            'transaction_mode': 'IMMEDIATE',
+        },
+        # Под WSGI соединение переиспользуется между запросами вместо открытия файла и настройки PRAGMA каждый раз.
+        # Под ASGI (asgi.py выставляет CARS_ASGI=1) синхронный ORM работает в потоках sync_to_async,
+        # постоянные соединения в них не закрываются вовремя, и документация Django требует CONN_MAX_AGE = 0
+        'CONN_MAX_AGE': 0 if os.environ.get('CARS_ASGI') == '1' else 600,
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Чтение каталога с реплик (см. cars/routers.py). Реплики описываются в DATABASES как обычные базы, например
+#   'replica1': {'ENGINE': 'django.db.backends.postgresql', 'HOST': 'replica1.internal', ...}
+# и перечисляются в ALIASES; при пустом списке всё читается из 'default'.
+DATABASE_ROUTERS = ['cars.routers.ReplicaRouter']
+CARS_READ_REPLICAS = {
+    'ALIASES': [],
+    'STICKY_SECONDS': 10, # Столько секунд после записи пользователь читает с основной базы
+}
+
+# PRAGMA для каждого нового SQLite-соединения (см. cars/db.py). None отключает отдельный PRAGMA.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL', # Читатели не блокируют писателя и наоборот
+    'synchronous': 'NORMAL', # В режиме WAL безопасно: fsync только при checkpoint
+    'cache_size': -64000, # Кэш страниц, отрицательное значение — в КиБ (~64 МБ)
+    'mmap_size': 268435456, # Чтение файла базы через mmap (256 МБ)
+    'temp_store': 'MEMORY', # Временные таблицы сортировок и GROUP BY в памяти
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -130,10 +163,102 @@ STATIC_URL = 'static/'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+# Алиас 'cars' хранит кэш ответов каталога (cars.cache). LocMemCache подходит для разработки и тестов,
+# но живёт внутри одного процесса. В продакшене с несколькими воркерами нужен общий бэкенд, например:
+#   'cars': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': '/var/tmp/cars_cache'}
+#   'cars': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://127.0.0.1:6379/1'}
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'cars': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'cars',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+}
+
+# Кэш ответов list/retrieve для CarViewSet (см. cars/cache.py)
+CARS_RESPONSE_CACHE = {
+    'ENABLED': True,
+    'ALIAS': 'cars',
+    'TIMEOUT': 300, # Секунд; сброс при изменениях происходит сразу, через счётчик поколений
+}
+
+# Метрики производительности запросов (cars/middleware.py, cars/metrics.py).
+# При ENABLED = False middleware исключается из цепочки. Строки лога пишутся в логгер cars.metrics
+# с уровнем INFO; чтобы их видеть, его нужно включить в LOGGING, например:
+#   LOGGING = {'version': 1, 'handlers': {'console': {'class': 'logging.StreamHandler'}},
+#              'loggers': {'cars.metrics': {'handlers': ['console'], 'level': 'INFO'}}}
+# Server-Timing всем ответам отдаётся только при DEBUG; на рабочем сервере — запросам с заголовком
+# X-Server-Timing-Token, равным SERVER_TIMING_TOKEN (по умолчанию не задан, и заголовка нет)
+CARS_METRICS = {
+    'ENABLED': True,
+    'SERVER_TIMING': DEBUG,
+    'LOG': True,
+    'WINDOW_SECONDS': 300, # Окно скользящих квантилей на /api/metrics/
+}
+
+# Сжатие ответов (cars/compression.py): gzip, а при установленном пакете brotli — brotli, если клиент его принимает.
+# Ответы меньше MIN_SIZE байт не сжимаются; HTML не сжимается вовсе (CSRF-токен и атака BREACH)
+CARS_COMPRESSION = {
+    'ENABLED': True,
+    'MIN_SIZE': 1024,
+    'GZIP_LEVEL': 6,
+    'BROTLI_QUALITY': 5,
+}
+
+# Потоковая выгрузка каталога (cars/export.py). Память не растёт с размером выборки, поэтому предела
+# по умолчанию нет: выгрузка доступна только пользователям с токеном или сессией и ограничена ставкой 'export'
+CARS_EXPORT = {
+    'MAX_ROWS': None, # Максимум строк в одной выгрузке; None — без ограничения
+}
+
+# Фоновые задачи (cars/jobs.py): очередь в таблице cars_job, воркер — python manage.py run_jobs.
+# CAR_HOOKS — задачи, которые ставятся после коммита каждого изменения автомобиля, например
+# ['cars.notify_webhooks'] вместе с адресами в CARS_WEBHOOKS. EAGER = True выполняет их сразу, без воркера.
+CARS_JOBS = {
+    'CAR_HOOKS': [],
+    'EAGER': False,
+    'CONCURRENCY': 4, # Потоков в каждом процессе run_jobs
+    'MAX_ATTEMPTS': 5,
+    'RETRY_DELAY': 10, # Секунд до первого повтора, дальше удваивается
+}
+CARS_WEBHOOKS = {
+    'URLS': [],
+}
+
+# Сводные таблицы статистики каталога (cars/summaries.py, API /api/stats/...): обновляются при каждом изменении
+# автомобиля. После QuerySet.update или сырого SQL по cars_car их пересобирает python manage.py rebuild_summaries.
+CARS_SUMMARIES = {
+    'ENABLED': True,
+}
+
+# Кэш аутентификации по токену (cars/authentication.py): LRU в процессе и, если задан ALIAS, общий кэш.
+# Удаление токена и изменение пользователя сбрасывают записи сразу; в других воркерах LRU живёт до TTL.
+CARS_TOKEN_CACHE = {
+    'TTL': 60, # Секунд в LRU процесса
+    'MAX_ENTRIES': 10000,
+    'ALIAS': None, # Например, 'cars' при общем бэкенде (Redis), чтобы кэш делили воркеры
+}
+
+# Ограничение частоты запросов (cars/throttling.py); ставки — DEFAULT_THROTTLE_RATES в REST_FRAMEWORK.
+# Счётчики хранятся в кэше ALIAS: при нескольких воркерах он должен быть общим, иначе лимит действует на каждый воркер.
+# За обратным прокси нужно задать NUM_PROXIES в REST_FRAMEWORK, чтобы IP клиента брался из X-Forwarded-For.
+# Тесты выключают ограничение в своих базовых классах (cars/testing.py); тесты троттлинга включают его сами
+CARS_THROTTLE = {
+    'ENABLED': True,
+    'ALIAS': 'default',
+    'DEALER_GROUP': 'dealers', # Участники этой группы ограничиваются по ставке 'dealer'
+}
+
 # Django REST Framework Settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication', # Для аутентификации по токену
+        'cars.authentication.CachedTokenAuthentication', # Аутентификация по токену с кэшем (см. CARS_TOKEN_CACHE)
         'rest_framework.authentication.SessionAuthentication', # Полезно для Browsable API (удобная страница DRF в браузере)
     ],
     'DEFAULT_PERMISSION_CLASSES': [
@@ -144,6 +269,24 @@ REST_FRAMEWORK = {
         'rest_framework.filters.SearchFilter', # Встроенный бэкенд DRF для реализации простого текстового поиска по определённым полям
         'rest_framework.filters.OrderingFilter', # Позволяет сортировать результаты по полям через параметры запроса (?ordering=price)
     ],
+    # JSON через orjson, если он установлен (cars/renderers.py); CarViewSet и /api/stats/ добавляют
+    # столбцовый ?format=compact и MessagePack
+    'DEFAULT_RENDERER_CLASSES': [
+        'cars.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    # Ограничение частоты запросов по группам клиентов: скользящее окно в кэше (см. cars/throttling.py, CARS_THROTTLE)
+    'DEFAULT_THROTTLE_CLASSES': [
+        'cars.throttling.AnonCatalogueThrottle', # Анонимные клиенты, по IP
+        'cars.throttling.UserCatalogueThrottle', # Пользователи с токеном или сессией
+        'cars.throttling.DealerThrottle', # Дилеры (группа dealers) с повышенной ставкой
+    ],
+    'DEFAULT_THROTTLE_RATES': {
+        'anon': '120/min',
+        'user': '600/min',
+        'dealer': '6000/min',
+        'export': '60/hour', # Выгрузки всего каталога на пользователя, поверх ставки его группы
+    },
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination', # Настройка пагинации, чтобы API не возвращал сразу тысячи результатов, а разбивал их на страницы
     'PAGE_SIZE': 10, # Размер страницы для пагинации
 }
@@ -0,0 +1,53 @@
+"""
+Профиль настроек для процессов, которые обслуживают только API:
+
+    DJANGO_SETTINGS_MODULE=car_dealership_backend.settings_api gunicorn --preload car_dealership_backend.wsgi
+
+Всё остальное берётся из settings.py. Здесь отключено то, что нужно только людям в браузере:
+админка, сессии, сообщения, CSRF и Browsable API, поэтому воркер быстрее стартует и меньше делает на запрос.
+Аутентификация — только по токену. Админку и вход через /api-auth/ обслуживают процессы с обычным settings.py.
+Документация (/swagger/, /redoc/) остаётся, но drf_yasg импортируется при первом обращении к ней.
+"""
+from .settings import *  # noqa: F401,F403
+
+INSTALLED_APPS = [
+    app for app in INSTALLED_APPS  # noqa: F405
+    if app not in ('django.contrib.admin', 'django.contrib.sessions', 'django.contrib.messages')
+]
+
+MIDDLEWARE = [
+    middleware for middleware in MIDDLEWARE  # noqa: F405
+    if middleware not in (
+        'django.contrib.sessions.middleware.SessionMiddleware',
+        'django.middleware.csrf.CsrfViewMiddleware', # CSRF нужен только сессионной аутентификации
+        'django.contrib.auth.middleware.AuthenticationMiddleware', # Пользователя определяет DRF по токену
+        'django.contrib.messages.middleware.MessageMiddleware',
+        'django.middleware.clickjacking.XFrameOptionsMiddleware', # Ответы API не показываются во фреймах
+    )
+]
+
+TEMPLATES = [{
+    **TEMPLATES[0],  # noqa: F405
+    'OPTIONS': {
+        **TEMPLATES[0]['OPTIONS'],  # noqa: F405
+        'context_processors': [
+            'django.template.context_processors.request',
+            'django.contrib.auth.context_processors.auth',
+        ],
+    },
+}]
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,  # noqa: F405
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        'cars.authentication.CachedTokenAuthentication',
+    ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'cars.renderers.FastJSONRenderer',
+    ],
+}
+
+# Прогрев URL-резолвера, сериализаторов и кэшей моделей при старте воркера (cars/prewarm.py)
+CARS_PREWARM = {
+    'ENABLED': True,
+}
@@ -15,32 +15,58 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
-from django.contrib import admin
+from functools import cache
+
+from django.apps import apps
 from django.urls import path, include
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
 from rest_framework import permissions # Для drf-yasg
 
-# Настройки для Swagger/Redoc документации
-schema_view = get_schema_view(
-   openapi.Info(
-      title="Автомобильный Магазин API",
-      default_version='v1',
-      description="API для управления объявлениями об автомобилях",
-      terms_of_service="https://www.google.com/policies/terms/",
-      contact=openapi.Contact(email="astina.ss@yandex.ru"),
-      license=openapi.License(name="BSD License"),
-   ),
-   public=True,
-   permission_classes=(permissions.AllowAny,), # Разрешаем доступ к документации всем
-)
+
+@cache
+def schema_view():
+    """
+    Настройки для Swagger/Redoc документации.
+    Представление схемы строится при первом обращении к документации, а не при импорте URLconf:
+    воркеры, которые документацию не отдают, не импортируют drf_yasg вовсе.
+    """
+    from drf_yasg import openapi
+    from drf_yasg.views import get_schema_view
+    return get_schema_view(
+       openapi.Info(
+          title="Автомобильный Магазин API",
+          default_version='v1',
+          description="API для управления объявлениями об автомобилях",
+          terms_of_service="https://www.google.com/policies/terms/",
+          contact=openapi.Contact(email="astina.ss@yandex.ru"),
+          license=openapi.License(name="BSD License"),
+       ),
+       public=True,
+       permission_classes=(permissions.AllowAny,), # Разрешаем доступ к документации всем
+    )
+
+
+@cache
+def docs_view(ui):
+    return schema_view().with_ui(ui, cache_timeout=0)
+
+
+def lazy_docs(ui):
+    def view(request, *args, **kwargs):
+        return docs_view(ui)(request, *args, **kwargs)
+    return view
+
 
 urlpatterns = [
-    path('admin/', admin.site.urls),
     path('api/', include('cars.urls')), # Включаем URL-адреса из нашего приложения 'cars'
-    path('api-auth/', include('rest_framework.urls')), # Для Browsable API и аутентификации
 
     # URL-адреса для документации Swagger/Redoc
-    path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
-    path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
+    path('swagger/', lazy_docs('swagger'), name='schema-swagger-ui'),
+    path('redoc/', lazy_docs('redoc'), name='schema-redoc'),
 ]
+
+# Админка и вход для Browsable API есть не во всех профилях настроек (в settings_api их нет)
+if apps.is_installed('django.contrib.admin'):
+    from django.contrib import admin
+    urlpatterns.append(path('admin/', admin.site.urls))
+if apps.is_installed('django.contrib.sessions'):
+    urlpatterns.append(path('api-auth/', include('rest_framework.urls'))) # Для Browsable API и аутентификации
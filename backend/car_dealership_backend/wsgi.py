@@ -5,6 +5,8 @@ It exposes the WSGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/wsgi/
+
+For API-only worker processes use DJANGO_SETTINGS_MODULE=car_dealership_backend.settings_api.
 """
 
 import os
@@ -14,3 +16,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'car_dealership_backend.settings')
 
 application = get_wsgi_application()
+
+# Прогрев URL-резолвера и сериализаторов до первого запроса (CARS_PREWARM, включён в settings_api)
+from cars import prewarm  # noqa: E402
+
+prewarm.startup()
@@ -1,9 +1,164 @@
+from django import forms
 from django.contrib import admin
-from .models import Car
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import PAGE_VAR
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.core.paginator import Paginator
+from django.db.models import Value
+from django.db.models.functions import Lower
+from django.db.models.lookups import Exact
+from django.utils.functional import cached_property
+
+from . import summaries
+from .models import Car, Job, PriceSummary, YearSummary
+from .search import build_match_query, fts_available, match_queryset
+
+
+class CappedCountPaginator(Paginator):
+    """
+    Пагинатор для больших таблиц: COUNT(*) прекращается на строке после max_count
+    (SELECT COUNT(*) FROM (... LIMIT max_count + 1)), поэтому страница списка не пересчитывает всю таблицу.
+    Если строк больше max_count, показывается «max_count+», а последние страницы недоступны —
+    сузьте выборку фильтрами или поиском.
+    """
+    max_count = 10000
+
+    @cached_property
+    def counted(self):
+        # Лишняя строка отличает ровно max_count строк от большего числа
+        return self.object_list.order_by()[:self.max_count + 1].count()
+
+    @cached_property
+    def count(self):
+        return min(self.counted, self.max_count)
+
+    @property
+    def capped(self):
+        return self.counted > self.max_count
+
+
+class SummaryChoicesFilter(admin.SimpleListFilter):
+    """
+    Фильтр, варианты которого берутся из маленькой сводной таблицы (cars/summaries.py),
+    а не из SELECT DISTINCT по всей cars_car.
+    """
+    summary_model = None
+    summary_field = None
+
+    def lookups(self, request, model_admin):
+        if summaries.get_config()['ENABLED']:
+            queryset = self.summary_model.objects.all()
+        else:
+            queryset = Car.objects.all()
+        values = queryset.order_by(self.summary_field).values_list(self.summary_field, flat=True).distinct()
+        return [(str(value), str(value)) for value in values]
+
+
+class MakeFilter(SummaryChoicesFilter):
+    title = 'марка'
+    parameter_name = 'make'
+    summary_model = PriceSummary
+    summary_field = 'make'
+
+    def queryset(self, request, queryset):
+        if self.value():
+            # LOWER(make) = LOWER(...), как в CarFilter: использует индекс car_make_model_ci_idx
+            return queryset.filter(Exact(Lower('make'), Lower(Value(self.value()))))
+        return queryset
+
+
+class YearFilter(SummaryChoicesFilter):
+    title = 'год выпуска'
+    parameter_name = 'year'
+    summary_model = YearSummary
+    summary_field = 'year'
+
+    def lookups(self, request, model_admin):
+        return list(reversed(super().lookups(request, model_admin))) # Новые годы сверху
+
+    def queryset(self, request, queryset):
+        if self.value():
+            if not self.value().isdigit():
+                raise IncorrectLookupParameters(self.value())
+            return queryset.filter(year=int(self.value()))
+        return queryset
+
+
+class OwnerAutocompleteFilter(admin.SimpleListFilter):
+    """
+    Фильтр по владельцу с поиском (автодополнение админки, /admin/autocomplete/) вместо списка всех пользователей.
+    Для поиска нужны права на просмотр пользователей.
+    """
+    title = 'добавил(а)'
+    parameter_name = 'owner__id__exact'
+    template = 'admin/cars/owner_filter.html'
+
+    def lookups(self, request, model_admin):
+        return []
+
+    def has_output(self):
+        return True
+
+    def queryset(self, request, queryset):
+        if self.value():
+            if not self.value().isdigit():
+                raise IncorrectLookupParameters(self.value())
+            return queryset.filter(owner_id=int(self.value()))
+        return queryset
+
+    def choices(self, changelist):
+        # Один «вариант»: форма с виджетом автодополнения; остальные параметры списка передаются скрытыми полями
+        owner = Car._meta.get_field('owner')
+        # Поле формы даёт виджету итератор вариантов; из базы читается только выбранный пользователь
+        field = forms.ModelChoiceField(
+            owner.remote_field.model.objects.all(), required=False,
+            widget=AutocompleteSelect(owner, changelist.model_admin.admin_site),
+        )
+        yield {
+            'selected': self.value() is not None,
+            'widget': field.widget.render(self.parameter_name, self.value(), {'id': 'cars-owner-filter'}),
+            'params': [
+                (name, value) for name, value in changelist.params.items() if name not in (self.parameter_name, PAGE_VAR)
+            ],
+            'clear_url': changelist.get_query_string(remove=[self.parameter_name]),
+        }
+
 
 @admin.register(Car)
 class CarAdmin(admin.ModelAdmin):
-    list_display = ('make', 'model', 'year', 'price', 'is_available', 'owner', 'created_at')
-    list_filter = ('is_available', 'make', 'year', 'owner')
-    search_fields = ('make', 'model', 'description')
-    date_hierarchy = 'created_at'
+    # Владелец выводится из денормализованной колонки owner_username: без JOIN с auth_user и без запроса на строку
+    list_display = ('make', 'model', 'year', 'price', 'is_available', 'owner_name', 'created_at')
+    # Ни один фильтр не читает всю cars_car: варианты марок и годов — из сводных таблиц, владелец — автодополнением,
+    # дата — готовые интервалы (date_hierarchy строил их через SELECT DISTINCT по created_at)
+    list_filter = ('is_available', MakeFilter, YearFilter, OwnerAutocompleteFilter, 'created_at')
+    search_fields = ('make', 'model', 'description') # Запасной путь (icontains) для СУБД без FTS5
+    autocomplete_fields = ('owner',) # В форме автомобиля — поиск пользователя вместо <select> со всеми
+    paginator = CappedCountPaginator
+    show_full_result_count = False # Без второго COUNT(*) по всей таблице при фильтрации
+    show_facets = admin.ShowFacets.NEVER # Счётчики у вариантов фильтров — отдельный COUNT на каждый
+    fts_search = True # Поиск по индексу cars_car_fts (cars/search.py) вместо LIKE '%...%'
+
+    @admin.display(description='Добавил(а)', ordering='owner_username')
+    def owner_name(self, car):
+        return car.owner_username
+
+    @property
+    def media(self):
+        autocomplete = AutocompleteSelect(Car._meta.get_field('owner'), self.admin_site).media
+        return super().media + autocomplete + forms.Media(js=['admin/js/jquery.init.js', 'cars/admin/owner_filter.js'])
+
+    def get_search_results(self, request, queryset, search_term):
+        if not self.fts_search or not fts_available(queryset.db):
+            return super().get_search_results(request, queryset, search_term)
+        match = build_match_query(search_term)
+        if match is None:
+            return queryset, False
+        return match_queryset(queryset, match), False
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    # Очередь фоновых задач: прежде всего для разбора заданий, оставшихся со статусом failed
+    list_display = ('task', 'car_id', 'status', 'attempts', 'run_at', 'created_at')
+    list_filter = ('status', 'task')
+    readonly_fields = ('created_at',)
@@ -3,3 +3,12 @@ from django.apps import AppConfig
 class CarsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'cars'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        from . import db, metrics, signals, tasks  # noqa: F401 Регистрируем обработчики сигналов и фоновые задачи
+        # PRAGMA (WAL, synchronous, кэш, mmap) для каждого нового SQLite-соединения
+        connection_created.connect(db.apply_pragmas, dispatch_uid='cars_sqlite_pragmas')
+        if metrics.get_config()['ENABLED']:
+            # Учёт SQL-запросов в метриках (PerformanceMiddleware) — на каждом соединении в любом потоке
+            connection_created.connect(metrics.install_hook, dispatch_uid='cars_metrics_execute_hook')
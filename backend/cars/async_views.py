@@ -0,0 +1,146 @@
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.paginator import InvalidPage
+from django.http import HttpResponse
+from django.views import View
+from rest_framework import exceptions, status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from . import routers
+from .models import Car
+from .views import CarViewSet
+
+# Асинхронный путь чтения каталога (/api/async/cars/) для запуска под ASGI.
+# DRF-представления синхронные, и под ASGI каждый запрос целиком уходит в поток через sync_to_async.
+# Здесь представления — обычные async-представления Django: фильтры, поиск и сортировка берутся
+# из CarViewSet (построение queryset не обращается к базе), а сами запросы выполняются
+# асинхронным ORM (acount / aiterator / aget). Ответ тот же, что у /api/cars/, но без кэша ответов
+# и условных запросов: они остаются на синхронном пути. Ограничение частоты (cars/throttling.py) — то же.
+
+
+class AsyncCarView(View):
+    """
+    Общая часть асинхронных представлений: DRF-обёртка запроса, экземпляр CarViewSet для его настроек,
+    JSON-ответ и обработка исключений DRF так же, как в APIView.
+    """
+    http_method_names = ['get', 'head', 'options']
+    viewset_class = CarViewSet
+    action = None
+    renderer = JSONRenderer()
+
+    async def get(self, request, *args, **kwargs):
+        drf_request = Request(request)
+        view = self.viewset_class(action=self.action, request=drf_request, args=args, kwargs=kwargs, format_kwarg=None)
+        token = None
+        try:
+            # Те же ограничения частоты, что у /api/cars/ (APIView.initial): счётчики общие для обоих путей
+            await sync_to_async(view.check_throttles)(drf_request)
+            token = routers.set_read_db(await self.get_read_alias(request, drf_request))
+            data = await self.respond(view, drf_request, **kwargs)
+        except exceptions.APIException as exc:
+            return self.render_exception(exc)
+        finally:
+            if token is not None:
+                routers.reset_read_db(token)
+        return self.render(data)
+
+    async def get_read_alias(self, request, drf_request):
+        """
+        База для чтения, как в CarViewSet.initial. Пользователь нужен только для закрепления за основной базой
+        после записи, поэтому синхронная аутентификация DRF выполняется, лишь если запрос её предполагает.
+        """
+        if not routers.replica_aliases():
+            return None
+        user = None
+        if 'HTTP_AUTHORIZATION' in request.META or settings.SESSION_COOKIE_NAME in request.COOKIES:
+            user = await sync_to_async(lambda: drf_request.user)()
+        return routers.read_alias(user)
+
+    async def respond(self, view, request, **kwargs):
+        raise NotImplementedError
+
+    def render(self, data, status_code=status.HTTP_200_OK):
+        return HttpResponse(self.renderer.render(data), status=status_code, content_type=self.renderer.media_type)
+
+    def render_exception(self, exc):
+        detail = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+        response = self.render(detail, exc.status_code)
+        if getattr(exc, 'wait', None):
+            # Как APIView.handle_exception для Throttled
+            response['Retry-After'] = '%d' % exc.wait
+        return response
+
+
+class AsyncCarListView(AsyncCarView):
+    """
+    Асинхронный список автомобилей: те же параметры и формат ответа, что у GET /api/cars/,
+    включая постраничную и курсорную (?pagination=cursor) пагинацию.
+    """
+    action = 'list'
+
+    async def respond(self, view, request):
+        queryset = view.filter_queryset(view.get_queryset())
+        paginator = view.paginator
+        delegate = paginator.get_delegate(request)
+        if delegate is not None:
+            # Курсорный режим: CarKeysetPagination отдаёт срез, а выборку выполняем сами
+            rows = [row async for row in delegate.get_page_queryset(queryset, request, view).aiterator()]
+            page = delegate.build_page(rows)
+            return delegate.get_paginated_response(view.get_serializer(page, many=True).data).data
+        return await self.paginate_by_number(paginator, queryset, request, view)
+
+    async def paginate_by_number(self, paginator, queryset, request, view):
+        """
+        Асинхронный аналог PageNumberPagination.paginate_queryset: проверка номера страницы
+        делегируется django Paginator, а COUNT(*) и выборка страницы выполняются через acount/aiterator.
+        """
+        page_size = paginator.get_page_size(request)
+        page_number = request.query_params.get(paginator.page_query_param) or 1
+        django_paginator = paginator.django_paginator_class([], page_size)
+        django_paginator.count = await queryset.acount()
+        if page_number in paginator.last_page_strings:
+            page_number = django_paginator.num_pages
+        try:
+            number = django_paginator.validate_number(page_number)
+        except InvalidPage as exc:
+            raise exceptions.NotFound(paginator.invalid_page_message.format(page_number=page_number, message=str(exc)))
+
+        bottom = (number - 1) * page_size
+        rows = [row async for row in queryset[bottom:bottom + page_size].aiterator()]
+
+        url = request.build_absolute_uri()
+        next_link = previous_link = None
+        if number < django_paginator.num_pages:
+            next_link = replace_query_param(url, paginator.page_query_param, number + 1)
+        if number > 1:
+            previous_link = (
+                remove_query_param(url, paginator.page_query_param) if number == 2
+                else replace_query_param(url, paginator.page_query_param, number - 1)
+            )
+        return OrderedDict([
+            ('count', django_paginator.count),
+            ('next', next_link),
+            ('previous', previous_link),
+            ('results', view.get_serializer(rows, many=True).data),
+        ])
+
+
+class AsyncCarDetailView(AsyncCarView):
+    """
+    Асинхронная детальная информация об автомобиле (как GET /api/cars/<pk>/).
+    """
+    action = 'retrieve'
+
+    async def respond(self, view, request, pk):
+        # Как GenericAPIView.get_object: фильтры применяются и к детальному запросу
+        queryset = view.filter_queryset(view.get_queryset())
+        try:
+            row = await queryset.aget(**{view.lookup_field: pk})
+        except (Car.DoesNotExist, TypeError, ValueError, DjangoValidationError):
+            raise exceptions.NotFound(f'No {Car._meta.object_name} matches the given query.')
+        return view.get_serializer(row).data
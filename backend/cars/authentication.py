@@ -0,0 +1,160 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, transaction
+from rest_framework.authentication import TokenAuthentication
+
+# Кэш аутентификации по токену (settings.CARS_TOKEN_CACHE).
+# TokenAuthentication на каждый запрос делает SELECT authtoken_token JOIN auth_user. Здесь результат
+# запоминается: сначала в LRU внутри процесса с временем жизни TTL, затем, если задан ALIAS, в общем кэше
+# из settings.CACHES (Redis и т. п.), чтобы новые воркеры не ходили в базу за каждым токеном.
+# Хранится не объект User, а значения его полей без пароля: на каждый запрос собирается новый экземпляр,
+# поэтому запросы не делят один объект, а хэш пароля не попадает в общий кэш.
+# Удаление токена и сохранение пользователя (деактивация, смена пароля, прав) сбрасывают записи
+# (см. cars.signals). В других процессах LRU живёт до истечения TTL — это верхняя граница задержки отзыва.
+DEFAULTS = {
+    'ENABLED': True,
+    'TTL': 60,  # Время жизни записи в LRU процесса, секунд
+    'MAX_ENTRIES': 10000,  # Размер LRU; самые давно использованные токены вытесняются
+    'ALIAS': None,  # Алиас общего кэша из settings.CACHES; None — только LRU процесса
+    'SHARED_TTL': 300,  # Время жизни записи в общем кэше, секунд
+    'KEY_PREFIX': 'cars-auth',
+}
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'CARS_TOKEN_CACHE', {})}
+
+
+class LRUCache:
+    """
+    Потокобезопасный LRU со временем жизни записей.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # ключ -> (истекает в, значение)
+
+    def get(self, key, now):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= now:
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value, expires, max_entries):
+        with self.lock:
+            self.entries[key] = (expires, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > max_entries:
+                self.entries.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def delete_where(self, predicate):
+        with self.lock:
+            for key in [key for key, (_, value) in self.entries.items() if predicate(value)]:
+                del self.entries[key]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+
+local_cache = LRUCache()
+
+
+def _user_fields():
+    # Все поля пользователя, кроме пароля: в собранном экземпляре пароль останется отложенным (deferred)
+    return [field.attname for field in get_user_model()._meta.concrete_fields if field.name != 'password']
+
+
+def _shared_key(config, key):
+    # Сам токен в ключ не попадает: ключи общего кэша видны любому, кто может читать кэш
+    return f'{config["KEY_PREFIX"]}:{hashlib.sha256(key.encode()).hexdigest()}'
+
+
+def _shared_cache(config):
+    return caches[config['ALIAS']] if config['ALIAS'] else None
+
+
+def _delete(keys):
+    config = get_config()
+    for key in keys:
+        local_cache.delete(key)
+    shared = _shared_cache(config)
+    if shared is not None and keys:
+        shared.delete_many([_shared_key(config, key) for key in keys])
+
+
+def invalidate_token(key, using=None):
+    """
+    Убирает токен из кэшей. Внутри транзакции — ещё раз после коммита, чтобы параллельный запрос,
+    прочитавший токен до коммита, не оставил его в кэше.
+    """
+    _delete([key])
+    if transaction.get_connection(using).in_atomic_block:
+        transaction.on_commit(lambda: _delete([key]), using=using)
+
+
+def invalidate_user(user_pk, using=None):
+    """
+    Убирает из кэшей все токены пользователя.
+    """
+    from rest_framework.authtoken.models import Token
+
+    def delete():
+        local_cache.delete_where(lambda entry: entry[1] == user_pk)
+        keys = list(Token.objects.using(using).filter(user_id=user_pk).values_list('key', flat=True))
+        _delete(keys)
+
+    delete()
+    if transaction.get_connection(using).in_atomic_block:
+        transaction.on_commit(delete, using=using)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication с кэшем токен -> пользователь; замена в DEFAULT_AUTHENTICATION_CLASSES.
+    Заголовок, ответы и ошибки те же, что у TokenAuthentication. Кэшируются только активные пользователи,
+    неверные токены каждый раз проверяются по базе.
+    """
+    def authenticate_credentials(self, key):
+        config = get_config()
+        if not config['ENABLED']:
+            return super().authenticate_credentials(key)
+
+        now = time.monotonic()
+        fields = _user_fields()
+        entry = local_cache.get(key, now)
+        if entry is None:
+            shared = _shared_cache(config)
+            entry = shared.get(_shared_key(config, key)) if shared is not None else None
+            # Запись с другим набором полей (модель пользователя изменилась после деплоя) не используется
+            if entry is None or len(entry[2]) != len(fields):
+                user, token = super().authenticate_credentials(key)
+                entry = (token.key, user.pk, tuple(getattr(user, name) for name in fields))
+                if shared is not None:
+                    shared.set(_shared_key(config, key), entry, config['SHARED_TTL'])
+                local_cache.set(key, entry, now + config['TTL'], config['MAX_ENTRIES'])
+                return user, token
+            local_cache.set(key, entry, now + config['TTL'], config['MAX_ENTRIES'])
+
+        token_key, user_pk, values = entry
+        user = get_user_model().from_db(DEFAULT_DB_ALIAS, fields, values)
+        token = self.get_model().from_db(DEFAULT_DB_ALIAS, ['key', 'user_id'], [token_key, user_pk])
+        token.user = user
+        return user, token
@@ -0,0 +1,228 @@
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+# Кэш ответов публичного каталога (list/retrieve CarViewSet).
+# Ключ строится из «поколения» каталога и нормализованного запроса. Поколение — счётчик в том же кэше,
+# который увеличивается при каждом изменении Car (сигналы post_save/post_delete, см. cars.signals),
+# поэтому после записи старые ключи просто перестают использоваться и устаревшие данные не отдаются.
+# Для нескольких процессов нужен общий бэкенд (файловый или Redis), см. CACHES в settings.py.
+DEFAULTS = {
+    'ENABLED': True,
+    'ALIAS': 'default',  # Алиас из settings.CACHES
+    'TIMEOUT': 300,  # Время жизни закэшированного ответа, секунд
+    'KEY_PREFIX': 'cars',
+    'COALESCE': True,  # Одинаковые одновременные анонимные промахи выполняются один раз (SingleFlight)
+    'COALESCE_TIMEOUT': 10,  # Сколько секунд ждать чужой результат, прежде чем считать самому
+}
+
+HIT, MISS, COALESCED = 'hits', 'misses', 'coalesced'
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'CARS_RESPONSE_CACHE', {})}
+
+
+def get_cache():
+    return caches[get_config()['ALIAS']]
+
+
+def _key(*parts):
+    return ':'.join([get_config()['KEY_PREFIX'], *map(str, parts)])
+
+
+def get_generation():
+    """
+    Текущее поколение каталога. Начальное значение берётся от часов, а не с 1,
+    чтобы после вытеснения счётчика из кэша не совпасть с ключами старых поколений.
+    """
+    cache, key = get_cache(), _key('generation')
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, time.time_ns() // 1000, timeout=None)
+        generation = cache.get(key)
+    return generation
+
+
+def bump_generation():
+    cache, key = get_cache(), _key('generation')
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Счётчика ещё нет (или он вытеснен) — get_generation создаст новый
+        get_generation()
+
+
+def invalidate(using=None):
+    """
+    Делает недействительными все закэшированные ответы каталога.
+    Вызывается при изменении Car; для массовых операций без сигналов (bulk_create, update) — явно.
+    Внутри транзакции поколение увеличивается ещё раз после коммита, чтобы параллельный запрос,
+    прочитавший данные до коммита, не закэшировал их под новым поколением.
+    """
+    bump_generation()
+    if transaction.get_connection(using).in_atomic_block:
+        transaction.on_commit(bump_generation, using=using)
+
+
+def normalize_query(query_params):
+    """
+    Приводит параметры запроса к каноническому виду: порядок параметров и пустые значения не важны.
+    """
+    items = sorted(
+        (key, value)
+        for key in query_params
+        for value in query_params.getlist(key)
+        if value != ''
+    )
+    return '&'.join(f'{key}={value}' for key, value in items)
+
+
+def response_key(request, action):
+    # Ссылки next/previous абсолютные, поэтому в ключ входит хост и путь
+    raw = f'{request.build_absolute_uri(request.path)}?{normalize_query(request.query_params)}'
+    digest = hashlib.md5(raw.encode('utf-8')).hexdigest()
+    return _key('response', get_generation(), action, digest)
+
+
+def record(outcome):
+    cache, key = get_cache(), _key('stats', outcome)
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def stats():
+    """
+    Счётчики попаданий и промахов кэша ответов и промахов, дождавшихся чужого результата (COALESCED).
+    """
+    cache = get_cache()
+    counters = {outcome: cache.get(_key('stats', outcome), 0) for outcome in (HIT, MISS, COALESCED)}
+    total = counters[HIT] + counters[MISS]
+    counters['hit_ratio'] = counters[HIT] / total if total else 0.0
+    counters['generation'] = get_generation()
+    return counters
+
+
+def lookup(cache, key):
+    """
+    Чтение из кэша ответов; пользователь, закреплённый за основной базой после записи, кэш не читает
+    (см. cars.routers.pinned), но свежий ответ для остальных в него кладёт.
+    """
+    from . import routers
+    return None if routers.pinned() else cache.get(key)
+
+
+def store_timeout(config):
+    """
+    Время жизни нового элемента кэша: для прочитанного с реплики оно короче (см. cars.routers.cache_timeout).
+    """
+    from . import routers
+    return routers.cache_timeout(config['TIMEOUT'])
+
+
+def cached_value(request, name, compute):
+    """
+    Возвращает значение compute(), закэшированное для текущего запроса и поколения каталога.
+    Используется для вспомогательных данных ответа, например валидаторов ETag (см. cars.conditional).
+    Одновременные анонимные вычисления с одним ключом объединяются, как в cached_response.
+    """
+    config = get_config()
+    if not config['ENABLED']:
+        return compute()
+    cache = get_cache()
+    key = response_key(request, name)
+    value = lookup(cache, key)
+    if value is None:
+        if config['COALESCE'] and not request.user.is_authenticated:
+            value, _ = flights.do(key, compute, config['COALESCE_TIMEOUT'])
+        else:
+            value = compute()
+        cache.set(key, value, store_timeout(config))
+    return value
+
+
+def cached_response(view, request, handler, *args, **kwargs):
+    """
+    Возвращает ответ действия view из кэша или вызывает handler и кэширует его данные.
+    Кэшируются только успешные GET-ответы; хранится response.data, а не отрендеренный JSON,
+    поэтому согласование формата (JSON / Browsable API) работает как обычно.
+    Одинаковые одновременные анонимные промахи объединяются (SingleFlight): базу и сериализацию
+    выполняет первый запрос, остальные отдают его данные с X-Cache: COALESCED.
+    """
+    config = get_config()
+    if not config['ENABLED'] or request.method != 'GET':
+        return handler(request, *args, **kwargs)
+
+    cache = get_cache()
+    key = response_key(request, view.action)
+    data = lookup(cache, key)
+    if data is not None:
+        record(HIT)
+        response = Response(data)
+        response['X-Cache'] = 'HIT'
+        return response
+
+    if config['COALESCE'] and not request.user.is_authenticated:
+        # Анонимные запросы читают одни и те же данные; пользователю после записи нужна основная база
+        response, leader = flights.do(key, lambda: handler(request, *args, **kwargs), config['COALESCE_TIMEOUT'])
+        if not leader:
+            if response.status_code == status.HTTP_200_OK:
+                record(COALESCED)
+                response = Response(response.data)
+                response['X-Cache'] = 'COALESCED'
+                return response
+            # Ответ с ошибкой не разделяется: запрос обрабатывается как обычный промах
+            response = handler(request, *args, **kwargs)
+    else:
+        response = handler(request, *args, **kwargs)
+
+    record(MISS)
+    if response.status_code == status.HTTP_200_OK:
+        cache.set(key, response.data, store_timeout(config))
+    response['X-Cache'] = 'MISS'
+    return response
+
+
+class SingleFlight:
+    """
+    Объединение одинаковых одновременных вычислений в процессе: первый вызов с ключом (ведущий) выполняет
+    compute, остальные ждут его результат. Ключ ответа включает поколение каталога, поэтому запрос,
+    пришедший после записи, в старый полёт не попадает.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}  # ключ -> [Event, результат]
+
+    def do(self, key, compute, timeout):
+        """
+        Возвращает (результат, был ли вызов ведущим). Если ведущий упал или не уложился в timeout,
+        ждавший вызывает compute сам и тоже считается ведущим.
+        """
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = [threading.Event(), None]
+        if not leader:
+            if call[0].wait(timeout) and call[1] is not None:
+                return call[1], False
+            return compute(), True
+        try:
+            call[1] = compute()
+        finally:
+            with self.lock:
+                del self.calls[key]
+            call[0].set()
+        return call[1], True
+
+
+flights = SingleFlight()
@@ -0,0 +1,139 @@
+import gzip
+import zlib
+
+from django.conf import settings
+
+# Сжатие ответов (cars.middleware.CompressionMiddleware, settings.CARS_COMPRESSION).
+# Кодировка выбирается по Accept-Encoding: brotli, если установлен пакет brotli и клиент его принимает,
+# иначе gzip. Сжимаются только ответы не меньше MIN_SIZE байт и только типов из CONTENT_TYPES:
+# на мелких ответах сжатие стоит дороже, чем экономит. HTML (админка, Browsable API) по умолчанию
+# не сжимается: в нём CSRF-токен, а сжатие страниц с секретами открывает атаку BREACH.
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+DEFAULTS = {
+    'ENABLED': True,
+    'MIN_SIZE': 1024,  # Байт; меньшие ответы отдаются как есть
+    'GZIP_LEVEL': 6,
+    'BROTLI_QUALITY': 5,  # 0-11; выше 5 заметно медленнее при небольшом выигрыше в размере
+    'CONTENT_TYPES': [
+        'application/json',
+        'application/vnd.cars.compact+json',
+        'application/msgpack',
+        'application/x-ndjson',
+        'text/csv',
+        'text/plain',
+        'application/javascript',
+        'text/css',
+    ],
+}
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'CARS_COMPRESSION', {})}
+
+
+class GzipStream:
+    """
+    Потоковое сжатие gzip: каждый кусок сбрасывается сразу (Z_SYNC_FLUSH), чтобы клиент получал данные без задержки.
+    """
+    def __init__(self, config):
+        self.compressor = zlib.compressobj(config['GZIP_LEVEL'], zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def chunk(self, data):
+        return self.compressor.compress(data) + self.compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self.compressor.flush()
+
+
+class BrotliStream:
+    """
+    Потоковое сжатие brotli с тем же сбросом каждого куска.
+    """
+    def __init__(self, config):
+        self.compressor = brotli.Compressor(quality=config['BROTLI_QUALITY'])
+
+    def chunk(self, data):
+        return self.compressor.process(data) + self.compressor.flush()
+
+    def finish(self):
+        return self.compressor.finish()
+
+
+def _gzip(data, config):
+    return gzip.compress(data, compresslevel=config['GZIP_LEVEL'], mtime=0)
+
+
+def _brotli(data, config):
+    return brotli.compress(data, quality=config['BROTLI_QUALITY'])
+
+
+# Кодировки в порядке предпочтения сервера: (сжатие целого тела, потоковое сжатие)
+ENCODINGS = {}
+if brotli is not None:
+    ENCODINGS['br'] = (_brotli, BrotliStream)
+ENCODINGS['gzip'] = (_gzip, GzipStream)
+
+
+def choose_encoding(accept_encoding):
+    """
+    Кодировка из ENCODINGS с наибольшим q в Accept-Encoding (при равных — в порядке ENCODINGS) или None.
+    """
+    accepted = {}
+    for part in accept_encoding.split(','):
+        name, _, params = part.partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        for param in params.split(';'):
+            key, _, value = param.partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[name] = quality
+    best, best_quality = None, 0.0
+    for encoding in ENCODINGS:
+        quality = accepted.get(encoding, accepted.get('*', 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compressible(response, config):
+    """
+    Подходит ли ответ для сжатия по типу, размеру и уже заданной кодировке.
+    """
+    if response.has_header('Content-Encoding'):
+        return False
+    content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+    if content_type not in config['CONTENT_TYPES']:
+        return False
+    return response.streaming or len(response.content) >= config['MIN_SIZE']
+
+
+def compress(data, encoding, config):
+    return ENCODINGS[encoding][0](data, config)
+
+
+def compress_stream(chunks, encoding, config):
+    stream = ENCODINGS[encoding][1](config)
+    for chunk in chunks:
+        data = stream.chunk(chunk)
+        if data:
+            yield data
+    yield stream.finish()
+
+
+async def compress_stream_async(chunks, encoding, config):
+    stream = ENCODINGS[encoding][1](config)
+    async for chunk in chunks:
+        data = stream.chunk(chunk)
+        if data:
+            yield data
+    yield stream.finish()
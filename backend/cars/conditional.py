@@ -0,0 +1,108 @@
+import hashlib
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+
+from . import cache
+
+# Условные GET-запросы (If-None-Match / If-Modified-Since) для CarViewSet.
+# Валидаторы считаются дешёвыми запросами по updated_at до сериализации, поэтому на неизменившиеся
+# данные клиент получает 304 без тела. Сами валидаторы хранятся в кэше ответов (cars.cache) рядом с ответом
+# и сбрасываются вместе с ним, так что при тёплом кэше проверка не обращается к базе.
+
+
+def detail_validators(view, request):
+    """
+    ETag и Last-Modified автомобиля по его updated_at. Возвращает (None, None), если автомобиля нет.
+    """
+    return cache.cached_value(request, 'retrieve-validators', lambda: _detail_validators(view))
+
+
+def _detail_validators(view):
+    lookup_url_kwarg = view.lookup_url_kwarg or view.lookup_field
+    pk = view.kwargs[lookup_url_kwarg]
+    try:
+        updated_at = (
+            view.get_queryset().filter(**{view.lookup_field: pk})
+            .values_list('updated_at', flat=True).first()
+        )
+    except (TypeError, ValueError, ValidationError):
+        # Некорректный id (например, /api/cars/abc/): 404 вернёт get_object, как без условных запросов
+        return None, None
+    if updated_at is None:
+        return None, None
+    return car_etag(pk, updated_at), updated_at
+
+
+def car_etag(pk, updated_at):
+    """
+    ETag версии автомобиля; его же отдают минимальные ответы на запись (CarViewSet.create/update).
+    """
+    return quote_etag(f'car-{pk}-{updated_at.timestamp():.6f}')
+
+
+def list_validators(view, request):
+    """
+    ETag списка: max(updated_at) и количество строк по отфильтрованному набору
+    плюс нормализованная строка запроса (страница, сортировка, фильтры).
+    Добавление и изменение автомобиля меняют max(updated_at), удаление — количество.
+    Last-Modified у списка нет: удаление не самого нового автомобиля не меняет max(updated_at),
+    и проверка одного If-Modified-Since отдала бы устаревший 304. Возвращает (etag, None).
+    В курсорном режиме (?pagination=cursor) валидаторы не считаются: им нужен COUNT(*),
+    от которого этот режим и избавляет.
+    """
+    paginator = view.paginator
+    if paginator is not None and paginator.get_delegate(request) is not None:
+        return None, None
+    return cache.cached_value(request, 'list-validators', lambda: _list_validators(view, request))
+
+
+def _list_validators(view, request):
+    queryset = view.filter_queryset(view.get_queryset()).order_by()
+    summary = queryset.aggregate(last_modified=Max('updated_at'), count=Count('pk'))
+    last_modified = summary['last_modified']
+    raw = '|'.join([
+        request.path,
+        cache.normalize_query(request.query_params),
+        str(summary['count']),
+        last_modified.isoformat() if last_modified else '',
+    ])
+    return quote_etag(hashlib.md5(raw.encode('utf-8')).hexdigest()), None
+
+
+def format_etag(etag, request):
+    """
+    ETag представления в выбранном формате ответа. У JSON — исходный ETag (его же отдают ответы на запись),
+    у остальных форматов (compact, msgpack, Browsable API) к нему добавляется формат: сильный ETag
+    обещает побайтно одинаковое тело, и у разных форматов он должен различаться.
+    """
+    renderer = getattr(request, 'accepted_renderer', None)
+    if renderer is None or renderer.format == 'json':
+        return etag
+    return quote_etag(etag.strip('"') + '-' + renderer.format)
+
+
+def conditional_response(request, validators, respond):
+    """
+    Отвечает 304 Not Modified, если валидаторы клиента актуальны, иначе возвращает respond().
+    validators — функция без аргументов, возвращающая (etag, last_modified).
+    """
+    if request.method not in ('GET', 'HEAD'):
+        return respond()
+    etag, last_modified = validators()
+    if etag is None:
+        return respond()
+    etag = format_etag(etag, request)
+
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is None:
+        response = respond()
+    if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+        response['ETag'] = etag
+        if timestamp is not None:
+            response['Last-Modified'] = http_date(timestamp)
+    return response
@@ -0,0 +1,36 @@
+import re
+
+from django.conf import settings
+
+# Настройка каждого нового SQLite-соединения (обработчик сигнала connection_created, см. CarsConfig.ready).
+# Набор PRAGMA задаётся в settings.SQLITE_PRAGMAS; таймаут блокировки, режим транзакций и
+# переиспользование соединений — стандартными OPTIONS / CONN_MAX_AGE в settings.DATABASES.
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': -64000,
+    'mmap_size': 268435456,
+    'temp_store': 'MEMORY',
+}
+
+PRAGMA_NAME_RE = re.compile(r'^[a-z_]+$')
+PRAGMA_VALUE_RE = re.compile(r'^-?\w+$')
+
+
+def get_pragmas():
+    pragmas = {**DEFAULT_PRAGMAS, **getattr(settings, 'SQLITE_PRAGMAS', {})}
+    return {name: value for name, value in pragmas.items() if value is not None}
+
+
+def apply_pragmas(sender, connection, **kwargs):
+    """
+    Выполняет PRAGMA из настроек на только что открытом соединении SQLite; другие СУБД пропускаются.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name, value in get_pragmas().items():
+            # PRAGMA не поддерживает параметры запроса, поэтому имя и значение проверяются отдельно
+            if not PRAGMA_NAME_RE.match(name) or not PRAGMA_VALUE_RE.match(str(value)):
+                raise ValueError(f'Invalid SQLite pragma: {name} = {value!r}')
+            cursor.execute(f'PRAGMA {name} = {value}')
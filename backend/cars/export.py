@@ -0,0 +1,87 @@
+import csv
+import json
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+
+from .serializers import CarReadSerializer
+
+# Потоковая выгрузка каталога (CarViewSet.export).
+# Строки читаются из базы серверным курсором пачками (.iterator(chunk_size=...)) в виде словарей values(),
+# без создания моделей, форматируются CarReadSerializer и сразу отдаются клиенту,
+# поэтому память не растёт с размером выборки.
+# От злоупотреблений защищают аутентификация и отдельная ставка 'export' (cars/throttling.py);
+# MAX_ROWS — необязательный предел размера выгрузки.
+DEFAULTS = {
+    'MAX_ROWS': None,  # Максимум строк в одной выгрузке; None — без ограничения
+}
+EXPORT_COLUMNS = CarReadSerializer.value_fields
+CHUNK_SIZE = 2000  # Строк на одну выборку из курсора
+FLUSH_ROWS = 500  # Строк в одном куске ответа
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'CARS_EXPORT', {})}
+
+
+def iter_rows(queryset, chunk_size=CHUNK_SIZE):
+    """
+    Строки выборки в представлении CarReadSerializer (как элементы списка /api/cars/).
+    """
+    serializer = CarReadSerializer()
+    for row in queryset.values(*EXPORT_COLUMNS).iterator(chunk_size=chunk_size):
+        yield serializer.to_representation(row)
+
+
+def iter_ndjson(queryset):
+    """
+    NDJSON: по одному объекту на строку в том же виде, что и элементы списка /api/cars/.
+    """
+    encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+    lines = []
+    for item in iter_rows(queryset):
+        lines.append(encoder.encode(item))
+        if len(lines) >= FLUSH_ROWS:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+
+class _Echo:
+    """
+    Псевдо-файл для csv.writer: write() возвращает строку вместо записи.
+    """
+    def write(self, value):
+        return value
+
+
+def iter_csv(queryset):
+    """
+    CSV с заголовком; владелец — колонка owner с именем пользователя.
+    """
+    writer = csv.writer(_Echo())
+    columns = [*EXPORT_COLUMNS[:-1], 'owner']
+    yield writer.writerow(columns)
+    lines = []
+    for item in iter_rows(queryset):
+        item['owner'] = item['owner']['username']
+        lines.append(writer.writerow([item[column] for column in columns]))
+        if len(lines) >= FLUSH_ROWS:
+            yield ''.join(lines)
+            lines = []
+    if lines:
+        yield ''.join(lines)
+
+
+FORMATS = {
+    'ndjson': (iter_ndjson, 'application/x-ndjson; charset=utf-8'),
+    'csv': (iter_csv, 'text/csv; charset=utf-8'),
+}
+
+
+def export_response(queryset, export_format):
+    stream, content_type = FORMATS[export_format]
+    response = StreamingHttpResponse(stream(queryset), content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="cars.{export_format}"'
+    return response
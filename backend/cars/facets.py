@@ -0,0 +1,102 @@
+from decimal import Decimal
+
+from django.db.models import Count, F, IntegerField, Max, Min, Q, Value
+from django.db.models.functions import Floor
+from rest_framework.exceptions import ValidationError
+
+from .serializers import format_price
+
+# Фасеты для боковой панели фильтров (CarViewSet.facets).
+# Всё считается агрегатами с GROUP BY по уже отфильтрованному набору (те же параметры, что у списка):
+# один запрос на итоги и диапазоны плюс по одному на каждую группировку, без перебора строк в Python.
+FACET_LIMIT = 50  # Сколько самых частых марок и цветов отдавать
+PRICE_BINS = 10  # Примерное число столбцов гистограммы цен
+YEAR_BUCKET = 5  # Ширина корзины по годам
+
+
+def int_param(request, name, default, min_value, max_value):
+    value = request.query_params.get(name)
+    if value in (None, ''):
+        return default
+    try:
+        value = int(value)
+    except ValueError:
+        raise ValidationError({name: ['A valid integer is required.']})
+    if not min_value <= value <= max_value:
+        raise ValidationError({name: [f'Ensure this value is between {min_value} and {max_value}.']})
+    return value
+
+
+def nice_step(span, bins):
+    """
+    Ширина столбца гистограммы, округлённая вверх до 1, 2 или 5 × 10^k, чтобы границы были «круглыми».
+    """
+    raw = span / bins
+    if raw <= 0:
+        return Decimal(1)
+    magnitude = Decimal(10) ** raw.adjusted()
+    for factor in (1, 2, 5, 10):
+        if magnitude * factor >= raw:
+            return magnitude * factor
+    return magnitude * 10
+
+
+def compute_facets(queryset, limit=FACET_LIMIT, price_bins=PRICE_BINS, year_bucket=YEAR_BUCKET):
+    queryset = queryset.order_by()
+    summary = queryset.aggregate(
+        total=Count('pk'),
+        available=Count('pk', filter=Q(is_available=True)),
+        price_min=Min('price'),
+        price_max=Max('price'),
+    )
+
+    return {
+        'total': summary['total'],
+        'is_available': {'true': summary['available'], 'false': summary['total'] - summary['available']},
+        'make': _value_counts(queryset, 'make', limit),
+        'color': _value_counts(queryset, 'color', limit),
+        'year': _year_histogram(queryset, year_bucket),
+        'price': _price_histogram(queryset, summary['price_min'], summary['price_max'], price_bins),
+    }
+
+
+def _value_counts(queryset, field, limit):
+    rows = queryset.values(field).annotate(count=Count('pk')).order_by('-count', field)[:limit]
+    return [{'value': row[field], 'count': row['count']} for row in rows]
+
+
+def _year_histogram(queryset, size):
+    # Целочисленное деление в SQL: 2017 / 5 * 5 = 2015
+    bucket = F('year') / size * size
+    rows = (
+        queryset.annotate(bucket=bucket).values('bucket')
+        .annotate(count=Count('pk')).order_by('bucket')
+    )
+    return [
+        {'from': int(row['bucket']), 'to': int(row['bucket']) + size - 1, 'count': row['count']}
+        for row in rows
+    ]
+
+
+def _price_histogram(queryset, price_min, price_max, bins):
+    if price_min is None:
+        return []
+    step = nice_step(price_max - price_min, bins)
+    start = (price_min // step) * step
+    # Номер столбца считается в базе: FLOOR((price - start) / step)
+    bucket = Floor((F('price') - Value(start)) / Value(step), output_field=IntegerField())
+    rows = queryset.annotate(bucket=bucket).values('bucket').annotate(count=Count('pk')).values_list('bucket', 'count')
+    last = int((price_max - start) // step)
+    counts = {}
+    for index, count in rows:
+        # Цены в SQLite хранятся как REAL, поэтому на границе столбца возможна ошибка округления
+        index = min(max(int(index), 0), last)
+        counts[index] = counts.get(index, 0) + count
+    return [
+        {
+            'from': format_price(start + step * index),
+            'to': format_price(start + step * (index + 1)),
+            'count': counts.get(index, 0),
+        }
+        for index in range(last + 1)
+    ]
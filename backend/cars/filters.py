@@ -1,28 +1,62 @@
 import django_filters
-from .models import Car
+from django.db.models import Value
+from django.db.models.functions import Lower
+from django.db.models.lookups import Exact
+from .models import Car, PriceSummary, YearSummary
+
+
+class LowerExactFilter(django_filters.CharFilter):
+    """
+    Регистронезависимое точное совпадение в виде LOWER(поле) = LOWER(значение).
+    В отличие от 'iexact' (на SQLite это LIKE) такое сравнение использует функциональные индексы по Lower(...).
+    """
+    def filter(self, qs, value):
+        if value in django_filters.constants.EMPTY_VALUES:
+            return qs
+        return self.get_method(qs)(Exact(Lower(self.field_name), Lower(Value(value))))
+
 
 class CarFilter(django_filters.FilterSet):
     """
     Класс фильтров для модели Car.
-    Позволяет фильтровать автомобили по марке, модели, году и статусу наличия.
+    Позволяет фильтровать автомобили по марке, модели, году, цене, цвету и статусу наличия.
     """
     # Фильтрация по диапазону цен (price_min, price_max)
     price = django_filters.RangeFilter()
     # Фильтрация по году выпуска (year_min, year_max)
     year = django_filters.RangeFilter()
-    # Поиск по марке, модели и описанию (использует 'icontains' для нечувствительного к регистру поиска)
-    search = django_filters.CharFilter(
-        field_name='description',
-        lookup_expr='icontains',
-        label='Search by description'
-    )
-    # Пример для фильтрации по марке, модели (точное совпадение)
-    make = django_filters.CharFilter(lookup_expr='iexact')
-    model = django_filters.CharFilter(lookup_expr='iexact')
-    color = django_filters.CharFilter(lookup_expr='iexact')
+    # Полнотекстовый поиск (?search=) выполняет бэкенд cars.search.CarSearchFilter по индексу FTS5
+    # Фильтрация по марке, модели и цвету (точное совпадение без учёта регистра)
+    make = LowerExactFilter()
+    model = LowerExactFilter()
+    color = LowerExactFilter()
 
 
     class Meta:
         model = Car
         # Поля, по которым разрешена точная фильтрация
-        fields = ['make', 'model', 'year', 'is_available', 'color', 'price', 'search']
\ No newline at end of file
+        fields = ['make', 'model', 'year', 'is_available', 'color', 'price']
+
+
+class PriceSummaryFilter(django_filters.FilterSet):
+    """
+    Фильтры статистики по моделям: марка и модель без учёта регистра, диапазон годов (year_min, year_max).
+    """
+    make = LowerExactFilter()
+    model = LowerExactFilter()
+    year = django_filters.RangeFilter()
+
+    class Meta:
+        model = PriceSummary
+        fields = ['make', 'model', 'year']
+
+
+class YearSummaryFilter(django_filters.FilterSet):
+    """
+    Фильтр статистики по годам: диапазон годов (year_min, year_max).
+    """
+    year = django_filters.RangeFilter()
+
+    class Meta:
+        model = YearSummary
+        fields = ['year']
@@ -0,0 +1,250 @@
+import logging
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Job
+
+# Фоновые задачи без внешних сервисов: очередь — таблица cars_job, воркер — manage.py run_jobs.
+# Задача — функция, зарегистрированная декоратором @task под именем. После коммита изменений Car
+# (сигналы, пакетные операции API, import_cars) для каждой задачи из CAR_HOOKS ставится задание на автомобиль.
+# Пока задание ждёт воркера, повторные изменения того же автомобиля сливаются в него (уникальное ограничение
+# на ожидающие задания), поэтому серия правок одной машины обрабатывается один раз.
+# Упавшее задание повторяется с экспоненциальной задержкой, после MAX_ATTEMPTS остаётся со статусом failed.
+DEFAULTS = {
+    'CAR_HOOKS': [],  # Имена задач, которые запускаются после каждого изменения автомобиля
+    'EAGER': False,  # Выполнять задачи сразу после коммита в этом же процессе (разработка без воркера)
+    'CONCURRENCY': 1,  # Потоков воркера
+    'BATCH_SIZE': 50,  # Заданий, забираемых воркером за раз
+    'POLL_INTERVAL': 1.0,  # Пауза воркера при пустой очереди, секунд
+    'LEASE_SECONDS': 300,  # Столько задание закреплено за воркером; после — считается брошенным
+    'MAX_ATTEMPTS': 5,
+    'RETRY_DELAY': 10,  # Задержка перед первым повтором, секунд; дальше удваивается
+}
+
+SAVED, DELETED = 'saved', 'deleted'
+
+logger = logging.getLogger('cars.jobs')
+
+registry = {}
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'CARS_JOBS', {})}
+
+
+class Task:
+    """
+    Зарегистрированная задача. Обычная вызывается на каждое задание: func(car_id, **payload).
+    Пакетная (batch=True) получает все забранные за раз задания этого вида: func([(car_id, payload), ...]).
+    """
+    def __init__(self, name, func, batch=False, max_attempts=None):
+        self.name = name
+        self.func = func
+        self.batch = batch
+        self.max_attempts = max_attempts
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+
+def task(name, batch=False, max_attempts=None):
+    """
+    Декоратор: регистрирует функцию как задачу с именем name.
+    """
+    def register(func):
+        registry[name] = Task(name, func, batch=batch, max_attempts=max_attempts)
+        return func
+    return register
+
+
+def enqueue(name, car_ids=None, payload=None, delay=0, using=None):
+    """
+    Ставит задание name. С car_ids — по заданию на каждый автомобиль; если для автомобиля уже есть ожидающее
+    задание этого вида, оно не дублируется, а получает новые параметры. Без car_ids — одно задание.
+    """
+    if name not in registry:
+        raise ValueError(f'Unknown job task: {name}')
+    payload = payload or {}
+    run_at = timezone.now() + timedelta(seconds=delay)
+    if car_ids is None:
+        Job.objects.using(using).create(task=name, payload=payload, run_at=run_at)
+        return
+    car_ids = list(dict.fromkeys(car_ids))
+    with transaction.atomic(using=using):
+        pending = Job.objects.using(using).filter(task=name, status=Job.PENDING, car_id__in=car_ids)
+        existing = set(pending.values_list('car_id', flat=True))
+        if existing:
+            pending.update(payload=payload)
+        # ignore_conflicts: параллельная вставка того же задания уже выполнила работу этой
+        new_jobs = [
+            Job(task=name, car_id=car_id, payload=payload, run_at=run_at) for car_id in car_ids if car_id not in existing
+        ]
+        Job.objects.using(using).bulk_create(new_jobs, ignore_conflicts=True)
+
+
+def car_changed(car_ids, event=SAVED, using=None):
+    """
+    Запускает задачи CAR_HOOKS для изменённых автомобилей после коммита текущей транзакции
+    (сразу, если транзакции нет). Откат транзакции отменяет и задания.
+    """
+    hooks = get_config()['CAR_HOOKS']
+    if not hooks or not car_ids:
+        return
+    car_ids = list(car_ids)
+
+    def dispatch():
+        for name in hooks:
+            if get_config()['EAGER']:
+                execute(registry[name], [(car_id, {'event': event}) for car_id in car_ids])
+            else:
+                enqueue(name, car_ids, {'event': event}, using=using)
+
+    # robust: ошибка постановки в очередь пишется в лог и не ломает уже закоммиченную запись
+    transaction.on_commit(dispatch, using=using, robust=True)
+
+
+def execute(task, items):
+    """
+    Выполняет задачу для списка (car_id, payload): пакетную — одним вызовом, обычную — по одному.
+    """
+    if task.batch:
+        task(items)
+        return
+    for car_id, payload in items:
+        if car_id is None:
+            task(**payload)
+        else:
+            task(car_id, **payload)
+
+
+def claim(limit, lease_seconds):
+    """
+    Забирает до limit заданий, срок которых наступил, и брошенные задания с истёкшей арендой.
+    На SQLite транзакция IMMEDIATE сериализует воркеров; на PostgreSQL — SELECT ... FOR UPDATE SKIP LOCKED.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(Q(status=Job.PENDING, run_at__lte=now) | Q(status=Job.RUNNING, locked_until__lt=now))
+            .order_by('run_at').values_list('pk', flat=True)[:limit]
+        )
+        Job.objects.filter(pk__in=ids).update(
+            status=Job.RUNNING, locked_until=now + timedelta(seconds=lease_seconds), attempts=F('attempts') + 1,
+        )
+    return list(Job.objects.filter(pk__in=ids).order_by('run_at'))
+
+
+def complete(jobs):
+    Job.objects.filter(pk__in=[job.pk for job in jobs]).delete()
+
+
+def fail(jobs, error, config):
+    """
+    Возвращает задания в очередь с задержкой RETRY_DELAY * 2^(попытка - 1) или, после последней попытки,
+    оставляет со статусом failed.
+    """
+    for job in jobs:
+        task = registry.get(job.task)
+        max_attempts = task.max_attempts if task and task.max_attempts else config['MAX_ATTEMPTS']
+        if task is None or job.attempts >= max_attempts:
+            Job.objects.filter(pk=job.pk).update(status=Job.FAILED, locked_until=None, last_error=error)
+            continue
+        delay = config['RETRY_DELAY'] * 2 ** (job.attempts - 1)
+        try:
+            with transaction.atomic():
+                Job.objects.filter(pk=job.pk).update(
+                    status=Job.PENDING, locked_until=None, last_error=error,
+                    run_at=timezone.now() + timedelta(seconds=delay),
+                )
+        except IntegrityError:
+            # Пока задание выполнялось, автомобиль снова изменился: ожидающее задание уже есть и сделает ту же работу
+            Job.objects.filter(pk=job.pk).delete()
+
+
+def process(jobs, config):
+    """
+    Выполняет забранные задания, сгруппированные по задаче. Возвращает (выполнено, с ошибкой).
+    """
+    groups = {}
+    for job in jobs:
+        groups.setdefault(job.task, []).append(job)
+    done = failed = 0
+    for name, group in groups.items():
+        task = registry.get(name)
+        # Пакетная задача обрабатывает группу целиком, обычная — по заданию, чтобы ошибка одного не повторяла остальные
+        batches = [group] if task is not None and task.batch else [[job] for job in group]
+        for batch in batches:
+            try:
+                if task is None:
+                    raise LookupError(f'Unknown job task: {name}')
+                execute(task, [(job.car_id, job.payload) for job in batch])
+            except Exception:
+                logger.exception('Job %s failed', name)
+                fail(batch, traceback.format_exc(), config)
+                failed += len(batch)
+            else:
+                complete(batch)
+                done += len(batch)
+    return done, failed
+
+
+class Worker:
+    """
+    Цикл воркера: забрать пачку, выполнить её в CONCURRENCY потоках, повторить. stop() завершает цикл
+    после текущей пачки.
+    """
+    def __init__(self, concurrency=None, batch_size=None, poll_interval=None):
+        config = get_config()
+        self.config = config
+        self.concurrency = concurrency or config['CONCURRENCY']
+        self.batch_size = batch_size or config['BATCH_SIZE']
+        self.poll_interval = config['POLL_INTERVAL'] if poll_interval is None else poll_interval
+        self.stopping = threading.Event()
+        self.done = self.failed = 0
+
+    def stop(self):
+        self.stopping.set()
+
+    def run(self, once=False):
+        """
+        Обрабатывает очередь; с once=True — пока в ней есть задания, срок которых наступил.
+        """
+        pool = ThreadPoolExecutor(max_workers=self.concurrency) if self.concurrency > 1 else None
+        try:
+            while not self.stopping.is_set():
+                jobs = claim(self.batch_size * self.concurrency, self.config['LEASE_SECONDS'])
+                if not jobs:
+                    if once:
+                        break
+                    self.stopping.wait(self.poll_interval)
+                    continue
+                if pool is None:
+                    results = [process(jobs, self.config)]
+                else:
+                    # Задания одного автомобиля попадают в одну часть, части делятся между потоками
+                    parts = [[] for _ in range(self.concurrency)]
+                    for job in jobs:
+                        parts[hash(job.car_id) % self.concurrency].append(job)
+                    results = pool.map(self._process_in_thread, [part for part in parts if part])
+                for done, failed in results:
+                    self.done += done
+                    self.failed += failed
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        return self.done, self.failed
+
+    def _process_in_thread(self, jobs):
+        try:
+            return process(jobs, self.config)
+        finally:
+            # У каждого потока своё соединение: закрывается по тем же правилам CONN_MAX_AGE, что и после запроса
+            close_old_connections()
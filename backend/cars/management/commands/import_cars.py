@@ -0,0 +1,267 @@
+import csv
+import json
+import os
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import reset_queries, transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from cars import cache, jobs, summaries
+from cars.models import Car
+from cars.serializers import CarBulkListSerializer, CarSerializer, _update_rows
+
+
+def read_csv(stream):
+    """
+    Строки CSV с заголовком. Пустые ячейки считаются отсутствующими (для необязательных полей — NULL).
+    """
+    for row in csv.DictReader(stream):
+        yield {key: value for key, value in row.items() if key is not None and value not in ('', None)}
+
+
+def read_ndjson(stream):
+    """
+    По одному JSON-объекту на строку; пустые строки пропускаются.
+    """
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield ValidationError({'non_field_errors': [f'Invalid JSON: {exc.msg}.']})
+
+
+def read_json_array(stream, chunk_size=1 << 16):
+    """
+    JSON-массив объектов, разбираемый по частям: в памяти только текущий кусок файла, а не весь массив.
+    """
+    decoder = json.JSONDecoder()
+    buffer, started, eof = '', False, False
+    while True:
+        buffer = buffer.lstrip()
+        if buffer and not started:
+            if buffer[0] != '[':
+                raise CommandError('Expected a JSON array of objects.')
+            buffer, started = buffer[1:], True
+            continue
+        if buffer[:1] == ']':
+            return
+        if buffer[:1] == ',':
+            buffer = buffer[1:]
+            continue
+        if buffer:
+            try:
+                item, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                if eof:
+                    raise CommandError('Invalid JSON array.')
+            else:
+                yield item
+                buffer = buffer[end:]
+                continue
+        if eof:
+            raise CommandError('Unexpected end of JSON array.')
+        # Объект не поместился в буфер целиком — дочитываем следующий кусок
+        chunk = stream.read(chunk_size)
+        eof = not chunk
+        buffer += chunk
+
+
+READERS = {
+    'csv': read_csv,
+    'ndjson': read_ndjson,
+    'json': read_json_array,
+}
+EXTENSIONS = {'.csv': 'csv', '.ndjson': 'ndjson', '.jsonl': 'ndjson', '.json': 'json'}
+
+
+class Checkpoint:
+    """
+    Файл с позицией импорта: номер последней записи, попавшей в закоммиченную пачку, и счётчики.
+    Перезаписывается атомарно (os.replace) после каждой пачки и удаляется по завершении импорта.
+    """
+    def __init__(self, path, source):
+        self.path = path
+        self.source = source
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return None
+        with open(self.path, encoding='utf-8') as file:
+            state = json.load(file)
+        if state.get('source') != self.source:
+            raise CommandError(f'Checkpoint {self.path} belongs to another file: {state.get("source")}')
+        return state
+
+    def save(self, position, totals):
+        if not self.path:
+            return
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump({'source': self.source, 'position': position, 'totals': totals}, file)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class Command(BaseCommand):
+    help = (
+        'Потоковый импорт автомобилей из CSV, NDJSON или JSON-массива. '
+        'Строки проверяются правилами CarSerializer и записываются пачками bulk_create в отдельных транзакциях.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Файл с автомобилями')
+        parser.add_argument('--owner', required=True, help='Имя пользователя-дилера, которому принадлежат автомобили')
+        parser.add_argument('--format', choices=sorted(READERS), help='Формат файла (по умолчанию — по расширению)')
+        parser.add_argument('--encoding', default='utf-8-sig')
+        parser.add_argument(
+            '--key', metavar='COLUMN',
+            help='Колонка с внешним идентификатором: записи с уже известным идентификатором дилера обновляются',
+        )
+        parser.add_argument('--batch-size', type=int, default=2000, help='Записей в одной транзакции')
+        parser.add_argument('--dry-run', action='store_true', help='Только проверить файл, ничего не записывая')
+        parser.add_argument(
+            '--checkpoint', metavar='FILE',
+            help='Файл позиции: после сбоя повторный запуск с тем же файлом продолжит с последней пачки',
+        )
+        parser.add_argument(
+            '--max-errors', type=int, default=1000, help='Прервать импорт, если некорректных записей больше',
+        )
+
+    def handle(self, path, **options):
+        try:
+            owner = User.objects.get(username=options['owner'])
+        except User.DoesNotExist:
+            raise CommandError(f'User "{options["owner"]}" does not exist.')
+        file_format = options['format'] or EXTENSIONS.get(os.path.splitext(path)[1].lower())
+        if file_format is None:
+            raise CommandError('Cannot detect file format, use --format.')
+
+        self.owner = owner
+        self.verbosity = options['verbosity']
+        self.key = options['key']
+        self.dry_run = options['dry_run']
+        self.batch_size = max(options['batch_size'], 1)
+        self.serializer = CarSerializer()  # Один экземпляр на весь импорт: поля строятся один раз
+        checkpoint = Checkpoint(None if self.dry_run else options['checkpoint'], os.path.abspath(path))
+
+        state = checkpoint.load()
+        position = state['position'] if state else 0
+        self.totals = state['totals'] if state else {'created': 0, 'updated': 0, 'invalid': 0}
+        if position:
+            self.stdout.write(f'Продолжение с записи {position + 1} (checkpoint {checkpoint.path})')
+
+        self.started = time.perf_counter()
+        self.processed = 0
+        batch = []
+        with open(path, encoding=options['encoding'], newline='') as stream:
+            for number, record in enumerate(READERS[file_format](stream), 1):
+                if number <= position:
+                    continue
+                self.processed += 1
+                item = self.validate(number, record)
+                if item is None:
+                    if self.totals['invalid'] > options['max_errors']:
+                        raise CommandError(
+                            f'Too many invalid records ({self.totals["invalid"]}); '
+                            f'committed up to record {position}.'
+                        )
+                    continue
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    self.write_batch(batch)
+                    position = number
+                    checkpoint.save(position, self.totals)
+                    self.report(position)
+                    batch = []
+        if batch:
+            self.write_batch(batch)
+        checkpoint.clear()
+
+        elapsed = time.perf_counter() - self.started
+        self.stdout.write(self.style.SUCCESS(
+            f'{"Проверено" if self.dry_run else "Импортировано"} за {elapsed:.1f} s: '
+            f'создано {self.totals["created"]}, обновлено {self.totals["updated"]}, '
+            f'с ошибками {self.totals["invalid"]} ({self.processed / elapsed if elapsed else 0:.0f} записей/с)'
+        ))
+
+    def validate(self, number, record):
+        """
+        Проверяет запись правилами CarSerializer; возвращает (внешний ключ, данные) или None с выводом ошибок.
+        """
+        try:
+            if isinstance(record, ValidationError):
+                raise record
+            attrs = self.serializer.run_validation(record)
+            key = None
+            if self.key:
+                key = str(record.get(self.key) or '').strip()
+                if not key:
+                    raise ValidationError({self.key: ['This field is required.']})
+                if len(key) > Car._meta.get_field('external_id').max_length:
+                    raise ValidationError({self.key: ['Ensure this field has no more than 100 characters.']})
+        except ValidationError as exc:
+            self.totals['invalid'] += 1
+            self.stderr.write(f'Запись {number}: {json.dumps(exc.detail, ensure_ascii=False)}')
+            return None
+        return key, attrs
+
+    def write_batch(self, batch):
+        """
+        Записывает пачку одной транзакцией: новые автомобили — bulk_create, известные по --key — UPDATE через executemany.
+        """
+        if self.key:
+            # Повтор ключа внутри пачки: побеждает последняя запись
+            rows = dict(batch)
+            # Вместе с pk читаются прежние значения полей сводок (cars/summaries.py), чтобы вычесть их
+            existing = {
+                row.pop('external_id'): row
+                for row in Car.objects.filter(owner=self.owner, external_id__in=list(rows))
+                .values('external_id', 'pk', *summaries.TRACKED)
+            }
+        else:
+            rows, existing = batch, {}
+
+        now = timezone.now()
+        creates, updates, changes = [], {}, []
+        for key, attrs in (rows.items() if self.key else rows):
+            if key in existing:
+                old = existing[key]
+                car = Car(pk=old.pop('pk'), **attrs)
+                car.updated_at = now
+                updates.setdefault(tuple(sorted(attrs)), []).append(car)
+                changes.append((old, summaries.changed_row(old, car, attrs)))
+            else:
+                creates.append(Car(owner=self.owner, owner_username=self.owner.username, external_id=key, **attrs))
+
+        if not self.dry_run:
+            with transaction.atomic():
+                Car.objects.bulk_create(creates, batch_size=CarBulkListSerializer.batch_size)
+                for fields, cars in updates.items():
+                    _update_rows(cars, [*fields, 'updated_at'])
+                # bulk_create и UPDATE идут в обход сигналов, поэтому кэш каталога сбрасываем, фоновые задачи ставим
+                # и сводки обновляем явно
+                cache.invalidate()
+                jobs.car_changed([car.pk for car in creates] + [car.pk for cars in updates.values() for car in cars])
+                summaries.record(changes + [(None, summaries.row(car)) for car in creates])
+            # При DEBUG=True Django копит текст всех запросов (для пачек INSERT — мегабайты)
+            reset_queries()
+        self.totals['created'] += len(creates)
+        self.totals['updated'] += sum(len(cars) for cars in updates.values())
+
+    def report(self, position):
+        if self.verbosity < 1:
+            return
+        elapsed = time.perf_counter() - self.started
+        self.stdout.write(
+            f'{position} записей: создано {self.totals["created"]}, обновлено {self.totals["updated"]}, '
+            f'с ошибками {self.totals["invalid"]}; {self.processed / elapsed:.0f} записей/с'
+        )
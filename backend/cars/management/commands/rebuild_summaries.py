@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from cars import summaries
+
+
+class Command(BaseCommand):
+    help = (
+        'Полностью пересобирает сводные таблицы статистики каталога (cars/summaries.py) по cars_car. '
+        'Нужна после QuerySet.update или сырого SQL по автомобилям, которые обходят инкрементальное обновление.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS, help='Алиас базы данных')
+        parser.add_argument(
+            '--check', action='store_true', help='Только сравнить сводки с полным пересчётом, ничего не записывая',
+        )
+
+    def handle(self, **options):
+        using = options['database']
+        if options['check']:
+            stale = [
+                summary.model._meta.verbose_name_plural for summary in summaries.SUMMARIES
+                if summary.stored(using) != summary.compute(using)
+            ]
+            if stale:
+                self.stdout.write(self.style.WARNING(f'Расходятся с пересчётом: {", ".join(map(str, stale))}'))
+            else:
+                self.stdout.write(self.style.SUCCESS('Сводки совпадают с пересчётом'))
+            return
+
+        started = time.perf_counter()
+        summaries.rebuild(using)
+        counts = ', '.join(
+            f'{summary.model._meta.verbose_name_plural}: {summary.model.objects.using(using).count()}'
+            for summary in summaries.SUMMARIES
+        )
+        self.stdout.write(self.style.SUCCESS(f'Сводки пересобраны за {time.perf_counter() - started:.1f} s ({counts})'))
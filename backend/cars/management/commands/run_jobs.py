@@ -0,0 +1,33 @@
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+
+from cars import jobs
+
+
+class Command(BaseCommand):
+    help = (
+        'Воркер фоновых задач (очередь cars_job, см. cars/jobs.py). '
+        'Можно запускать несколько воркеров: задание достаётся одному из них.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, help='Потоков (по умолчанию CARS_JOBS["CONCURRENCY"])')
+        parser.add_argument('--batch-size', type=int, help='Заданий на поток за раз (по умолчанию CARS_JOBS["BATCH_SIZE"])')
+        parser.add_argument('--poll-interval', type=float, help='Пауза при пустой очереди, секунд')
+        parser.add_argument('--once', action='store_true', help='Выполнить готовые задания и завершиться')
+
+    def handle(self, **options):
+        worker = jobs.Worker(options['concurrency'], options['batch_size'], options['poll_interval'])
+        if not options['once']:
+            # SIGTERM/SIGINT: текущая пачка дорабатывается, новые задания не забираются
+            for signum in (signal.SIGTERM, signal.SIGINT):
+                signal.signal(signum, lambda *args: worker.stop())
+            self.stdout.write(f'Воркер запущен: потоков {worker.concurrency}, пачка {worker.batch_size}')
+
+        started = time.perf_counter()
+        done, failed = worker.run(once=options['once'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Выполнено заданий: {done}, с ошибкой: {failed} за {time.perf_counter() - started:.1f} s'
+        ))
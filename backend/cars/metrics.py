@@ -0,0 +1,447 @@
+import json
+import logging
+import math
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import nullcontext
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.utils.crypto import constant_time_compare
+
+# Метрики производительности запросов (cars.middleware.PerformanceMiddleware, settings.CARS_METRICS).
+# На время запроса в контекстной переменной лежит RequestTimings: в него execute_hook записывает число
+# и время SQL-запросов, а phase() — время фаз CarViewSet (фильтрация, пагинация, сериализация, рендеринг).
+# Итоги запроса попадают в заголовок Server-Timing, строку лога cars.metrics (JSON) и гистограммы
+# registry, которые отдаются в формате Prometheus на /api/metrics/.
+# Без активного запроса (middleware отключено, команды, тесты моделей) phase() и execute_hook ничего не делают.
+DEFAULTS = {
+    'ENABLED': False,
+    # Заголовок Server-Timing раскрывает число и время SQL-запросов и фаз, поэтому всем ответам он отдаётся
+    # только при SERVER_TIMING = True (разработка), а иначе — лишь запросам с X-Server-Timing-Token,
+    # совпадающим с SERVER_TIMING_TOKEN (диагностика на рабочем сервере)
+    'SERVER_TIMING': False,
+    'SERVER_TIMING_TOKEN': None,
+    'LOG': True,  # Строка лога на запрос (логгер cars.metrics, уровень INFO)
+    'BUCKETS': [0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10],  # Границы, секунд
+    'WINDOW_SECONDS': 300,  # Окно скользящих квантилей
+    'WINDOW_SLICES': 10,  # Окно делится на столько срезов; устаревшие срезы отбрасываются целиком
+}
+
+QUANTILES = [0.5, 0.9, 0.99]
+
+logger = logging.getLogger('cars.metrics')
+
+_current = ContextVar('cars_request_timings', default=None)
+_NOOP = nullcontext()
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'CARS_METRICS', {})}
+
+
+def server_timing_allowed(request, config):
+    """
+    Отдавать ли этому запросу заголовок Server-Timing (см. DEFAULTS['SERVER_TIMING']).
+    """
+    if config['SERVER_TIMING']:
+        return True
+    token = config['SERVER_TIMING_TOKEN']
+    return bool(token) and constant_time_compare(request.headers.get('X-Server-Timing-Token', ''), token)
+
+
+class RequestTimings:
+    """
+    Замеры одного запроса: SQL-запросы и суммарное время по фазам (фаза может встречаться несколько раз).
+    """
+    __slots__ = ('started', 'db_queries', 'db_time', 'phases')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.phases = {}
+
+    def add(self, name, seconds):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+
+class _Phase:
+    __slots__ = ('timings', 'name', 'started')
+
+    def __init__(self, timings, name):
+        self.timings = timings
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        self.timings.add(self.name, time.perf_counter() - self.started)
+
+
+def start_request():
+    """
+    Начинает замеры запроса в текущем контексте; возвращает (timings, токен для finish_request).
+    """
+    timings = RequestTimings()
+    return timings, _current.set(timings)
+
+
+def finish_request(token):
+    _current.reset(token)
+
+
+def current():
+    return _current.get()
+
+
+def phase(name):
+    """
+    Контекстный менеджер, добавляющий время блока к фазе name текущего запроса.
+    """
+    timings = _current.get()
+    if timings is None:
+        return _NOOP
+    return _Phase(timings, name)
+
+
+def execute_hook(execute, sql, params, many, context):
+    """
+    Обёртка выполнения SQL (механизм connection.execute_wrapper): считает запросы и их время.
+    Соединения Django свои в каждом потоке, а под ASGI запросы к базе идут из потоков sync_to_async,
+    поэтому обёртка ставится на соединения постоянно (install_hook), а запрос находит через контекстную переменную.
+    """
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.db_time += time.perf_counter() - started
+        timings.db_queries += 1
+
+
+def install_hook(sender=None, connection=None, **kwargs):
+    """
+    Добавляет execute_hook в обёртки соединения (один раз); годится и как обработчик connection_created.
+    """
+    if execute_hook not in connection.execute_wrappers:
+        connection.execute_wrappers.append(execute_hook)
+
+
+class Histogram:
+    """
+    Гистограмма с фиксированными границами: накопительные счётчики за всё время процесса (тип histogram
+    в Prometheus) и скользящее окно из срезов по WINDOW_SECONDS / WINDOW_SLICES секунд для квантилей.
+    """
+    def __init__(self, buckets, window_seconds, window_slices):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Последний счётчик — +Inf
+        self.sum = 0.0
+        self.slice_seconds = window_seconds / window_slices
+        self.window_slices = window_slices
+        self.slices = deque()  # [номер среза, счётчики по границам, сумма]
+
+    def observe(self, value, now, number=None):
+        """
+        number — номер среза окна для now, если вызывающий уже вычислил его (Series.observe, один на запрос).
+        """
+        index = bisect_left(self.buckets, value)
+        self.counts[index] += 1
+        self.sum += value
+        if number is None:
+            number = int(now // self.slice_seconds)
+        if not self.slices or self.slices[-1][0] != number:
+            self.slices.append([number, [0] * len(self.counts), 0.0])
+            self._expire(number)
+        current_slice = self.slices[-1]
+        current_slice[1][index] += 1
+        current_slice[2] += value
+
+    def _expire(self, number):
+        while self.slices and self.slices[0][0] <= number - self.window_slices:
+            self.slices.popleft()
+
+    def window(self, now):
+        """
+        Счётчики по границам и сумма за последнее окно.
+        """
+        self._expire(int(now // self.slice_seconds))
+        counts, total = [0] * len(self.counts), 0.0
+        for _, slice_counts, slice_sum in self.slices:
+            counts = [a + b for a, b in zip(counts, slice_counts)]
+            total += slice_sum
+        return counts, total
+
+    def snapshot(self, now):
+        """
+        Копия накопительных счётчиков и окна на момент now (для выдачи метрик вне блокировки ряда).
+        """
+        window_counts, window_sum = self.window(now)
+        return HistogramSnapshot(self, list(self.counts), self.sum, window_counts, window_sum)
+
+    def quantile(self, counts, q):
+        """
+        Оценка квантиля по счётчикам границ с линейной интерполяцией внутри корзины, как histogram_quantile.
+        """
+        observed = sum(counts)
+        if not observed:
+            return math.nan
+        rank = q * observed
+        cumulative = 0
+        for index, count in enumerate(counts):
+            if cumulative + count >= rank and count:
+                if index == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index else 0.0
+                return lower + (self.buckets[index] - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.buckets[-1]
+
+
+class HistogramSnapshot:
+    """
+    Неизменяемая копия гистограммы: накопительные счётчики и счётчики за окно.
+    """
+    __slots__ = ('histogram', 'buckets', 'counts', 'sum', 'window_counts', 'window_sum')
+
+    def __init__(self, histogram, counts, total, window_counts, window_sum):
+        self.histogram = histogram
+        self.buckets = histogram.buckets
+        self.counts = counts
+        self.sum = total
+        self.window_counts = window_counts
+        self.window_sum = window_sum
+
+    def quantile(self, q):
+        return self.histogram.quantile(self.window_counts, q)
+
+
+class Series:
+    """
+    Метрики одной пары (представление, метод): счётчики по статусам, число SQL-запросов и гистограммы.
+    Создаётся один раз на пару (Registry.series) со своей блокировкой, поэтому запрос не ищет метки
+    в общих словарях и не ждёт запросы к другим представлениям.
+    Запрос только дописывает замеры в очередь pending (deque.append потокобезопасен без блокировки);
+    в гистограммы они переносятся пачкой по FLUSH_SIZE и перед выдачей метрик (flush).
+    """
+    FLUSH_SIZE = 256
+
+    __slots__ = ('lock', 'labels', 'config', 'slice_seconds', 'pending', 'requests', 'db_queries', 'duration',
+                 'db', 'phases')
+
+    def __init__(self, labels, config):
+        self.lock = threading.Lock()
+        self.labels = labels
+        self.config = config
+        self.slice_seconds = config['WINDOW_SECONDS'] / config['WINDOW_SLICES']
+        self.pending = deque()  # (статус, длительность, RequestTimings, now)
+        self.requests = {}  # статус -> число запросов
+        self.db_queries = 0
+        self.duration = self.histogram()
+        self.db = self.histogram()
+        self.phases = {}  # фаза -> Histogram
+
+    def histogram(self):
+        return Histogram(self.config['BUCKETS'], self.config['WINDOW_SECONDS'], self.config['WINDOW_SLICES'])
+
+    def observe(self, status_code, duration, timings, now):
+        self.pending.append((status_code, duration, timings, now))
+        if len(self.pending) >= self.FLUSH_SIZE:
+            self.flush()
+
+    def flush(self):
+        """
+        Переносит накопленные замеры в счётчики и гистограммы.
+        """
+        pending, phases = self.pending, self.phases
+        with self.lock:
+            # popleft, а не замена очереди: замеры, дописанные другими потоками во время переноса, не теряются
+            for _ in range(len(pending)):
+                status_code, duration, timings, now = pending.popleft()
+                # Срез окна у всех гистограмм ряда один и тот же: считаем его один раз на запрос
+                number = int(now // self.slice_seconds)
+                self.requests[status_code] = self.requests.get(status_code, 0) + 1
+                self.db_queries += timings.db_queries
+                self.duration.observe(duration, now, number)
+                self.db.observe(timings.db_time, now, number)
+                for name, seconds in timings.phases.items():
+                    histogram = phases.get(name)
+                    if histogram is None:
+                        histogram = phases[name] = self.histogram()
+                    histogram.observe(seconds, now, number)
+
+    def collect(self, now):
+        """
+        Согласованный снимок ряда для Registry.render: счётчики и (labels, снимок гистограммы) по метрикам.
+        """
+        self.flush()
+        with self.lock:
+            return {
+                'cars_http_requests_total': [
+                    ((*self.labels, ('status', status_code)), count) for status_code, count in self.requests.items()
+                ],
+                'cars_http_db_queries_total': [(self.labels, self.db_queries)],
+                'cars_http_request_duration_seconds': [(self.labels, self.duration.snapshot(now))],
+                'cars_http_db_duration_seconds': [(self.labels, self.db.snapshot(now))],
+                'cars_http_phase_duration_seconds': [
+                    ((*self.labels, ('phase', name)), histogram.snapshot(now))
+                    for name, histogram in self.phases.items()
+                ],
+            }
+
+
+class Registry:
+    """
+    Метрики процесса: счётчики запросов и гистограммы длительностей по представлению и методу.
+    Потокобезопасен; хранится в памяти процесса, поэтому при нескольких воркерах каждый отдаёт свои метрики.
+    Общая блокировка берётся только при появлении новой пары (представление, метод), сбросе и выдаче метрик;
+    запрос дописывается в очередь своего ряда (Series) без блокировок.
+    """
+    HISTOGRAMS = {
+        'cars_http_request_duration_seconds': 'Request processing time.',
+        'cars_http_db_duration_seconds': 'Time spent in SQL queries per request.',
+        'cars_http_phase_duration_seconds': 'Time spent in CarViewSet phases per request.',
+    }
+    COUNTERS = {
+        'cars_http_requests_total': 'Requests by view, method and status.',
+        'cars_http_db_queries_total': 'SQL queries executed while handling requests.',
+    }
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.series = {}  # (представление, метод) -> Series
+
+    def bind(self, view, method, config):
+        """
+        Ряд метрик для пары (представление, метод); создаётся при первом запросе к ней.
+        """
+        with self.lock:
+            series = self.series.get((view, method))
+            if series is None:
+                config = {
+                    'BUCKETS': list(config['BUCKETS']),
+                    'WINDOW_SECONDS': config['WINDOW_SECONDS'],
+                    'WINDOW_SLICES': config['WINDOW_SLICES'],
+                }
+                series = self.series[(view, method)] = Series((('view', view), ('method', method)), config)
+            return series
+
+    def observe(self, view, method, status_code, duration, timings, config, now=None):
+        """
+        now — момент окончания запроса по time.perf_counter (часы скользящего окна; по умолчанию — текущий).
+        """
+        # Чтение словаря без блокировки: ряд, однажды созданный, не заменяется до reset()
+        series = self.series.get((view, method)) or self.bind(view, method, config)
+        series.observe(status_code, duration, timings, time.perf_counter() if now is None else now)
+
+    def collect(self, now):
+        """
+        {метрика: {метки: значение или снимок гистограммы}} по всем рядам.
+        """
+        with self.lock:
+            series = list(self.series.values())
+        collected = {name: {} for name in (*self.COUNTERS, *self.HISTOGRAMS)}
+        for item in series:
+            for name, values in item.collect(now).items():
+                collected[name].update(values)
+        return collected
+
+    @property
+    def counters(self):
+        collected = self.collect(time.perf_counter())
+        return {name: collected[name] for name in self.COUNTERS}
+
+    def render(self, extra=()):
+        """
+        Текст в формате Prometheus (text exposition 0.0.4). extra — дополнительные строки (name, type, help, value).
+        """
+        collected = self.collect(time.perf_counter())
+        lines = []
+        for name, help_text in self.COUNTERS.items():
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} counter']
+            lines += [f'{name}{_labels(labels)} {value}' for labels, value in sorted(collected[name].items())]
+        for name, help_text in self.HISTOGRAMS.items():
+            lines += self._render_histogram(name, help_text, sorted(collected[name].items()))
+        for name, metric_type, help_text, value in extra:
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} {metric_type}', f'{name} {_number(value)}']
+        return '\n'.join(lines) + '\n'
+
+    def _render_histogram(self, name, help_text, histograms):
+        lines = [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+        for labels, snapshot in histograms:
+            cumulative = 0
+            for bound, count in zip([*snapshot.buckets, '+Inf'], snapshot.counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{_labels((*labels, ("le", _number(bound))))} {cumulative}')
+            lines.append(f'{name}_sum{_labels(labels)} {_number(snapshot.sum)}')
+            lines.append(f'{name}_count{_labels(labels)} {cumulative}')
+
+        # Квантили за скользящее окно — отдельной метрикой типа summary
+        window_name = name.replace('_seconds', '_window_seconds')
+        lines += [
+            f'# HELP {window_name} {help_text[:-1]}, quantiles over the last window.',
+            f'# TYPE {window_name} summary',
+        ]
+        for labels, snapshot in histograms:
+            for q in QUANTILES:
+                value = snapshot.quantile(q)
+                lines.append(f'{window_name}{_labels((*labels, ("quantile", _number(q))))} {_number(value)}')
+            lines.append(f'{window_name}_sum{_labels(labels)} {_number(snapshot.window_sum)}')
+            lines.append(f'{window_name}_count{_labels(labels)} {sum(snapshot.window_counts)}')
+        return lines
+
+
+registry = Registry()
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(labels):
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}' if labels else ''
+
+
+def _number(value):
+    if isinstance(value, str):
+        return value
+    if math.isnan(value):
+        return 'NaN'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def server_timing(timings, duration):
+    """
+    Значение заголовка Server-Timing: SQL, фазы и общее время, в миллисекундах.
+    """
+    db = f'db;dur={timings.db_time * 1000:.2f};desc="{timings.db_queries} queries", '
+    phases = ''.join(f'{name};dur={seconds * 1000:.2f}, ' for name, seconds in timings.phases.items())
+    return f'{db}{phases}total;dur={duration * 1000:.2f}'
+
+
+def log_request(request, view, status_code, duration, timings):
+    """
+    Структурированная строка лога: JSON с замерами запроса.
+    """
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    record = {
+        'method': request.method,
+        'path': request.path,
+        'view': view,
+        'status': status_code,
+        'duration_ms': round(duration * 1000, 3),
+        'db_queries': timings.db_queries,
+        'db_ms': round(timings.db_time * 1000, 3),
+        **{f'{name}_ms': round(seconds * 1000, 3) for name, seconds in timings.phases.items()},
+    }
+    logger.info(json.dumps(record), extra={'metrics': record})
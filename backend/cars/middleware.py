@@ -0,0 +1,118 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+from . import compression, metrics
+
+# Допустимые значения метки method: остальное сводится к OTHER, чтобы не раздувать число рядов
+METHODS = {'GET', 'HEAD', 'OPTIONS', 'POST', 'PUT', 'PATCH', 'DELETE'}
+
+
+class PerformanceMiddleware:
+    """
+    Замеры времени каждого запроса (см. cars/metrics.py): SQL-запросы, фазы CarViewSet, рендеринг.
+    Фазу render пишут сами рендереры (cars/renderers.py): хук process_template_response на каждый ответ
+    стоил больше, чем все остальные замеры запроса.
+    Ставится первым в settings.MIDDLEWARE, чтобы общее время включало остальные middleware.
+    При CARS_METRICS['ENABLED'] = False исключается из цепочки (MiddlewareNotUsed) и ничего не стоит.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.config = metrics.get_config()
+        if not self.config['ENABLED']:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        # Без SERVER_TIMING и токена заголовок не отдаётся никому: проверку запроса можно пропустить
+        self.server_timing = bool(self.config['SERVER_TIMING'] or self.config['SERVER_TIMING_TOKEN'])
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        # Обычно обёртку SQL ставит CarsConfig.ready; здесь — на случай, если метрики включили позже
+        connection_created.connect(metrics.install_hook, dispatch_uid='cars_metrics_execute_hook')
+        for connection in connections.all(initialized_only=True):
+            metrics.install_hook(connection=connection)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        timings, token = metrics.start_request()
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.finish_request(token)
+        return self.finish(request, response, timings)
+
+    async def __acall__(self, request):
+        timings, token = metrics.start_request()
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.finish_request(token)
+        return self.finish(request, response, timings)
+
+    def finish(self, request, response, timings):
+        now = time.perf_counter()
+        duration = now - timings.started
+        match = request.resolver_match
+        view = match.view_name if match is not None else 'unmatched'
+        method = request.method if request.method in METHODS else 'OTHER'
+        metrics.registry.observe(view, method, response.status_code, duration, timings, self.config, now)
+        if self.server_timing and metrics.server_timing_allowed(request, self.config):
+            response['Server-Timing'] = metrics.server_timing(timings, duration)
+        if self.config['LOG']:
+            metrics.log_request(request, view, response.status_code, duration, timings)
+        return response
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Сжатие ответов gzip или brotli по Accept-Encoding (см. cars/compression.py, settings.CARS_COMPRESSION).
+    Ставится сразу после PerformanceMiddleware: сжатие попадает в Server-Timing фазой compress.
+    В отличие от django.middleware.gzip.GZipMiddleware, есть порог размера, brotli и список типов содержимого.
+    """
+    def __init__(self, get_response):
+        self.config = compression.get_config()
+        if not self.config['ENABLED']:
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+
+    def process_response(self, request, response):
+        if not compression.compressible(response, self.config):
+            return response
+        # Ответ зависит от Accept-Encoding, даже если этому клиенту он уходит несжатым
+        patch_vary_headers(response, ['Accept-Encoding'])
+        encoding = compression.choose_encoding(request.headers.get('Accept-Encoding', ''))
+        if encoding is None:
+            return response
+
+        with metrics.phase('compress'):
+            if response.streaming:
+                if response.is_async:
+                    response.streaming_content = compression.compress_stream_async(
+                        response.streaming_content, encoding, self.config,
+                    )
+                else:
+                    response.streaming_content = compression.compress_stream(
+                        response.streaming_content, encoding, self.config,
+                    )
+                del response.headers['Content-Length']
+            else:
+                compressed = compression.compress(response.content, encoding, self.config)
+                if len(compressed) >= len(response.content):
+                    return response
+                response.content = compressed
+                response.headers['Content-Length'] = str(len(compressed))
+
+        # Сжатое тело уже не побайтно то же, что несжатое: сильный ETag становится слабым (как в GZipMiddleware)
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+        return response
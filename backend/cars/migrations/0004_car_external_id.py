@@ -0,0 +1,32 @@
+# Generated by Django 5.2.2 on 2026-10-18 20:25
+
+from django.conf import settings
+from django.db import migrations, models
+
+from cars.search import install_fts
+
+
+def restore_fts(apps, schema_editor):
+    # На SQLite AddConstraint пересобирает таблицу cars_car, и триггеры FTS-индекса пропадают
+    install_fts(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cars', '0003_car_fts'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='car',
+            name='external_id',
+            field=models.CharField(blank=True, max_length=100, null=True, verbose_name='Внешний идентификатор'),
+        ),
+        migrations.AddConstraint(
+            model_name='car',
+            constraint=models.UniqueConstraint(fields=('owner', 'external_id'), name='car_owner_external_id_uniq'),
+        ),
+        migrations.RunPython(restore_fts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.2 on 2026-10-18 20:45
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+from cars.search import install_fts
+
+
+def backfill_owner_username(apps, schema_editor):
+    # Один UPDATE с подзапросом к auth_user для всех существующих автомобилей
+    Car = apps.get_model('cars', 'Car')
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+    usernames = User.objects.filter(pk=OuterRef('owner_id')).values('username')[:1]
+    Car.objects.using(schema_editor.connection.alias).update(owner_username=Subquery(usernames))
+
+
+def restore_fts(apps, schema_editor):
+    # На SQLite AddField со значением по умолчанию пересобирает таблицу cars_car, и триггеры FTS-индекса пропадают
+    install_fts(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cars', '0004_car_external_id'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='car',
+            name='owner_username',
+            field=models.CharField(default='', editable=False, max_length=150, verbose_name='Имя владельца'),
+        ),
+        migrations.RunPython(backfill_owner_username, migrations.RunPython.noop),
+        migrations.RunPython(restore_fts, migrations.RunPython.noop),
+    ]
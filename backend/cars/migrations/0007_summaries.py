@@ -0,0 +1,92 @@
+# Generated by Django 5.2.2 on 2026-10-18 21:19
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Coalesce
+
+
+def populate_summaries(apps, schema_editor):
+    # Начальное заполнение сводок по уже существующим автомобилям (дальше их ведёт cars/summaries.py)
+    Car = apps.get_model('cars', 'Car')
+    cars = Car.objects.using(schema_editor.connection.alias).order_by()
+    price_aggregates = {
+        'cars': Count('id'),
+        'price_sum': Sum('price'),
+        'mileage_cars': Count('mileage'),
+        'mileage_sum': Coalesce(Sum('mileage'), 0),
+    }
+    owner_aggregates = {
+        'cars': Count('id'),
+        'available_cars': Count('id', filter=Q(is_available=True)),
+        'price_sum': Sum('price'),
+    }
+    for name, keys, aggregates in (
+        ('PriceSummary', ['make', 'model', 'year'], price_aggregates),
+        ('YearSummary', ['year'], price_aggregates),
+        ('OwnerSummary', ['owner_id'], owner_aggregates),
+    ):
+        model = apps.get_model('cars', name)
+        model.objects.using(schema_editor.connection.alias).bulk_create(
+            [model(**row) for row in cars.values(*keys).annotate(**aggregates)], batch_size=500,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cars', '0006_job'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='YearSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.IntegerField(unique=True, verbose_name='Год выпуска')),
+                ('cars', models.IntegerField(default=0, verbose_name='Автомобилей')),
+                ('price_sum', models.DecimalField(decimal_places=2, default=0, max_digits=20, verbose_name='Сумма цен')),
+                ('mileage_cars', models.IntegerField(default=0, verbose_name='С указанным пробегом')),
+                ('mileage_sum', models.BigIntegerField(default=0, verbose_name='Сумма пробегов')),
+            ],
+            options={
+                'verbose_name': 'Сводка по году',
+                'verbose_name_plural': 'Сводки по годам',
+            },
+        ),
+        migrations.CreateModel(
+            name='OwnerSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cars', models.IntegerField(default=0, verbose_name='Автомобилей')),
+                ('available_cars', models.IntegerField(default=0, verbose_name='В наличии')),
+                ('price_sum', models.DecimalField(decimal_places=2, default=0, max_digits=20, verbose_name='Сумма цен')),
+                ('owner', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='car_summary', to=settings.AUTH_USER_MODEL, verbose_name='Владелец')),
+            ],
+            options={
+                'verbose_name': 'Сводка по владельцу',
+                'verbose_name_plural': 'Сводки по владельцам',
+            },
+        ),
+        migrations.CreateModel(
+            name='PriceSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('make', models.CharField(max_length=100, verbose_name='Марка')),
+                ('model', models.CharField(max_length=100, verbose_name='Модель')),
+                ('year', models.IntegerField(verbose_name='Год выпуска')),
+                ('cars', models.IntegerField(default=0, verbose_name='Автомобилей')),
+                ('price_sum', models.DecimalField(decimal_places=2, default=0, max_digits=20, verbose_name='Сумма цен')),
+                ('mileage_cars', models.IntegerField(default=0, verbose_name='С указанным пробегом')),
+                ('mileage_sum', models.BigIntegerField(default=0, verbose_name='Сумма пробегов')),
+            ],
+            options={
+                'verbose_name': 'Сводка по модели и году',
+                'verbose_name_plural': 'Сводки по моделям и годам',
+                'constraints': [models.UniqueConstraint(fields=('make', 'model', 'year'), name='price_summary_uniq')],
+            },
+        ),
+        migrations.RunPython(populate_summaries, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,7 @@
-from django.db import models
+from django.db import models, router, transaction
+from django.db.models.functions import Lower
 from django.contrib.auth.models import User
+from django.utils import timezone
 
 class Car(models.Model):
     """
@@ -18,11 +20,150 @@ class Car(models.Model):
 
     # Связь с пользователем, который добавил автомобиль (например, менеджер)
     owner = models.ForeignKey(User, related_name='cars', on_delete=models.CASCADE, verbose_name="Добавил(а)")
+    # Копия owner.username: список каталога отдаёт имя владельца без JOIN с auth_user.
+    # Заполняется в save() (и явно в bulk_create), при переименовании пользователя обновляется сигналом
+    owner_username = models.CharField(max_length=150, default='', editable=False, verbose_name="Имя владельца")
+    # Идентификатор автомобиля в учётной системе дилера; по нему manage.py import_cars --key обновляет уже загруженные записи
+    external_id = models.CharField(max_length=100, null=True, blank=True, verbose_name="Внешний идентификатор")
 
     class Meta:
         verbose_name = "Автомобиль"
         verbose_name_plural = "Автомобили"
         ordering = ['-created_at'] # Сортировка по дате добавления (новые сверху)
+        # Индексы повторяют реальные запросы CarViewSet/CarFilter:
+        # сортировка по умолчанию и ordering_fields, фильтр is_available + сортировка,
+        # регистронезависимые make/model (CarFilter сравнивает LOWER(...)) и диапазоны price/year.
+        indexes = [
+            models.Index(fields=['-created_at'], name='car_created_idx'),
+            models.Index(fields=['is_available', '-created_at'], name='car_avail_created_idx'),
+            models.Index(fields=['is_available', 'price'], name='car_avail_price_idx'),
+            models.Index(fields=['is_available', 'year'], name='car_avail_year_idx'),
+            models.Index(fields=['price'], name='car_price_idx'),
+            models.Index(fields=['year'], name='car_year_idx'),
+            models.Index(Lower('make'), Lower('model'), name='car_make_model_ci_idx'),
+            models.Index(Lower('model'), name='car_model_ci_idx'),
+        ]
+        constraints = [
+            # Внешний идентификатор уникален в пределах дилера (NULL не учитывается)
+            models.UniqueConstraint(fields=['owner', 'external_id'], name='car_owner_external_id_uniq'),
+        ]
 
     def __str__(self):
         return f"{self.year} {self.make} {self.model}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        # Значения в момент загрузки: по ним cars.summaries вычитает старую строку из сводных таблиц без лишнего SELECT
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def save(self, *args, **kwargs):
+        # Имя берётся у загруженного владельца (request.user, форма админки) без лишнего запроса;
+        # владелец, которого нет в памяти, загружается для новой записи, пустого имени
+        # и смены owner_id относительно загруженного значения (car.owner_id = other.pk)
+        loaded = getattr(self, '_loaded_values', {})
+        owner_changed = 'owner_id' in loaded and loaded['owner_id'] != self.owner_id
+        if self.owner_id is not None and (
+            Car.owner.is_cached(self) or self._state.adding or not self.owner_username or owner_changed
+        ):
+            self.owner_username = self.owner.username
+        update_fields = kwargs.get('update_fields')
+        owner_saved = update_fields is None or bool({'owner', 'owner_id'} & set(update_fields))
+        if update_fields is not None and owner_saved:
+            kwargs['update_fields'] = {*update_fields, 'owner_username'}
+        # Строка и то, что пишут сигналы post_save (сводки статистики), фиксируются одной транзакцией:
+        # один COMMIT и одна блокировка записи SQLite на сохранение (удаление Collector и так ведёт в одной)
+        with transaction.atomic(using=kwargs.get('using') or router.db_for_write(Car, instance=self), savepoint=False):
+            super().save(*args, **kwargs)
+        if owner_saved and 'owner_id' in loaded:
+            # Записанный владелец становится «загруженным»: следующее сохранение сравнивает уже с ним
+            self._loaded_values['owner_id'] = self.owner_id
+
+
+class Job(models.Model):
+    """
+    Фоновая задача в очереди (см. cars/jobs.py, manage.py run_jobs).
+    Выполненные задачи удаляются; в таблице остаются ожидающие, выполняемые и окончательно упавшие.
+    """
+    PENDING, RUNNING, FAILED = 'pending', 'running', 'failed'
+    STATUS_CHOICES = [(PENDING, 'Ожидает'), (RUNNING, 'Выполняется'), (FAILED, 'Ошибка')]
+
+    task = models.CharField(max_length=200, verbose_name="Задача") # Имя из реестра cars.jobs.registry
+    # Не ForeignKey: задача об удалённом автомобиле должна пережить его удаление
+    car_id = models.BigIntegerField(null=True, blank=True, verbose_name="Автомобиль")
+    payload = models.JSONField(default=dict, blank=True, verbose_name="Параметры")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING, verbose_name="Статус")
+    attempts = models.PositiveIntegerField(default=0, verbose_name="Попыток")
+    run_at = models.DateTimeField(default=timezone.now, verbose_name="Выполнить после")
+    # До этого момента задача закреплена за воркером; если он упал, задачу подхватит другой
+    locked_until = models.DateTimeField(null=True, blank=True, verbose_name="Занята до")
+    last_error = models.TextField(blank=True, default='', verbose_name="Последняя ошибка")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Создана")
+
+    class Meta:
+        verbose_name = "Фоновая задача"
+        verbose_name_plural = "Фоновые задачи"
+        indexes = [
+            # Выборка воркера: ожидающие задачи, срок которых наступил, по порядку
+            models.Index(fields=['status', 'run_at'], name='job_status_run_at_idx'),
+        ]
+        constraints = [
+            # Не больше одной ожидающей задачи каждого вида на автомобиль: повторные изменения сливаются в неё
+            models.UniqueConstraint(
+                fields=['task', 'car_id'], condition=models.Q(status='pending'), name='job_pending_car_uniq',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.task} ({self.car_id})" if self.car_id is not None else self.task
+
+
+class PriceSummary(models.Model):
+    """
+    Сводка по марке, модели и году: число автомобилей, суммы цен и пробегов (см. cars/summaries.py).
+    Средние считаются при чтении: price_sum / cars, mileage_sum / mileage_cars.
+    """
+    make = models.CharField(max_length=100, verbose_name="Марка")
+    model = models.CharField(max_length=100, verbose_name="Модель")
+    year = models.IntegerField(verbose_name="Год выпуска")
+    cars = models.IntegerField(default=0, verbose_name="Автомобилей")
+    price_sum = models.DecimalField(max_digits=20, decimal_places=2, default=0, verbose_name="Сумма цен")
+    mileage_cars = models.IntegerField(default=0, verbose_name="С указанным пробегом") # Пробег необязателен
+    mileage_sum = models.BigIntegerField(default=0, verbose_name="Сумма пробегов")
+
+    class Meta:
+        verbose_name = "Сводка по модели и году"
+        verbose_name_plural = "Сводки по моделям и годам"
+        constraints = [
+            models.UniqueConstraint(fields=['make', 'model', 'year'], name='price_summary_uniq'),
+        ]
+
+
+class YearSummary(models.Model):
+    """
+    Сводка по году выпуска: число автомобилей, суммы цен и пробегов.
+    """
+    year = models.IntegerField(unique=True, verbose_name="Год выпуска")
+    cars = models.IntegerField(default=0, verbose_name="Автомобилей")
+    price_sum = models.DecimalField(max_digits=20, decimal_places=2, default=0, verbose_name="Сумма цен")
+    mileage_cars = models.IntegerField(default=0, verbose_name="С указанным пробегом")
+    mileage_sum = models.BigIntegerField(default=0, verbose_name="Сумма пробегов")
+
+    class Meta:
+        verbose_name = "Сводка по году"
+        verbose_name_plural = "Сводки по годам"
+
+
+class OwnerSummary(models.Model):
+    """
+    Склад владельца: всего автомобилей, в наличии и сумма цен.
+    """
+    owner = models.OneToOneField(User, related_name='car_summary', on_delete=models.CASCADE, verbose_name="Владелец")
+    cars = models.IntegerField(default=0, verbose_name="Автомобилей")
+    available_cars = models.IntegerField(default=0, verbose_name="В наличии")
+    price_sum = models.DecimalField(max_digits=20, decimal_places=2, default=0, verbose_name="Сумма цен")
+
+    class Meta:
+        verbose_name = "Сводка по владельцу"
+        verbose_name_plural = "Сводки по владельцам"
@@ -0,0 +1,205 @@
+import base64
+import binascii
+import json
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class CarKeysetPagination(BasePagination):
+    """
+    Курсорная (keyset) пагинация для списка автомобилей.
+    Не выполняет COUNT(*) и OFFSET: следующая страница выбирается условием по значению поля сортировки
+    и уникальному id последней строки, поэтому глубина листания не влияет на скорость,
+    а вставка новых автомобилей не сдвигает уже просмотренные страницы.
+    """
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = 'cursor'
+    default_ordering = '-created_at'  # Та же сортировка, что и у CarViewSet.queryset
+    tiebreaker = 'id'  # Уникальное поле, разрешающее одинаковые значения поля сортировки
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.build_page(list(self.get_page_queryset(queryset, request, view)))
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """
+        Возвращает срез queryset для текущей страницы (page_size + 1 строка, чтобы узнать, есть ли продолжение).
+        Выборку выполняет вызывающий код, после чего передаёт строки в build_page().
+        """
+        self.request = request
+        self.field, self.descending = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request, queryset.model)
+        self.reverse = bool(self.cursor and self.cursor['reverse'])
+
+        # При движении назад идём в обратном порядке, а потом разворачиваем результат
+        descending = self.descending != self.reverse
+        prefix = '-' if descending else ''
+        queryset = queryset.order_by(prefix + self.field, prefix + self.tiebreaker)
+        if self.cursor:
+            lookup = 'lt' if descending else 'gt'
+            queryset = queryset.filter(
+                Q(**{f'{self.field}__{lookup}': self.cursor['value']}) |
+                Q(**{self.field: self.cursor['value'], f'{self.tiebreaker}__{lookup}': self.cursor['id']})
+            )
+        return queryset[:self.page_size + 1]
+
+    def build_page(self, rows):
+        """
+        Формирует страницу и ссылки next/previous по выбранным строкам.
+        Строки могут быть как экземплярами модели, так и словарями из .values().
+        """
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if self.reverse:
+            rows.reverse()
+            has_next, has_previous = bool(rows), has_more
+        else:
+            has_next, has_previous = has_more, self.cursor is not None
+
+        self.next_position = self._position(rows[-1]) if rows and has_next else None
+        self.previous_position = self._position(rows[0]) if rows and has_previous else None
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        return self.encode_cursor(self.next_position, reverse=False)
+
+    def get_previous_link(self):
+        if self.previous_position is None:
+            return None
+        return self.encode_cursor(self.previous_position, reverse=True)
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Определяет поле сортировки так же, как OrderingFilter (?ordering=...).
+        Учитывается только первое поле: второй ключ — всегда уникальный tiebreaker.
+        """
+        ordering = None
+        if view is not None:
+            for backend in getattr(view, 'filter_backends', []):
+                if issubclass(backend, OrderingFilter):
+                    ordering = backend().get_ordering(request, queryset, view)
+                    break
+        field = ordering[0] if ordering else self.default_ordering
+        return field.lstrip('-'), field.startswith('-')
+
+    def encode_cursor(self, position, reverse):
+        value, pk = position
+        payload = json.dumps({'f': self.field, 'v': value, 'id': pk, 'r': int(reverse)}, separators=(',', ':'))
+        token = base64.urlsafe_b64encode(payload.encode('ascii')).decode('ascii')
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, token)
+
+    def decode_cursor(self, request, model):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token.encode('ascii')).decode('ascii'))
+            if payload['f'] != self.field:
+                # Курсор получен при другой сортировке — продолжать по нему нельзя
+                raise ValueError('Ordering mismatch')
+            return {
+                'value': model._meta.get_field(self.field).to_python(payload['v']),
+                'id': int(payload['id']),
+                'reverse': bool(payload.get('r')),
+            }
+        except (TypeError, ValueError, KeyError, UnicodeError, binascii.Error, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def _position(self, row):
+        if isinstance(row, dict):
+            value, pk = row[self.field], row[self.tiebreaker]
+        else:
+            value, pk = getattr(row, self.field), getattr(row, self.tiebreaker)
+        if isinstance(value, (datetime, date)):
+            value = value.isoformat()
+        elif isinstance(value, Decimal):
+            value = str(value)
+        return value, pk
+
+
+class CarPagination(PageNumberPagination):
+    """
+    Пагинация CarViewSet: по умолчанию постраничная (с общим количеством count),
+    а с параметром ?pagination=cursor — курсорная CarKeysetPagination для бесконечной прокрутки и обходчиков.
+    """
+    mode_query_param = 'pagination'
+    cursor_mode = 'cursor'
+    cursor_pagination_class = CarKeysetPagination
+    delegate = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.delegate = self.get_delegate(request)
+        if self.delegate is not None:
+            return self.delegate.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_delegate(self, request):
+        """
+        Возвращает курсорный пагинатор, если клиент его запросил, иначе None.
+        """
+        if request.query_params.get(self.mode_query_param) == self.cursor_mode:
+            return self.cursor_pagination_class()
+        return None
+
+    def get_paginated_response(self, data):
+        if self.delegate is not None:
+            return self.delegate.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_next_link(self):
+        if self.delegate is not None:
+            return self.delegate.get_next_link()
+        return super().get_next_link()
+
+    def get_previous_link(self):
+        if self.delegate is not None:
+            return self.delegate.get_previous_link()
+        return super().get_previous_link()
+
+    def get_schema_operation_parameters(self, view):
+        return super().get_schema_operation_parameters(view) + [
+            {
+                'name': self.mode_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Set to "cursor" to use keyset pagination without total count.',
+                'schema': {'type': 'string', 'enum': [self.cursor_mode]},
+            },
+            {
+                'name': self.cursor_pagination_class.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'The pagination cursor value.',
+                'schema': {'type': 'string'},
+            },
+        ]
@@ -5,7 +5,6 @@ class IsOwner(permissions.BasePermission):
     Пользовательское разрешение, позволяющее только владельцам объекта редактировать или удалять его.
     """
     def has_object_permission(self, request, view, obj):
-
-        return obj.owner == request.user # Если владелец объекта совпадает с пользователем из запроса, то True. Иначе - False
-    
-    
\ No newline at end of file
+        # Сравниваем по owner_id, чтобы не загружать объект владельца лишним запросом.
+        # Если владелец объекта совпадает с пользователем из запроса, то True. Иначе - False
+        return obj.owner_id == request.user.pk
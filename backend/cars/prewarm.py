@@ -0,0 +1,79 @@
+from django.apps import apps
+from django.conf import settings
+from django.urls import URLResolver, get_resolver
+from django.utils import translation
+from rest_framework import serializers
+
+# Прогрев процесса-воркера до первого запроса (settings.CARS_PREWARM, включён в settings_api).
+# Вызывается из wsgi.py / asgi.py после загрузки приложения: под gunicorn --preload прогретое состояние
+# достаётся воркерам при fork. Всё, что Django и DRF иначе строят лениво на первом запросе, делается здесь:
+# импорт URLconf и представлений, компиляция регулярных выражений маршрутов, обратный словарь reverse(),
+# поля сериализаторов и формы фильтров, кэши полей моделей (_meta), каталоги переводов.
+# Соединения с базой не открываются: они не переживают fork и создаются уже в воркере.
+DEFAULTS = {
+    'ENABLED': False,
+}
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'CARS_PREWARM', {})}
+
+
+def startup():
+    """
+    Прогрев при старте воркера, если он включён в настройках.
+    """
+    if get_config()['ENABLED']:
+        return warm_up()
+    return None
+
+
+def warm_up():
+    """
+    Выполняет прогрев и возвращает, сколько маршрутов, представлений и моделей он затронул.
+    """
+    resolver = get_resolver()
+    resolver.reverse_dict  # Заполнение словарей reverse() (_populate) и импорт всех URLconf
+    views = set()
+    routes = _warm_patterns(resolver.url_patterns, views)
+    for view in views:
+        _warm_view(view)
+    models = apps.get_models()
+    for model in models:
+        model._meta.get_fields()
+    if settings.USE_I18N:
+        # Первый вызов gettext загружает каталоги переводов всех приложений
+        with translation.override(settings.LANGUAGE_CODE):
+            translation.gettext('This field is required.')
+    return {'routes': routes, 'views': len(views), 'models': len(models)}
+
+
+def _warm_patterns(patterns, views):
+    count = 0
+    for pattern in patterns:
+        pattern.pattern.regex  # Регулярное выражение маршрута компилируется при первом обращении
+        if isinstance(pattern, URLResolver):
+            count += _warm_patterns(pattern.url_patterns, views)
+        else:
+            count += 1
+            view = getattr(pattern.callback, 'cls', None)  # Класс представления DRF (as_view)
+            if view is not None:
+                views.add(view)
+    return count
+
+
+def _warm_view(view):
+    for name in ('serializer_class', 'read_serializer_class'):
+        serializer_class = getattr(view, name, None)
+        if serializer_class is None:
+            continue
+        serializer = serializer_class()
+        if isinstance(serializer, serializers.Serializer):
+            # Интроспекция модели ModelSerializer, вложенные сериализаторы и валидаторы полей
+            for field in serializer.fields.values():
+                field.validators
+            serializer.validators
+    filterset_class = getattr(view, 'filterset_class', None)
+    queryset = getattr(view, 'queryset', None)
+    if filterset_class is not None and queryset is not None:
+        filterset_class(queryset=queryset.none()).form
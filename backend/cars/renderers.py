@@ -0,0 +1,124 @@
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils import encoders
+
+from . import metrics
+
+# Быстрые и компактные форматы ответов. orjson и msgpack — необязательные зависимости:
+# без orjson FastJSONRenderer работает через json из стандартной библиотеки (как JSONRenderer DRF),
+# без msgpack формат MessagePack просто не предлагается клиентам.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Типы, которых нет в JSON / MessagePack (Decimal, datetime, ленивые строки перевода), кодируются так же, как в DRF
+_encoder = encoders.JSONEncoder()
+
+
+class PrometheusRenderer(BaseRenderer):
+    """
+    Текстовый формат Prometheus для /api/metrics/: строка отдаётся как есть,
+    ошибки DRF (например, 403) — текстом их detail.
+    """
+    media_type = 'text/plain'
+    format = 'prometheus'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, dict) and 'detail' in data:
+            data = f"{data['detail']}\n"
+        return str(data).encode(self.charset)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer на orjson: тот же компактный JSON, что и у DRF, в несколько раз быстрее.
+    datetime, Decimal и прочие типы кодируются JSONEncoder DRF, поэтому вывод совпадает с JSONRenderer.
+    Отступы (Browsable API, Accept: application/json; indent=4), ensure_ascii (UNICODE_JSON = False)
+    и отсутствие orjson обрабатывает обычный JSONRenderer.
+    Время рендеринга учитывается как фаза render в метриках запроса (cars/metrics.py).
+    """
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with metrics.phase('render'):
+            return self.encode(self.prepare(data), accepted_media_type, renderer_context)
+
+    def prepare(self, data):
+        """
+        Данные перед кодированием; подклассы меняют их форму (см. CompactJSONRenderer).
+        """
+        return data
+
+    def encode(self, data, accepted_media_type, renderer_context):
+        if orjson is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        ret = orjson.dumps(
+            data, default=_encoder.default, option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+        )
+        # Как и JSONRenderer, экранируем U+2028 и U+2029, чтобы ответ оставался подмножеством JavaScript
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+def columnar(data):
+    """
+    Столбцовый вид списка: [{"id": 1, "make": ...}, ...] -> {"fields": ["id", "make", ...], "rows": [[1, ...], ...]}.
+    У страницы пагинации так преобразуется results, остальные ключи (count, next, previous) остаются.
+    Прочие данные (один объект, ошибки, списки не из словарей) возвращаются без изменений.
+    """
+    if isinstance(data, dict):
+        results = data.get('results')
+        if isinstance(results, list) and all(isinstance(row, dict) for row in results):
+            data = {name: value for name, value in data.items() if name != 'results'}
+            data.update(columnar(results))
+        return data
+    if not isinstance(data, list) or not all(isinstance(row, dict) for row in data):
+        return data
+    fields = {}
+    for row in data:
+        # Строки одного сериализатора обычно имеют одинаковые ключи; новые ключи дописываются в конец
+        if row.keys() != fields.keys():
+            fields.update(dict.fromkeys(row))
+    return {'fields': list(fields), 'rows': [[row.get(name) for name in fields] for row in data]}
+
+
+class CompactJSONRenderer(FastJSONRenderer):
+    """
+    Компактный JSON для списков (?format=compact или Accept: application/vnd.cars.compact+json):
+    имена полей передаются один раз, строки — массивами значений (см. columnar).
+    """
+    media_type = 'application/vnd.cars.compact+json'
+    format = 'compact'
+
+    def prepare(self, data):
+        return columnar(data)
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    MessagePack (?format=msgpack или Accept: application/msgpack): двоичный формат с той же структурой, что и JSON.
+    Требует пакет msgpack; без него рендерер не входит в CATALOGUE_RENDERERS.
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        with metrics.phase('render'):
+            return msgpack.packb(data, default=_encoder.default, use_bin_type=True)
+
+
+# Дополнительные форматы ответов каталога (CarViewSet, /api/stats/) сверх DEFAULT_RENDERER_CLASSES
+CATALOGUE_RENDERERS = [CompactJSONRenderer] + ([MessagePackRenderer] if msgpack is not None else [])
@@ -0,0 +1,103 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+from . import cache
+
+# Чтение каталога с реплик (settings.CARS_READ_REPLICAS).
+# CarViewSet на время запроса list/retrieve/export/facets выбирает алиас базы для чтения (read_alias)
+# и кладёт его в контекстную переменную, а ReplicaRouter направляет по ней все чтения; запись всегда идёт
+# на основную базу. Админка и прочий код контекст не задают и читают с основной базы.
+# Чтобы пользователь сразу видел свои изменения, после записи он на STICKY_SECONDS закрепляется
+# за основной базой. Метки хранятся в кэше cars.cache, поэтому общие для всех воркеров при общем бэкенде.
+DEFAULTS = {
+    'ALIASES': [],  # Алиасы реплик из settings.DATABASES
+    'STICKY_SECONDS': 10,  # Окно после записи; должно быть не меньше задержки репликации
+}
+
+_read_db = ContextVar('cars_read_db', default=None)
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'CARS_READ_REPLICAS', {})}
+
+
+def replica_aliases():
+    return list(get_config()['ALIASES'])
+
+
+def _pin_key(user_pk):
+    return cache._key('replica-pin', user_pk)
+
+
+def mark_write(user=None):
+    """
+    Отмечает запись в каталог: закрепляет пользователя (если он известен) за основной базой на STICKY_SECONDS.
+    Остальные клиенты продолжают читать с реплик и пользоваться общим кэшем ответов (см. cache_timeout).
+    """
+    if not replica_aliases() or user is None or not user.is_authenticated:
+        return
+    cache.get_cache().set(_pin_key(user.pk), 1, get_config()['STICKY_SECONDS'])
+
+
+def pinned():
+    """
+    Читает ли текущий запрос с основной базы из-за недавней записи пользователя (read-your-writes).
+    Такой запрос не берёт ответы из общего кэша: там могут лежать прочитанные с реплики до синхронизации.
+    """
+    return bool(replica_aliases()) and _read_db.get() == DEFAULT_DB_ALIAS
+
+
+def cache_timeout(timeout):
+    """
+    Время жизни в кэше ответов для данных, прочитанных в текущем контексте. Реплика может отставать
+    от основной базы до STICKY_SECONDS, и ответ, прочитанный с неё сразу после записи, попал бы в кэш
+    под новым поколением; поэтому прочитанное с реплики хранится не дольше STICKY_SECONDS
+    и не переживает её синхронизацию надолго. Прочитанное с основной базы хранится обычное время.
+    """
+    alias = _read_db.get()
+    if alias is None or alias == DEFAULT_DB_ALIAS:
+        return timeout
+    return min(timeout, get_config()['STICKY_SECONDS'])
+
+
+def read_alias(user=None):
+    """
+    Алиас базы для чтения каталога: случайная реплика или основная база, если реплик нет
+    или пользователь недавно писал (read-your-writes).
+    """
+    aliases = replica_aliases()
+    if not aliases:
+        return DEFAULT_DB_ALIAS
+    if user is not None and user.is_authenticated and cache.get_cache().get(_pin_key(user.pk)) is not None:
+        return DEFAULT_DB_ALIAS
+    return random.choice(aliases)
+
+
+def set_read_db(alias):
+    """
+    Задаёт базу для чтения в текущем контексте; возвращает токен для reset_read_db.
+    """
+    return _read_db.set(alias)
+
+
+def reset_read_db(token):
+    _read_db.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Роутер для settings.DATABASE_ROUTERS: чтение — из базы, выбранной для текущего запроса (иначе основная),
+    запись — всегда в основную базу, даже если объект был прочитан с реплики.
+    """
+    def db_for_read(self, model, **hints):
+        return _read_db.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплики содержат те же данные, что и основная база
+        return True
@@ -0,0 +1,111 @@
+import re
+
+from django.db import connections
+from rest_framework import filters
+
+# Полнотекстовый индекс по объявлениям: виртуальная таблица SQLite FTS5 с внешним содержимым (cars_car).
+# Индекс обновляется триггерами на INSERT/UPDATE/DELETE в cars_car, поэтому он синхронен
+# не только с Car.save()/delete(), но и с bulk_create, queryset.update() и удалениями через админку.
+FTS_TABLE = 'cars_car_fts'
+FTS_COLUMNS = ('make', 'model', 'description')
+
+FTS_CREATE_SQL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    f"{', '.join(FTS_COLUMNS)}, content='cars_car', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+)
+FTS_TRIGGERS_SQL = [
+    f"""CREATE TRIGGER IF NOT EXISTS cars_car_fts_ai AFTER INSERT ON cars_car BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, make, model, description)
+        VALUES (new.id, new.make, new.model, new.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS cars_car_fts_ad AFTER DELETE ON cars_car BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, make, model, description)
+        VALUES ('delete', old.id, old.make, old.model, old.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS cars_car_fts_au AFTER UPDATE OF make, model, description ON cars_car BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, make, model, description)
+        VALUES ('delete', old.id, old.make, old.model, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, make, model, description)
+        VALUES (new.id, new.make, new.model, new.description);
+    END""",
+]
+FTS_REBUILD_SQL = f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+FTS_DROP_SQL = [
+    'DROP TRIGGER IF EXISTS cars_car_fts_ai',
+    'DROP TRIGGER IF EXISTS cars_car_fts_ad',
+    'DROP TRIGGER IF EXISTS cars_car_fts_au',
+    f'DROP TABLE IF EXISTS {FTS_TABLE}',
+]
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def install_fts(schema_editor):
+    """
+    Создаёт FTS5-таблицу и триггеры синхронизации и индексирует уже существующие автомобили.
+    На других СУБД ничего не делает: поиск там работает через icontains.
+    Вызывается из миграций; триггеры пересоздаются идемпотентно (например, после пересборки таблицы cars_car).
+    """
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in [FTS_CREATE_SQL, *FTS_TRIGGERS_SQL]:
+        schema_editor.execute(sql)
+    schema_editor.execute(FTS_REBUILD_SQL)
+
+
+def uninstall_fts(schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in FTS_DROP_SQL:
+        schema_editor.execute(sql)
+
+
+def build_match_query(text):
+    """
+    Превращает пользовательскую строку поиска в безопасный запрос FTS5.
+    Каждое слово ищется по префиксу ("Toyo" найдёт "Toyota"), все слова должны присутствовать (AND).
+    Возвращает None, если в строке нет ни одного слова.
+    """
+    tokens = TOKEN_RE.findall(text)
+    if not tokens:
+        return None
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def fts_available(alias):
+    return connections[alias].vendor == 'sqlite'
+
+
+def match_queryset(queryset, match, rank_field=None):
+    """
+    Оставляет в queryset автомобили, найденные в cars_car_fts по запросу match (см. build_match_query);
+    rank_field — имя, под которым добавить релевантность BM25.
+    """
+    return queryset.extra(
+        select={rank_field: f'{FTS_TABLE}.rank'} if rank_field else None,
+        tables=[FTS_TABLE],
+        where=[f'{FTS_TABLE}.rowid = cars_car.id', f'{FTS_TABLE} MATCH %s'],
+        params=[match],
+    )
+
+
+class CarSearchFilter(filters.SearchFilter):
+    """
+    Бэкенд поиска для CarViewSet (?search=...) на основе полнотекстового индекса cars_car_fts.
+    Результаты ранжируются по релевантности (BM25), если клиент не задал ?ordering.
+    На СУБД без FTS5 работает как обычный SearchFilter по search_fields.
+    """
+    rank_field = 'search_rank'
+
+    def filter_queryset(self, request, queryset, view):
+        if not fts_available(queryset.db):
+            return super().filter_queryset(request, queryset, view)
+        match = build_match_query(request.query_params.get(self.search_param, ''))
+        if match is None:
+            return queryset
+        queryset = match_queryset(queryset, match, self.rank_field)
+        if not request.query_params.get(filters.OrderingFilter.ordering_param):
+            # BM25 в FTS5 отрицательный: чем меньше значение, тем выше релевантность
+            queryset = queryset.order_by(self.rank_field, '-created_at')
+        return queryset
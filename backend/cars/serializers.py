@@ -1,23 +1,89 @@
+from decimal import Decimal
+from functools import cached_property, partial
+
+from django.db import connection
+from django.utils import timezone
 from rest_framework import serializers
-from .models import Car
-from django.contrib.auth.models import User
+from . import metrics
+from .models import Car, OwnerSummary, PriceSummary, YearSummary
 
-class UserSerializer(serializers.ModelSerializer):
+class TimedDataMixin:
     """
-    Сериализатор для модели User (используется для отображения владельца автомобиля).
-    Мы включаем только имя пользователя, так как не хотим раскрывать чувствительные данные.
+    Построение .data учитывается как фаза serialize в метриках запроса (cars/metrics.py).
     """
-    class Meta:
-        model = User
-        fields = ['username'] # Отображаем только имя пользователя
+    @property
+    def data(self):
+        with metrics.phase('serialize'):
+            return super().data
+
+class CarBulkListSerializer(TimedDataMixin, serializers.ListSerializer):
+    """
+    Сериализатор списка автомобилей для пакетных операций (/api/cars/bulk/).
+    Проверяет каждый элемент правилами CarSerializer, а записывает всё пачками (bulk_create / executemany).
+    Для обновления instance — словарь {id: Car}, а каждый элемент данных содержит 'id'.
+    """
+    batch_size = 500 # Размер пачки для bulk_create (ограничение SQLite на число параметров)
+
+    def run_child_validation(self, data):
+        if isinstance(self.instance, dict):
+            self.child.instance = self.instance[data['id']]
+        return super().run_child_validation(data)
+
+    def create(self, validated_data):
+        owner = self.context['request'].user
+        # bulk_create обходит Car.save(), поэтому имя владельца заполняем сами
+        cars = [Car(owner=owner, owner_username=owner.username, **attrs) for attrs in validated_data]
+        return Car.objects.bulk_create(cars, batch_size=self.batch_size)
+
+    def update(self, instances, validated_data):
+        now = timezone.now()
+        groups = {} # Автомобили, сгруппированные по набору изменённых полей
+        for item, attrs in zip(self.initial_data, validated_data):
+            car = instances[item['id']]
+            for attr, value in attrs.items():
+                setattr(car, attr, value)
+            car.updated_at = now # Запись идёт в обход save(), поэтому auto_now выставляем сами
+            groups.setdefault(tuple(sorted(attrs)), []).append(car)
+        for fields, cars in groups.items():
+            _update_rows(cars, [*fields, 'updated_at'])
+        return [instances[item['id']] for item in self.initial_data]
+
+
+def _update_rows(cars, field_names):
+    """
+    Записывает поля field_names у cars одним подготовленным UPDATE ... WHERE id = %s через executemany.
+    QuerySet.bulk_update строит CASE WHEN на каждую строку и на больших пачках тратит на это основное время;
+    здесь SQL один, меняются только параметры. Обновляются только переданные поля, остальные столбцы не трогаем.
+    """
+    fields = [Car._meta.get_field(name) for name in field_names]
+    quote = connection.ops.quote_name
+    sql = 'UPDATE {} SET {} WHERE {} = %s'.format(
+        quote(Car._meta.db_table),
+        ', '.join(f'{quote(field.column)} = %s' for field in fields),
+        quote(Car._meta.pk.column),
+    )
+    params = [
+        [field.get_db_prep_save(getattr(car, field.attname), connection) for field in fields] + [car.pk]
+        for car in cars
+    ]
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, params)
+
+
+class OwnerSerializer(serializers.Serializer):
+    """
+    Сериализатор владельца автомобиля: только имя пользователя, так как не хотим раскрывать чувствительные данные.
+    Имя берётся из денормализованного Car.owner_username, без обращения к auth_user.
+    """
+    username = serializers.CharField(source='owner_username', read_only=True)
 
-class CarSerializer(serializers.ModelSerializer):
+class CarSerializer(TimedDataMixin, serializers.ModelSerializer):
     """
     Сериализатор для модели Car.
     Преобразует объекты Car в JSON и обратно.
     """
-    # Поле для отображения владельца автомобиля, используя UserSerializer
-    owner = UserSerializer(read_only=True) # read_only=True означает, что это поле только для чтения,
+    # Поле для отображения владельца автомобиля; source='*' — данные берутся из самого Car (owner_username)
+    owner = OwnerSerializer(source='*', read_only=True) # read_only=True означает, что это поле только для чтения,
                                           # и мы не будем его изменять при создании/обновлении Car через API.
 
     class Meta:
@@ -29,6 +95,7 @@ class CarSerializer(serializers.ModelSerializer):
         ]
         # Поля, которые доступны только для чтения (не могут быть изменены через API POST/PUT/PATCH)
         read_only_fields = ['created_at', 'updated_at']
+        list_serializer_class = CarBulkListSerializer # Пакетные операции (CarViewSet.bulk)
 
     def create(self, validated_data):
         """
@@ -36,4 +103,135 @@ class CarSerializer(serializers.ModelSerializer):
         текущего пользователя как 'owner' для нового автомобиля.
         """
         validated_data['owner'] = self.context['request'].user # Получаем текущего пользователя из контекста запроса
-        return super().create(validated_data)
\ No newline at end of file
+        return super().create(validated_data)
+
+    def update(self, instance, validated_data):
+        """
+        Записываются только поля, значение которых действительно изменилось: save(update_fields=...) вместо UPDATE
+        всех столбцов. Триггеры FTS-индекса и сводки статистики не срабатывают на нетронутые поля,
+        а запрос без изменений вовсе не пишет в базу (updated_at, ETag и кэш каталога остаются прежними).
+        """
+        changed = [attr for attr, value in validated_data.items() if getattr(instance, attr) != value]
+        for attr in changed:
+            setattr(instance, attr, validated_data[attr])
+        if changed:
+            instance.save(update_fields=[*changed, 'updated_at'])
+        return instance
+
+    def to_representation(self, instance):
+        # Ответ на запись собирается тем же планом, что и чтение (CarReadSerializer): JSON тот же,
+        # но без обхода полей ModelSerializer и вложенного сериализатора владельца
+        return self.read_serializer.to_representation(
+            {name: getattr(instance, name) for name in CarReadSerializer.value_fields}
+        )
+
+    @cached_property
+    def read_serializer(self):
+        return CarReadSerializer()
+
+PRICE_QUANTUM = Decimal('0.01')
+
+
+def format_price(value):
+    # Как DecimalField(decimal_places=2) в DRF: строка с двумя знаками после точки
+    return None if value is None else '{:f}'.format(value.quantize(PRICE_QUANTUM))
+
+
+def format_datetime(value, tz=None):
+    # Как DateTimeField в DRF: ISO 8601 в текущем часовом поясе, UTC записывается как 'Z'
+    if value is None:
+        return None
+    if timezone.is_aware(value):
+        value = value.astimezone(tz or timezone.get_current_timezone())
+    value = value.isoformat()
+    return value[:-6] + 'Z' if value.endswith('+00:00') else value
+
+
+class CarReadListSerializer(TimedDataMixin, serializers.ListSerializer):
+    """
+    Список для CarReadSerializer(many=True): нужен только ради учёта фазы serialize.
+    """
+
+
+class CarReadSerializer(TimedDataMixin, serializers.BaseSerializer):
+    """
+    Быстрый сериализатор только для чтения (list/retrieve в CarViewSet).
+    Работает со словарями из Car.objects.values(*CarReadSerializer.value_fields) и даёт тот же JSON,
+    что и CarSerializer (те же ключи в том же порядке, цена строкой, даты в ISO 8601, вложенный owner),
+    но без интроспекции полей ModelSerializer, создания моделей и вложенного сериализатора владельца на каждую строку.
+    """
+    # Колонки для .values(); владелец — денормализованная колонка owner_username, без JOIN с auth_user
+    value_fields = [
+        'id', 'make', 'model', 'year', 'price', 'mileage', 'color',
+        'description', 'is_available', 'created_at', 'updated_at', 'owner_username',
+    ]
+
+    class Meta:
+        list_serializer_class = CarReadListSerializer
+
+    def get_converters(self):
+        """
+        Преобразования значений; для остальных полей значение из базы отдаётся как есть.
+        Часовой пояс берётся один раз на сериализатор: get_current_timezone() на каждую дату заметно дороже форматирования.
+        """
+        to_local = partial(format_datetime, tz=timezone.get_current_timezone())
+        return {'price': format_price, 'created_at': to_local, 'updated_at': to_local}
+
+    @cached_property
+    def plan(self):
+        # План сериализации собирается один раз: (ключ, преобразование или None)
+        converters = self.get_converters()
+        return [(name, converters.get(name)) for name in self.value_fields[:-1]]
+
+    def to_representation(self, row):
+        data = {name: row[name] if convert is None else convert(row[name]) for name, convert in self.plan}
+        data['owner'] = {'username': row['owner_username']}
+        return data
+
+
+def average_price(total, count):
+    # Средняя цена из суммы и числа автомобилей сводки, в формате цен API
+    return format_price(total / count) if count else None
+
+
+class PriceSummarySerializer(serializers.ModelSerializer):
+    """
+    Статистика по марке, модели и году из сводной таблицы (cars/summaries.py): средние считаются из сумм.
+    """
+    avg_price = serializers.SerializerMethodField()
+    avg_mileage = serializers.SerializerMethodField()
+
+    class Meta:
+        model = PriceSummary
+        fields = ['make', 'model', 'year', 'cars', 'avg_price', 'avg_mileage']
+
+    def get_avg_price(self, summary) -> str:
+        return average_price(summary.price_sum, summary.cars)
+
+    def get_avg_mileage(self, summary) -> int:
+        # Среднее только по автомобилям с указанным пробегом
+        return round(summary.mileage_sum / summary.mileage_cars) if summary.mileage_cars else None
+
+
+class YearSummarySerializer(PriceSummarySerializer):
+    """
+    Статистика по году выпуска.
+    """
+    class Meta:
+        model = YearSummary
+        fields = ['year', 'cars', 'avg_price', 'avg_mileage']
+
+
+class OwnerSummarySerializer(serializers.ModelSerializer):
+    """
+    Склад владельца: всего автомобилей, в наличии и средняя цена.
+    """
+    owner = serializers.CharField(source='owner.username', read_only=True)
+    avg_price = serializers.SerializerMethodField()
+
+    class Meta:
+        model = OwnerSummary
+        fields = ['owner', 'cars', 'available_cars', 'avg_price']
+
+    def get_avg_price(self, summary) -> str:
+        return average_price(summary.price_sum, summary.cars)
@@ -0,0 +1,106 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from . import authentication, cache, jobs, summaries
+from .models import Car
+
+
+@receiver(post_save, sender=Car, dispatch_uid='cars_invalidate_on_save')
+@receiver(post_delete, sender=Car, dispatch_uid='cars_invalidate_on_delete')
+def invalidate_catalogue_cache(sender, using=None, **kwargs):
+    """
+    Любое сохранение или удаление автомобиля (через API, CarAdmin или ORM) сбрасывает кэш ответов каталога.
+    """
+    cache.invalidate(using=using)
+
+
+@receiver(post_save, sender=Car, dispatch_uid='cars_jobs_on_save')
+@receiver(post_delete, sender=Car, dispatch_uid='cars_jobs_on_delete')
+def run_car_hooks(sender, instance, using=None, **kwargs):
+    """
+    Фоновые задачи CARS_JOBS['CAR_HOOKS'] для изменённого автомобиля ставятся в очередь после коммита.
+    """
+    event = jobs.DELETED if kwargs['signal'] is post_delete else jobs.SAVED
+    jobs.car_changed([instance.pk], event, using=using)
+
+
+@receiver(pre_save, sender=Car, dispatch_uid='cars_summaries_before_save')
+@receiver(pre_delete, sender=Car, dispatch_uid='cars_summaries_before_delete')
+def remember_summary_row(sender, instance, raw=False, using=None, **kwargs):
+    """
+    Для автомобиля, собранного без загрузки из базы (Car(pk=...), .only/.defer), прежние значения
+    отслеживаемых полей читаются отдельным SELECT — иначе их нечего вычесть из сводок.
+    """
+    if raw or instance._state.adding or not summaries.get_config()['ENABLED'] or summaries.loaded_row(instance):
+        return
+    old = Car.objects.using(using).filter(pk=instance.pk).values(*summaries.TRACKED).first()
+    if old is not None:
+        instance._loaded_values = {**getattr(instance, '_loaded_values', {}), **old}
+
+
+@receiver(post_save, sender=Car, dispatch_uid='cars_summaries_on_save')
+def update_summaries_on_save(sender, instance, created=False, update_fields=None, raw=False, using=None, **kwargs):
+    """
+    Сохранённый автомобиль переносится в сводных таблицах из старых групп в новые (cars/summaries.py).
+    """
+    if raw:
+        return
+    old = None if created else summaries.loaded_row(instance)
+    if not created and old is None:
+        return
+    new = summaries.row(instance) if created else summaries.changed_row(old, instance, update_fields)
+    if new != old:
+        summaries.record([(old, new)], using)
+        summaries.remember(instance, new)
+
+
+@receiver(post_delete, sender=Car, dispatch_uid='cars_summaries_on_delete')
+def update_summaries_on_delete(sender, instance, using=None, **kwargs):
+    """
+    Удалённый автомобиль вычитается из сводок по значениям, с которыми он был загружен.
+    """
+    old = summaries.loaded_row(instance)
+    if old is not None:
+        summaries.record([(old, None)], using)
+
+
+@receiver(post_save, sender=User, dispatch_uid='cars_sync_owner_username')
+def sync_owner_username(sender, instance, created=False, update_fields=None, using=None, **kwargs):
+    """
+    Переименование пользователя переносится в Car.owner_username его автомобилей.
+    updated_at тоже обновляется, чтобы сменились ETag/Last-Modified (cars/conditional.py).
+    Сохранения с update_fields без username (например, last_login при входе) пропускаются,
+    прочие без смены имени обходятся одним UPDATE без изменённых строк.
+    """
+    if created or (update_fields is not None and 'username' not in update_fields):
+        return
+    updated = (
+        Car.objects.using(using).filter(owner_id=instance.pk).exclude(owner_username=instance.username)
+        .update(owner_username=instance.username, updated_at=timezone.now())
+    )
+    if updated:
+        # QuerySet.update идёт в обход сигналов Car
+        cache.invalidate(using=using)
+
+
+@receiver(post_delete, sender=Token, dispatch_uid='cars_forget_deleted_token')
+def forget_deleted_token(sender, instance, using=None, **kwargs):
+    """
+    Удалённый токен (выход, перевыпуск, удаление пользователя) сразу перестаёт приниматься CachedTokenAuthentication.
+    """
+    authentication.invalidate_token(instance.key, using=using)
+
+
+@receiver(post_save, sender=User, dispatch_uid='cars_forget_user_tokens')
+def forget_user_tokens(sender, instance, created=False, update_fields=None, using=None, **kwargs):
+    """
+    Сохранение пользователя (деактивация, смена пароля или прав) сбрасывает его токены
+    в кэше аутентификации, и следующий запрос перечитывает пользователя из базы.
+    Обновление только last_login при входе на кэш не влияет.
+    """
+    if created or (update_fields is not None and set(update_fields) <= {'last_login'}):
+        return
+    authentication.invalidate_user(instance.pk, using=using)
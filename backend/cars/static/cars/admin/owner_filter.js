@@ -0,0 +1,12 @@
+'use strict';
+{
+    // Фильтр по владельцу в списке автомобилей (cars.admin.OwnerAutocompleteFilter):
+    // выбор в поле автодополнения сразу применяет фильтр
+    const $ = django.jQuery;
+
+    $(function() {
+        $('.cars-owner-filter select').on('change', function() {
+            this.form.submit();
+        });
+    });
+}
@@ -0,0 +1,240 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Coalesce
+
+from .models import Car, OwnerSummary, PriceSummary, YearSummary
+
+# Материализованные сводки каталога для дашбордов (таблицы PriceSummary, YearSummary, OwnerSummary).
+# Вместо GROUP BY по всей cars_car на каждый запрос сводки хранят суммы и счётчики по группам и обновляются
+# разницей при каждом изменении Car: старая строка вычитается из своих групп, новая добавляется (сигналы,
+# пакетные операции API, import_cars). Средние считаются при чтении из сумм.
+# QuerySet.update и сырой SQL идут мимо этих путей — после них сводки пересобираются
+# командой manage.py rebuild_summaries (она же исправляет любое расхождение).
+DEFAULTS = {
+    'ENABLED': True,  # False — сводки не ведутся; после повторного включения нужен rebuild_summaries
+}
+
+# Поля Car, от которых зависят сводки
+TRACKED = ['make', 'model', 'year', 'price', 'mileage', 'is_available', 'owner_id']
+
+_batch = ContextVar('cars_summary_batch', default=None)
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'CARS_SUMMARIES', {})}
+
+
+def _price_measures(row):
+    mileage = row['mileage']
+    return {
+        'cars': 1,
+        'price_sum': row['price'],
+        'mileage_cars': 0 if mileage is None else 1,
+        'mileage_sum': mileage or 0,
+    }
+
+
+def _owner_measures(row):
+    return {'cars': 1, 'available_cars': 1 if row['is_available'] else 0, 'price_sum': row['price']}
+
+
+PRICE_AGGREGATES = {
+    'cars': Count('id'),
+    'price_sum': Sum('price'),
+    'mileage_cars': Count('mileage'),
+    'mileage_sum': Coalesce(Sum('mileage'), 0),
+}
+
+
+class Summary:
+    """
+    Описание сводной таблицы: поля группы, вклад одной строки Car и те же величины агрегатами для пересборки.
+    """
+    def __init__(self, model, key_fields, measures, aggregates):
+        self.model = model
+        self.key_fields = key_fields
+        self.measures = measures
+        self.aggregates = aggregates
+
+    def key(self, row):
+        return tuple(row[name] for name in self.key_fields)
+
+    def compute(self, using=None):
+        """
+        Полный пересчёт: {группа: {величина: значение}} одним GROUP BY по cars_car.
+        """
+        rows = Car.objects.using(using).values(*self.key_fields).annotate(**self.aggregates).order_by()
+        return {
+            self.key(row): {name: row[name] for name in self.aggregates}
+            for row in rows
+        }
+
+    def stored(self, using=None):
+        """
+        Текущее содержимое таблицы в том же виде, что и compute().
+        """
+        rows = self.model.objects.using(using).values(*self.key_fields, *self.aggregates)
+        return {self.key(row): {name: row[name] for name in self.aggregates} for row in rows}
+
+    def upsert(self, groups, using=None):
+        """
+        Прибавляет разницы {группа: {величина: разница}} одним INSERT ... ON CONFLICT DO UPDATE через executemany
+        (SQL один на таблицу, как в serializers._update_rows); отсутствующие группы создаются.
+        Группы, оставшиеся без автомобилей, удаляются.
+        """
+        connection = connections[using or router.db_for_write(self.model)]
+        quote = connection.ops.quote_name
+        opts = self.model._meta
+        keys = [opts.get_field(name) for name in self.key_fields]
+        measures = [opts.get_field(name) for name in self.aggregates]
+        table = quote(opts.db_table)
+        sql = 'INSERT INTO {} ({}) VALUES ({}) ON CONFLICT ({}) DO UPDATE SET {}'.format(
+            table,
+            ', '.join(quote(field.column) for field in keys + measures),
+            ', '.join(['%s'] * (len(keys) + len(measures))),
+            ', '.join(quote(field.column) for field in keys),
+            ', '.join(f'{quote(field.column)} = {table}.{quote(field.column)} + excluded.{quote(field.column)}'
+                      for field in measures),
+        )
+        key_params = {
+            key: [field.get_db_prep_save(value, connection) for field, value in zip(keys, key)] for key in groups
+        }
+        params = [
+            key_params[key] + [field.get_db_prep_save(delta.get(field.name, 0), connection) for field in measures]
+            for key, delta in groups.items()
+        ]
+        emptied = [key_params[key] for key, delta in groups.items() if delta['cars'] < 0]
+        with connection.cursor() as cursor:
+            cursor.executemany(sql, params)
+            if emptied:
+                # Опустевшие группы удаляются по ключу (уникальный индекс), а не просмотром всей таблицы.
+                # Сюда же попадают строки, созданные вычитанием из уже отсутствующей группы
+                # (например, удалённой каскадом вместе с владельцем)
+                cursor.executemany(
+                    'DELETE FROM {} WHERE {} AND {} <= 0'.format(
+                        table, ' AND '.join(f'{quote(field.column)} = %s' for field in keys), quote('cars'),
+                    ),
+                    emptied,
+                )
+
+
+SUMMARIES = [
+    Summary(PriceSummary, ['make', 'model', 'year'], _price_measures, PRICE_AGGREGATES),
+    Summary(YearSummary, ['year'], _price_measures, PRICE_AGGREGATES),
+    Summary(OwnerSummary, ['owner_id'], _owner_measures, {
+        'cars': Count('id'),
+        'available_cars': Count('id', filter=Q(is_available=True)),
+        'price_sum': Sum('price'),
+    }),
+]
+
+
+def row(car):
+    """
+    Отслеживаемые поля автомобиля в памяти.
+    """
+    return {name: getattr(car, name) for name in TRACKED}
+
+
+def loaded_row(car):
+    """
+    Отслеживаемые поля в том виде, в каком автомобиль был загружен из базы (Car.from_db), или None,
+    если автомобиль не загружался или часть полей отложена (.only/.defer).
+    """
+    loaded = getattr(car, '_loaded_values', None)
+    if loaded is None or any(name not in loaded for name in TRACKED):
+        return None
+    return {name: loaded[name] for name in TRACKED}
+
+
+def changed_row(old, car, fields=None):
+    """
+    Строка после сохранения: поля fields (по умолчанию все) из автомобиля в памяти, остальные — из old.
+    """
+    new = dict(old)
+    for name in TRACKED:
+        if fields is None or name in fields or name.removesuffix('_id') in fields:
+            new[name] = getattr(car, name)
+    return new
+
+
+def remember(car, values):
+    """
+    Записанные значения становятся «загруженными»: следующее сохранение того же экземпляра вычтет их.
+    """
+    car._loaded_values = {**getattr(car, '_loaded_values', {}), **values}
+
+
+def record(changes, using=None):
+    """
+    Учитывает изменения [(старая строка или None, новая строка или None), ...].
+    Внутри batch() изменения копятся и применяются одним проходом при выходе.
+    """
+    if not get_config()['ENABLED']:
+        return
+    pending = _batch.get()
+    if pending is not None:
+        pending.extend(changes)
+    else:
+        apply(changes, using)
+
+
+@contextmanager
+def batch(using=None):
+    """
+    Копит изменения сводок (в том числе от сигналов) и применяет их разом: для пакетных операций
+    на группу приходится один UPDATE, а не по одному на автомобиль.
+    """
+    if _batch.get() is not None:
+        yield
+        return
+    changes = []
+    token = _batch.set(changes)
+    try:
+        yield
+    finally:
+        _batch.reset(token)
+    apply(changes, using)
+
+
+def apply(changes, using=None):
+    """
+    Сворачивает изменения в разницы по группам и применяет их в одной транзакции.
+    """
+    deltas = {summary: {} for summary in SUMMARIES}
+    for old, new in changes:
+        for sign, values in ((-1, old), (1, new)):
+            if values is None:
+                continue
+            for summary in SUMMARIES:
+                group = deltas[summary].setdefault(summary.key(values), {})
+                for name, value in summary.measures(values).items():
+                    group[name] = group.get(name, 0) + sign * value
+    deltas = {
+        summary: {key: delta for key, delta in groups.items() if any(delta.values())}
+        for summary, groups in deltas.items()
+    }
+    if not any(deltas.values()):
+        return
+    # Внутри транзакции записи (CarViewSet, пакетные операции, import_cars) точка сохранения не нужна
+    with transaction.atomic(using=using, savepoint=False):
+        for summary, groups in deltas.items():
+            if groups:
+                summary.upsert(groups, using)
+
+
+def rebuild(using=None):
+    """
+    Полностью пересобирает сводные таблицы по cars_car.
+    """
+    with transaction.atomic(using=using):
+        for summary in SUMMARIES:
+            summary.model.objects.using(using).all().delete()
+            summary.model.objects.using(using).bulk_create([
+                summary.model(**dict(zip(summary.key_fields, key)), **values)
+                for key, values in summary.compute(using).items()
+            ], batch_size=500)
@@ -0,0 +1,43 @@
+import json
+import urllib.request
+
+from django.conf import settings
+from rest_framework.utils.encoders import JSONEncoder
+
+from . import jobs
+from .models import Car
+from .serializers import CarReadSerializer
+
+# Фоновые задачи приложения (регистрируются при импорте в CarsConfig.ready, выполняются manage.py run_jobs).
+WEBHOOK_DEFAULTS = {
+    'URLS': [],  # Адреса партнёров; пустой список — уведомления не отправляются
+    'TIMEOUT': 10,  # Секунд на один POST
+}
+
+
+def get_webhook_config():
+    return {**WEBHOOK_DEFAULTS, **getattr(settings, 'CARS_WEBHOOKS', {})}
+
+
+@jobs.task('cars.notify_webhooks', batch=True)
+def notify_webhooks(items):
+    """
+    Уведомляет партнёров об изменениях каталога: один POST на пачку заданий с событиями
+    {"id", "event", "car"}, где car — текущие данные автомобиля (как в API) или null для удалённого.
+    Ошибка любого адреса повторяет пачку целиком, поэтому получатели должны принимать повторы.
+    """
+    config = get_webhook_config()
+    if not config['URLS']:
+        return
+    saved = [car_id for car_id, payload in items if payload.get('event') != jobs.DELETED]
+    rows = Car.objects.filter(pk__in=saved).values(*CarReadSerializer.value_fields)
+    cars = {car['id']: car for car in CarReadSerializer(rows, many=True).data}
+    events = [
+        {'id': car_id, 'event': payload.get('event', jobs.SAVED), 'car': cars.get(car_id)}
+        for car_id, payload in items
+    ]
+    body = json.dumps({'events': events}, cls=JSONEncoder).encode('utf-8')
+    for url in config['URLS']:
+        request = urllib.request.Request(url, data=body, headers={'Content-Type': 'application/json'}, method='POST')
+        with urllib.request.urlopen(request, timeout=config['TIMEOUT']) as response:
+            response.read()
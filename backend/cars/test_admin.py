@@ -0,0 +1,127 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from cars.admin import CappedCountPaginator
+from cars.models import Car
+from cars.testing import TestCase
+
+
+class CarAdminTestCase(TestCase):
+    """
+    Тесты списка автомобилей в админке: число запросов не зависит от размера таблицы,
+    фильтры и подсчёт не читают всю cars_car.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'admin_password')
+        cls.dealers = [User.objects.create_user(f'dealer{i}', f'dealer{i}@example.com', 'password') for i in range(3)]
+        cls.camry = Car.objects.create(
+            make='Toyota', model='Camry', year=2020, price=1500000, description='Reliable family sedan',
+            owner=cls.dealers[0],
+        )
+        cls.x5 = Car.objects.create(
+            make='BMW', model='X5', year=2022, price=4500000, description='Luxury SUV', owner=cls.dealers[1],
+        )
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+        self.url = reverse('admin:cars_car_changelist')
+
+    def add_cars(self, count):
+        Car.objects.bulk_create([
+            Car(make='Lada', model='Vesta', year=2015 + i % 5, price=1000000 + i, owner=self.dealers[2],
+                owner_username='dealer2')
+            for i in range(count)
+        ])
+
+    def changelist(self, params=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, params or {})
+        self.assertEqual(response.status_code, 200)
+        return response, [query['sql'] for query in queries.captured_queries]
+
+    def test_query_count_independent_of_size(self):
+        """
+        Число запросов списка одинаково для 2 и 150 автомобилей; DISTINCT по cars_car и JOIN с auth_user нет.
+        """
+        _, small = self.changelist()
+        self.add_cars(148)
+        response, large = self.changelist()
+        self.assertEqual(len(small), len(large))
+        self.assertEqual(response.context['cl'].result_count, 150)
+        car_queries = [sql for sql in large if 'FROM "cars_car"' in sql]
+        self.assertFalse([sql for sql in car_queries if 'DISTINCT' in sql or 'auth_user' in sql])
+
+    def test_count_capped(self):
+        """
+        Подсчёт останавливается на строке после max_count; «5+» — только если строк больше max_count.
+        """
+        with mock.patch.object(CappedCountPaginator, 'max_count', Car.objects.count()):
+            response, _ = self.changelist()
+        self.assertEqual(response.context['cl'].result_count, Car.objects.count())
+        self.assertNotContains(response, '+ Автомобили')
+
+        self.add_cars(8)
+        with mock.patch.object(CappedCountPaginator, 'max_count', 5):
+            response, queries = self.changelist()
+        self.assertEqual(response.context['cl'].result_count, 5)
+        self.assertContains(response, '5+ Автомобили')
+        self.assertTrue([sql for sql in queries if 'COUNT(*)' in sql and 'LIMIT 6' in sql])
+
+    def test_filter_choices_from_summaries(self):
+        """
+        Варианты марок и годов приходят из сводных таблиц и фильтруют список.
+        """
+        response, queries = self.changelist()
+        self.assertContains(response, '?make=Toyota')
+        self.assertContains(response, '?year=2022')
+        self.assertTrue([sql for sql in queries if 'cars_pricesummary' in sql])
+
+        response, _ = self.changelist({'make': 'toyota'})
+        self.assertEqual(list(response.context['cl'].result_list), [self.camry])
+        response, _ = self.changelist({'year': '2022'})
+        self.assertEqual(list(response.context['cl'].result_list), [self.x5])
+
+        response = self.client.get(self.url, {'year': 'abc'})
+        self.assertRedirects(response, self.url + '?e=1', fetch_redirect_response=False)
+
+    def test_owner_autocomplete_filter(self):
+        """
+        Фильтр по владельцу — поле автодополнения без списка всех пользователей; выбранный владелец фильтрует список.
+        """
+        response, _ = self.changelist({'owner__id__exact': self.dealers[1].pk, 'is_available__exact': '1'})
+        self.assertEqual(list(response.context['cl'].result_list), [self.x5])
+        content = response.content.decode()
+        self.assertIn('class="admin-autocomplete', content)
+        self.assertIn('<input type="hidden" name="is_available__exact" value="1">', content)
+        self.assertIn(f'<option value="{self.dealers[1].pk}" selected>dealer1</option>', content)
+        self.assertNotIn('>dealer0</option>', content)
+
+        response = self.client.get(
+            reverse('admin:autocomplete'),
+            {'term': 'dealer2', 'app_label': 'cars', 'model_name': 'car', 'field_name': 'owner'},
+        )
+        self.assertEqual([item['text'] for item in response.json()['results']], ['dealer2'])
+
+    def test_full_text_search(self):
+        """
+        Поиск в админке идёт по индексу cars_car_fts, а не LIKE по описанию.
+        """
+        response, queries = self.changelist({'q': 'reliab'})
+        self.assertEqual(list(response.context['cl'].result_list), [self.camry])
+        search = [sql for sql in queries if 'MATCH' in sql]
+        self.assertTrue(search)
+        self.assertFalse([sql for sql in search if 'LIKE' in sql])
+
+    def test_change_form_owner_autocomplete(self):
+        """
+        В форме автомобиля владелец выбирается автодополнением, а не из <select> со всеми пользователями.
+        """
+        response = self.client.get(reverse('admin:cars_car_change', args=[self.camry.pk]))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'admin-autocomplete')
+        self.assertNotContains(response, '>dealer2</option>')
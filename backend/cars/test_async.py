@@ -0,0 +1,124 @@
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.test import AsyncClient, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from cars.models import Car
+from cars.testing import APITestCase
+
+
+# Кэш ответов отключён: сравниваются ответы синхронного и асинхронного пути, а не cars.cache
+@override_settings(CARS_RESPONSE_CACHE={'ENABLED': False})
+class AsyncCarViewsTestCase(APITestCase):
+    """
+    Асинхронные /api/async/cars/ должны отвечать так же, как синхронный CarViewSet.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'owner_password')
+        for i in range(25):
+            Car.objects.create(
+                make='Toyota' if i % 2 else 'BMW', model=f'Model {i}', year=2000 + i, price=1000000 + i * 1000,
+                description='Надёжный седан' if i % 5 == 0 else '', owner=cls.owner,
+            )
+
+    def setUp(self):
+        self.sync_client = APIClient()
+        self.async_client = AsyncClient()
+
+    async def assertSameResponse(self, sync_url, async_url, params=None):
+        params = params or {}
+        expected = await self.sync_get(sync_url, params)
+        response = await self.async_client.get(async_url, params)
+        self.assertEqual(response.status_code, expected.status_code)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        # Ссылки next/previous отличаются только путём
+        content = response.content.decode('utf-8').replace(async_url, sync_url)
+        self.assertEqual(json.loads(content), expected.json())
+        return response
+
+    async def sync_get(self, url, params):
+        # Синхронный клиент вызывается вне цикла событий, как это делал бы отдельный WSGI-процесс
+        return await sync_to_async(self.sync_client.get)(url, params)
+
+    async def test_list_pages(self):
+        """
+        Постраничный список, фильтры, поиск и сортировка совпадают с синхронным путём.
+        """
+        sync_url, async_url = reverse('car-list'), reverse('car-async-list')
+        await self.assertSameResponse(sync_url, async_url)
+        for params in [
+            {'page': 2},
+            {'page': 'last'},
+            {'make': 'toyota', 'ordering': '-price'},
+            {'search': 'седан'},
+            {'year_min': 2010, 'year_max': 2015, 'ordering': 'year'},
+        ]:
+            await self.assertSameResponse(sync_url, async_url, params)
+
+        response = await self.async_client.get(async_url, {'page': 2})
+        self.assertIn('/api/async/cars/', response.json()['next'])
+
+    async def test_cursor_pagination(self):
+        """
+        Курсорный режим: ссылки next ведут по всем страницам без повторов.
+        """
+        url = reverse('car-async-list') + '?pagination=cursor&ordering=price'
+        seen = []
+        while url:
+            response = await self.async_client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            data = response.json()
+            seen += [car['id'] for car in data['results']]
+            url = data['next']
+        self.assertEqual(len(seen), 25)
+        self.assertEqual(len(set(seen)), 25)
+
+    async def test_retrieve(self):
+        """
+        Детальный ответ совпадает с синхронным, неизвестный id — 404.
+        """
+        car = await Car.objects.afirst()
+        await self.assertSameResponse(
+            reverse('car-detail', kwargs={'pk': car.pk}), reverse('car-async-detail', kwargs={'pk': car.pk}),
+        )
+        await self.assertSameResponse(
+            reverse('car-detail', kwargs={'pk': 999999}), reverse('car-async-detail', kwargs={'pk': 999999}),
+        )
+        response = await self.async_client.get(reverse('car-async-detail', kwargs={'pk': 'abc'}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_errors(self):
+        """
+        Ошибки фильтров и пагинации отдаются в формате DRF.
+        """
+        url = reverse('car-async-list')
+        await self.assertSameResponse(reverse('car-list'), url, {'page': 99})
+        await self.assertSameResponse(reverse('car-list'), url, {'year_min': 'old'})
+        await self.assertSameResponse(reverse('car-list'), url, {'pagination': 'cursor', 'cursor': 'broken'})
+        response = await self.async_client.post(url)
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+    @override_settings(
+        CARS_THROTTLE={'ENABLED': True},
+        REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': {'anon': '3/min', 'user': '5/min', 'dealer': '10/min'}},
+    )
+    async def test_throttled(self):
+        """
+        Асинхронный путь ограничен так же, как /api/cars/, и делит с ним счётчики клиента.
+        """
+        await sync_to_async(caches['default'].clear)()
+        await self.sync_get(reverse('car-list'), {})
+        for _ in range(2):
+            response = await self.async_client.get(reverse('car-async-list'))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = await self.async_client.get(reverse('car-async-list'))
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', response)
+        self.assertIn('throttled', json.loads(response.content)['detail'])
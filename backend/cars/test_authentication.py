@@ -0,0 +1,155 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from cars import authentication
+from cars.models import Car
+from cars.testing import APITestCase
+
+
+# Кэш ответов отключён: здесь проверяется работа с базой, а не cars.cache
+@override_settings(CARS_RESPONSE_CACHE={'ENABLED': False})
+class CachedTokenAuthenticationTestCase(APITestCase):
+    """
+    Тесты CachedTokenAuthentication: запросы к базе, сброс кэша при изменениях, TTL и вытеснение.
+    """
+    def setUp(self):
+        authentication.local_cache.clear()
+        self.dealer = User.objects.create_user('dealer', 'dealer@example.com', 'dealer_password')
+        self.token = Token.objects.create(user=self.dealer)
+        self.car = Car.objects.create(make='Toyota', model='Camry', year=2020, price=1500000, owner=self.dealer)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.detail_url = reverse('car-detail', kwargs={'pk': self.car.pk})
+
+    def auth_queries(self, method='get', url=None, **kwargs):
+        """
+        (статус ответа, число запросов к authtoken_token/auth_user за время запроса).
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(self.client, method)(url or self.detail_url, **kwargs)
+        tables = ('"authtoken_token"', '"auth_user"')
+        return response.status_code, sum(any(table in query['sql'] for table in tables) for query in queries)
+
+    def test_cached_after_first_request(self):
+        """
+        Первый запрос проверяет токен по базе, следующие — без запросов к authtoken_token и auth_user.
+        """
+        self.assertEqual(self.auth_queries(), (status.HTTP_200_OK, 1))
+        self.assertEqual(self.auth_queries(), (status.HTTP_200_OK, 0))
+        response = self.client.patch(self.detail_url, {'price': '1400000.00'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_user_from_cache(self):
+        """
+        Из кэша собирается отдельный экземпляр пользователя с теми же полями, пароль в кэш не попадает.
+        """
+        auth = authentication.CachedTokenAuthentication()
+        first, token = auth.authenticate_credentials(self.token.key)
+        second, cached_token = auth.authenticate_credentials(self.token.key)
+        self.assertIsNot(first, second)
+        self.assertEqual((second.pk, second.username, second.is_active), (self.dealer.pk, 'dealer', True))
+        self.assertEqual(cached_token.key, self.token.key)
+        self.assertIs(cached_token.user, second)
+        self.assertIn('password', second.get_deferred_fields())
+        self.assertNotIn(self.dealer.password, repr(authentication.local_cache.entries))
+
+    def test_invalid_token(self):
+        """
+        Неверный токен отклоняется так же, как TokenAuthentication, и не кэшируется.
+        """
+        self.client.credentials(HTTP_AUTHORIZATION='Token invalid')
+        self.assertEqual(self.auth_queries()[0], status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(len(authentication.local_cache), 0)
+
+    def test_token_deleted(self):
+        """
+        Удалённый токен сразу перестаёт приниматься.
+        """
+        self.auth_queries()
+        self.token.delete()
+        self.assertEqual(self.auth_queries()[0], status.HTTP_401_UNAUTHORIZED)
+
+    def test_user_deactivated(self):
+        """
+        Деактивация пользователя сбрасывает кэш: запрос с его токеном отклоняется.
+        """
+        self.auth_queries()
+        self.dealer.is_active = False
+        self.dealer.save()
+        response = self.client.patch(self.detail_url, {'price': '1400000.00'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_password_changed(self):
+        """
+        Смена пароля сбрасывает кэш, и пользователь перечитывается из базы; обновление last_login — нет.
+        """
+        self.auth_queries()
+        self.dealer.set_password('new_password')
+        self.dealer.save()
+        self.assertEqual(self.auth_queries(), (status.HTTP_200_OK, 1))
+        self.dealer.save(update_fields=['last_login'])
+        self.assertEqual(self.auth_queries(), (status.HTTP_200_OK, 0))
+
+    def test_user_deleted(self):
+        """
+        Удаление пользователя удаляет его токен каскадом, и токен перестаёт приниматься.
+        """
+        self.auth_queries()
+        self.dealer.delete()
+        self.assertEqual(self.auth_queries()[0], status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(CARS_TOKEN_CACHE={'TTL': 60})
+    def test_ttl(self):
+        """
+        По истечении TTL токен снова проверяется по базе.
+        """
+        self.auth_queries()
+        with mock.patch('cars.authentication.time.monotonic', return_value=authentication.time.monotonic() + 61):
+            self.assertEqual(self.auth_queries(), (status.HTTP_200_OK, 1))
+
+    @override_settings(CARS_TOKEN_CACHE={'MAX_ENTRIES': 2})
+    def test_lru_eviction(self):
+        """
+        Сверх MAX_ENTRIES вытесняется токен, который дольше всего не использовался.
+        """
+        auth = authentication.CachedTokenAuthentication()
+        keys = [self.token.key]
+        for name in ('first', 'second'):
+            keys.append(Token.objects.create(user=User.objects.create_user(name)).key)
+        auth.authenticate_credentials(keys[0])
+        auth.authenticate_credentials(keys[1])
+        auth.authenticate_credentials(keys[0])
+        auth.authenticate_credentials(keys[2])
+        self.assertEqual(list(authentication.local_cache.entries), [keys[0], keys[2]])
+
+    @override_settings(CARS_TOKEN_CACHE={'ALIAS': 'default'})
+    def test_shared_cache(self):
+        """
+        С общим кэшем процесс с пустым LRU берёт пользователя оттуда; удаление токена чистит и общий кэш.
+        """
+        caches['default'].clear()
+        self.auth_queries()
+        authentication.local_cache.clear()
+        self.assertEqual(self.auth_queries(), (status.HTTP_200_OK, 0))
+        self.assertIsNone(caches['default'].get(self.token.key))
+
+        self.token.delete()
+        authentication.local_cache.clear()
+        self.assertEqual(self.auth_queries()[0], status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(CARS_TOKEN_CACHE={'ENABLED': False})
+    def test_disabled(self):
+        """
+        При ENABLED = False поведение как у TokenAuthentication: токен проверяется на каждом запросе.
+        """
+        self.assertEqual(self.auth_queries(), (status.HTTP_200_OK, 1))
+        self.assertEqual(self.auth_queries(), (status.HTTP_200_OK, 1))
@@ -0,0 +1,130 @@
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from cars import cache
+from cars.models import Car
+from cars.testing import APITestCase
+
+
+class CarBulkAPITestCase(APITestCase):
+    """
+    Тесты пакетных операций /api/cars/bulk/ (создание, обновление, удаление).
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin_user = User.objects.create_superuser('admin', 'admin@example.com', 'admin_password')
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'owner_password')
+        cls.other = User.objects.create_user('other', 'other@example.com', 'other_password')
+        cls.own_cars = [
+            Car.objects.create(make='Toyota', model=f'Model {i}', year=2015 + i, price=1000000, owner=cls.owner)
+            for i in range(5)
+        ]
+        cls.other_car = Car.objects.create(make='Honda', model='CRV', year=2018, price=1800000, owner=cls.other)
+
+    def setUp(self):
+        cache.get_cache().clear()
+        self.owner_client = APIClient()
+        self.owner_client.force_authenticate(user=self.owner)
+        self.admin_client = APIClient()
+        self.admin_client.force_authenticate(user=self.admin_user)
+        self.url = reverse('car-bulk')
+
+    def test_bulk_create(self):
+        """
+        Массив автомобилей создаётся одним запросом, владелец — текущий пользователь.
+        """
+        data = [
+            {'make': 'Audi', 'model': f'A{i}', 'year': 2020, 'price': '3000000.00', 'description': 'Quattro'}
+            for i in range(20)
+        ]
+        response = self.owner_client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data), 20)
+        self.assertTrue(all(car['id'] for car in response.data))
+        self.assertEqual(Car.objects.filter(make='Audi', owner=self.owner).count(), 20)
+        # Кэш каталога сброшен, поисковый индекс обновлён
+        listing = self.owner_client.get(reverse('car-list') + '?search=quattro')
+        self.assertEqual(listing.data['count'], 20)
+
+    def test_bulk_create_reports_item_errors(self):
+        """
+        При ошибке в одном элементе ничего не создаётся, а ошибки выдаются по позициям.
+        """
+        data = [
+            {'make': 'Audi', 'model': 'A4', 'year': 2020, 'price': '3000000.00'},
+            {'make': 'Audi', 'model': 'A6', 'year': 'soon', 'price': '3000000.00'},
+            {'make': 'Audi', 'year': 2020, 'price': '3000000.00'},
+        ]
+        response = self.owner_client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertIn('year', response.data[1])
+        self.assertIn('model', response.data[2])
+        self.assertFalse(Car.objects.filter(make='Audi').exists())
+
+    def test_bulk_update(self):
+        """
+        Частичные изменения своих автомобилей применяются одним bulk_update.
+        """
+        old_updated_at = self.own_cars[0].updated_at
+        data = [{'id': car.pk, 'price': '999.00', 'is_available': False} for car in self.own_cars]
+        # выборка затронутых автомобилей + UPDATE + по одному upsert в каждую из трёх сводок (cars/summaries.py)
+        # (+ SAVEPOINT/RELEASE, так как тест сам идёт в транзакции)
+        with self.assertNumQueries(7):
+            response = self.owner_client.patch(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual({car['price'] for car in response.data}, {'999.00'})
+        self.assertEqual(Car.objects.filter(owner=self.owner, is_available=False).count(), 5)
+        self.own_cars[0].refresh_from_db()
+        self.assertGreater(self.own_cars[0].updated_at, old_updated_at)
+
+    def test_bulk_update_forbidden_for_foreign_cars(self):
+        """
+        Если хотя бы один автомобиль чужой, ничего не обновляется (403), ошибка указана по позиции.
+        """
+        data = [{'id': self.own_cars[0].pk, 'price': '1.00'}, {'id': self.other_car.pk, 'price': '1.00'}]
+        response = self.owner_client.patch(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(response.data[0], {})
+        self.assertIn('id', response.data[1])
+        self.assertFalse(Car.objects.filter(price=1).exists())
+
+    def test_bulk_update_by_admin_and_missing_ids(self):
+        """
+        Администратор может менять чужие автомобили; несуществующий id даёт 404.
+        """
+        response = self.admin_client.patch(self.url, [{'id': self.other_car.pk, 'color': 'Red'}], format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.other_car.refresh_from_db()
+        self.assertEqual(self.other_car.color, 'Red')
+
+        response = self.admin_client.patch(self.url, [{'id': 999999, 'color': 'Red'}], format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.admin_client.patch(self.url, [{'color': 'Red'}], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_delete(self):
+        """
+        Удаление своих автомобилей по списку id; чужие удалить нельзя.
+        """
+        response = self.owner_client.delete(self.url, [self.own_cars[0].pk, self.other_car.pk], format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(Car.objects.count(), 6)
+
+        ids = [car.pk for car in self.own_cars]
+        response = self.owner_client.delete(self.url, {'ids': ids}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Car.objects.filter(pk__in=ids).exists())
+
+    def test_bulk_requires_authentication_and_list(self):
+        """
+        Анонимам пакетные операции недоступны; тело должно быть непустым массивом.
+        """
+        response = APIClient().post(self.url, [{'make': 'Audi'}], format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.owner_client.post(self.url, {'make': 'Audi'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.owner_client.post(self.url, [], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,122 @@
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from cars import cache
+from cars.models import Car
+from cars.testing import APITestCase
+
+
+@override_settings(CARS_RESPONSE_CACHE={'ENABLED': True, 'ALIAS': 'cars', 'TIMEOUT': 300})
+class CarResponseCacheTestCase(APITestCase):
+    """
+    Тесты кэша ответов каталога и его сброса при изменении автомобилей.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin_user = User.objects.create_superuser('admin', 'admin@example.com', 'admin_password')
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'owner_password')
+        cls.car = Car.objects.create(
+            make='Toyota', model='Camry', year=2020, price=1500000, description='Reliable sedan', owner=cls.owner,
+        )
+        Car.objects.create(make='BMW', model='X5', year=2022, price=4500000, owner=cls.owner)
+
+    def setUp(self):
+        cache.get_cache().clear()
+        self.anon_client = APIClient()
+        self.owner_client = APIClient()
+        self.owner_client.force_authenticate(user=self.owner)
+        self.list_url = reverse('car-list')
+        self.detail_url = reverse('car-detail', kwargs={'pk': self.car.pk})
+
+    def test_list_served_from_cache(self):
+        """
+        Повторный запрос списка не обращается к базе.
+        """
+        first = self.anon_client.get(self.list_url)
+        self.assertEqual(first['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            second = self.anon_client.get(self.list_url)
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.json(), first.json())
+
+    def test_detail_served_from_cache(self):
+        """
+        Детальная страница кэшируется отдельно для каждого автомобиля.
+        """
+        self.anon_client.get(self.detail_url)
+        with self.assertNumQueries(0):
+            response = self.anon_client.get(self.detail_url)
+        self.assertEqual(response.data['make'], 'Toyota')
+        missing = self.anon_client.get(reverse('car-detail', kwargs={'pk': 999999}))
+        self.assertEqual(missing.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_query_string_is_normalized(self):
+        """
+        Порядок параметров и пустые значения не создают новых записей в кэше, а другие фильтры создают.
+        """
+        self.anon_client.get(self.list_url + '?make=toyota&ordering=price')
+        with self.assertNumQueries(0):
+            self.anon_client.get(self.list_url + '?ordering=price&color=&make=toyota')
+        response = self.anon_client.get(self.list_url + '?make=bmw&ordering=price')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['make'], 'BMW')
+
+    def test_api_write_invalidates(self):
+        """
+        Изменение через API сразу видно в списке и в деталях.
+        """
+        self.anon_client.get(self.list_url)
+        self.anon_client.get(self.detail_url)
+        response = self.owner_client.patch(self.detail_url, {'price': '1000.00'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        detail = self.anon_client.get(self.detail_url)
+        self.assertEqual(detail['X-Cache'], 'MISS')
+        self.assertEqual(detail.data['price'], '1000.00')
+        listing = self.anon_client.get(self.list_url)
+        self.assertIn('1000.00', [car['price'] for car in listing.data['results']])
+
+    def test_orm_save_and_delete_invalidate(self):
+        """
+        Сохранение и удаление через ORM (как в CarAdmin) тоже сбрасывают кэш.
+        """
+        self.anon_client.get(self.list_url)
+        new_car = Car.objects.create(make='Audi', model='A4', year=2023, price=3000000, owner=self.owner)
+        response = self.anon_client.get(self.list_url)
+        self.assertEqual(response.data['count'], 3)
+
+        new_car.delete()
+        response = self.anon_client.get(self.list_url)
+        self.assertEqual(response.data['count'], 2)
+
+    def test_stats(self):
+        """
+        Счётчики попаданий и промахов доступны администратору.
+        """
+        self.anon_client.get(self.list_url)
+        self.anon_client.get(self.list_url)
+        self.anon_client.get(self.list_url)
+
+        response = self.anon_client.get(reverse('car-cache-stats'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        admin_client = APIClient()
+        admin_client.force_authenticate(user=self.admin_user)
+        response = admin_client.get(reverse('car-cache-stats'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['hits'], 2)
+        self.assertEqual(response.data['misses'], 1)
+
+    @override_settings(CARS_RESPONSE_CACHE={'ENABLED': False})
+    def test_disabled(self):
+        """
+        Отключённый кэш не используется.
+        """
+        self.anon_client.get(self.list_url)
+        with self.assertNumQueries(3):  # валидаторы ETag + COUNT(*) + страница
+            response = self.anon_client.get(self.list_url)
+        self.assertNotIn('X-Cache', response)
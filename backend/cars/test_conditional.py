@@ -0,0 +1,135 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.urls import reverse
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from cars import cache
+from cars.models import Car
+from cars.serializers import CarSerializer
+from cars.testing import APITestCase
+
+
+@override_settings(CARS_RESPONSE_CACHE={'ENABLED': False})
+class CarConditionalGetTestCase(APITestCase):
+    """
+    Тесты условных GET-запросов (ETag / Last-Modified) для списка и деталей автомобиля.
+    Кэш ответов отключён, чтобы сериализация действительно выполнялась на каждый запрос без 304.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'owner_password')
+        cls.car = Car.objects.create(make='Toyota', model='Camry', year=2020, price=1500000, owner=cls.owner)
+        Car.objects.create(make='BMW', model='X5', year=2022, price=4500000, owner=cls.owner)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.list_url = reverse('car-list')
+        self.detail_url = reverse('car-detail', kwargs={'pk': self.car.pk})
+
+    def test_detail_validators(self):
+        """
+        Детальная страница отдаёт ETag и Last-Modified по updated_at.
+        """
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('ETag', response)
+        self.assertEqual(response['Last-Modified'], http_date(int(self.car.updated_at.timestamp())))
+
+    def test_detail_not_modified_skips_serialization(self):
+        """
+        Совпавший If-None-Match даёт 304 без вызова сериализатора.
+        """
+        etag = self.client.get(self.detail_url)['ETag']
+        with mock.patch.object(CarSerializer, 'to_representation') as to_representation:
+            response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response.content, b'')
+        to_representation.assert_not_called()
+
+    def test_list_not_modified_skips_serialization(self):
+        """
+        Для списка 304 тоже отдаётся до сериализации. Last-Modified у списка нет,
+        поэтому один If-Modified-Since не даёт 304 даже после удаления не самого нового автомобиля.
+        """
+        first = self.client.get(self.list_url + '?ordering=price')
+        self.assertNotIn('Last-Modified', first)
+        with mock.patch.object(CarSerializer, 'to_representation') as to_representation:
+            by_etag = self.client.get(self.list_url + '?ordering=price', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(by_etag.status_code, status.HTTP_304_NOT_MODIFIED)
+        to_representation.assert_not_called()
+
+        since = http_date(int(Car.objects.latest('updated_at').updated_at.timestamp()) + 60)
+        self.car.delete()
+        response = self.client.get(self.list_url + '?ordering=price', HTTP_IF_MODIFIED_SINCE=since)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 1)
+
+    def test_etag_depends_on_query(self):
+        """
+        Другая сортировка или страница — другой ETag.
+        """
+        first = self.client.get(self.list_url + '?ordering=price')
+        second = self.client.get(self.list_url + '?ordering=-price')
+        self.assertNotEqual(first['ETag'], second['ETag'])
+
+    def test_changes_produce_new_etag(self):
+        """
+        Изменение, добавление и удаление автомобиля меняют ETag списка; старый ETag даёт 200.
+        """
+        etag = self.client.get(self.list_url)['ETag']
+
+        self.car.price = 1000
+        self.car.save()
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+        # Удаляется не самый новый автомобиль: max(updated_at) прежний, меняется только количество
+        etag = response['ETag']
+        since = http_date(int(self.car.updated_at.timestamp()) + 60)
+        Car.objects.filter(make='BMW').delete()
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 1)
+        response = self.client.get(self.list_url, HTTP_IF_MODIFIED_SINCE=since)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 1)
+
+        detail_etag = self.client.get(self.detail_url)['ETag']
+        self.car.mileage = 100
+        self.car.save()
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=detail_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_missing_car(self):
+        """
+        Для несуществующего автомобиля валидаторов нет, ответ 404.
+        """
+        response = self.client.get(reverse('car-detail', kwargs={'pk': 999999}), HTTP_IF_NONE_MATCH='"x"')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertNotIn('ETag', response)
+
+    def test_invalid_pk(self):
+        """
+        Нечисловой id — 404, как без условных запросов, а не ошибка сервера.
+        """
+        for headers in ({}, {'HTTP_IF_NONE_MATCH': '"x"'}):
+            response = self.client.get(reverse('car-detail', kwargs={'pk': 'abc'}), **headers)
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+            self.assertNotIn('ETag', response)
+
+    @override_settings(CARS_RESPONSE_CACHE={'ENABLED': True, 'ALIAS': 'cars', 'TIMEOUT': 300})
+    def test_not_modified_from_warm_cache(self):
+        """
+        При тёплом кэше ответов проверка If-None-Match не обращается к базе.
+        """
+        cache.get_cache().clear()
+        etag = self.client.get(self.list_url)['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
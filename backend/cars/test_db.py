@@ -0,0 +1,107 @@
+import os
+import shutil
+import tempfile
+import threading
+
+from django.db import OperationalError, connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import SimpleTestCase, override_settings
+
+from cars import db
+from cars.testing import TestCase
+
+
+class SQLitePragmaTestCase(TestCase):
+    """
+    Тесты настройки SQLite-соединений (cars/db.py).
+    """
+    def open_connection(self, path):
+        wrapper = DatabaseWrapper({**connection.settings_dict, 'NAME': path}, alias='pragma_test')
+        wrapper.ensure_connection()
+        self.addCleanup(wrapper.close)
+        return wrapper
+
+    def pragma(self, wrapper, name):
+        with wrapper.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    def test_pragmas_applied_to_new_connections(self):
+        """
+        Новое соединение с файлом базы открывается в режиме WAL с настройками из SQLITE_PRAGMAS.
+        """
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        wrapper = self.open_connection(os.path.join(directory, 'cars.sqlite3'))
+        self.assertEqual(self.pragma(wrapper, 'journal_mode'), 'wal')
+        self.assertEqual(self.pragma(wrapper, 'synchronous'), 1)  # NORMAL
+        self.assertEqual(self.pragma(wrapper, 'temp_store'), 2)  # MEMORY
+        self.assertEqual(self.pragma(wrapper, 'cache_size'), db.get_pragmas()['cache_size'])
+        self.assertEqual(self.pragma(wrapper, 'busy_timeout'), 20000)  # OPTIONS['timeout'] в миллисекундах
+
+    @override_settings(SQLITE_PRAGMAS={'journal_mode': None, 'cache_size': -1000})
+    def test_pragmas_configurable(self):
+        """
+        Значения берутся из settings.SQLITE_PRAGMAS, None отключает PRAGMA.
+        """
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        wrapper = self.open_connection(os.path.join(directory, 'cars.sqlite3'))
+        self.assertEqual(self.pragma(wrapper, 'journal_mode'), 'delete')
+        self.assertEqual(self.pragma(wrapper, 'cache_size'), -1000)
+
+
+class SQLitePragmaValidationTestCase(SimpleTestCase):
+    """
+    Имена и значения PRAGMA подставляются в SQL, поэтому проверяются.
+    """
+    @override_settings(SQLITE_PRAGMAS={'cache_size': '1; DROP TABLE cars_car'})
+    def test_invalid_value_rejected(self):
+        wrapper = DatabaseWrapper({**connection.settings_dict, 'NAME': ':memory:'}, alias='pragma_test')
+        with self.assertRaises(ValueError):
+            wrapper.ensure_connection()
+        wrapper.close()
+
+
+class SQLiteConcurrentWritesTestCase(SimpleTestCase):
+    """
+    Одновременная запись из нескольких потоков с настройками settings.DATABASES не приводит к "database is locked".
+    """
+    threads = 8
+    writes = 25
+
+    def write(self, path, errors):
+        # Как transaction.atomic: чтение, затем запись в одной транзакции (при обычном BEGIN она падала бы сразу)
+        wrapper = DatabaseWrapper({**connection.settings_dict, 'NAME': path}, alias='concurrency_test')
+        try:
+            for _ in range(self.writes):
+                wrapper.set_autocommit(False, force_begin_transaction_with_broken_autocommit=True)
+                with wrapper.cursor() as cursor:
+                    cursor.execute('SELECT COUNT(*) FROM counter')
+                    cursor.execute('INSERT INTO counter (value) VALUES (%s)', [cursor.fetchone()[0]])
+                wrapper.commit()
+                wrapper.set_autocommit(True)
+        except OperationalError as exc:
+            errors.append(str(exc))
+        finally:
+            wrapper.close()
+
+    def test_no_database_is_locked(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'cars.sqlite3')
+        wrapper = DatabaseWrapper({**connection.settings_dict, 'NAME': path}, alias='concurrency_test')
+        with wrapper.cursor() as cursor:
+            cursor.execute('CREATE TABLE counter (value integer)')
+        self.addCleanup(wrapper.close)
+
+        errors = []
+        threads = [threading.Thread(target=self.write, args=(path, errors)) for _ in range(self.threads)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        with wrapper.cursor() as cursor:
+            cursor.execute('SELECT COUNT(*) FROM counter')
+            self.assertEqual(cursor.fetchone()[0], self.threads * self.writes)
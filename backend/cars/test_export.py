@@ -0,0 +1,137 @@
+import csv
+import io
+import json
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from cars import export
+from cars.models import Car
+from cars.testing import APITestCase
+
+
+# Кэш ответов отключён: здесь проверяется работа с базой, а не cars.cache
+@override_settings(CARS_RESPONSE_CACHE={'ENABLED': False})
+class CarExportAPITestCase(APITestCase):
+    """
+    Тесты потоковой выгрузки каталога /api/cars/export/.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'owner_password')
+        Car.objects.create(
+            make='Toyota', model='Camry', year=2020, price=1500000, color='White',
+            description='Надёжный седан, "без ДТП"', owner=cls.owner,
+        )
+        Car.objects.create(make='BMW', model='X5', year=2022, price=4500000, color='Black', owner=cls.owner)
+        Car.objects.create(make='Toyota', model='RAV4', year=2018, price=2100000, is_available=False, owner=cls.owner)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.owner)
+        self.url = reverse('car-export')
+
+    def read(self, response):
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode('utf-8')
+
+    def test_ndjson_matches_api_representation(self):
+        """
+        Каждая строка NDJSON совпадает с элементом списка /api/cars/ (без пагинации).
+        """
+        response = self.client.get(self.url)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson; charset=utf-8')
+        rows = [json.loads(line) for line in self.read(response).splitlines()]
+        listing = self.client.get(reverse('car-list'), {'page_size': 100}).json()['results']
+        self.assertEqual(rows, listing)
+
+    def test_csv(self):
+        """
+        CSV с заголовком, экранированием кавычек и владельцем в колонке owner.
+        """
+        response = self.client.get(self.url, {'fmt': 'csv', 'ordering': 'price'})
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertIn('cars.csv', response['Content-Disposition'])
+        rows = list(csv.DictReader(io.StringIO(self.read(response))))
+        self.assertEqual([row['model'] for row in rows], ['Camry', 'RAV4', 'X5'])
+        self.assertEqual(rows[0]['description'], 'Надёжный седан, "без ДТП"')
+        self.assertEqual(rows[0]['price'], '1500000.00')
+        self.assertEqual(rows[0]['owner'], 'owner')
+
+    def test_filters_search_and_ordering_apply(self):
+        """
+        Принимаются те же параметры, что и у списка.
+        """
+        response = self.client.get(self.url, {'make': 'toyota', 'is_available': 'true'})
+        rows = [json.loads(line) for line in self.read(response).splitlines()]
+        self.assertEqual([row['model'] for row in rows], ['Camry'])
+
+        response = self.client.get(self.url, {'search': 'седан'})
+        rows = [json.loads(line) for line in self.read(response).splitlines()]
+        self.assertEqual([row['model'] for row in rows], ['Camry'])
+
+        response = self.client.get(self.url, {'ordering': '-year'})
+        rows = [json.loads(line) for line in self.read(response).splitlines()]
+        self.assertEqual([row['year'] for row in rows], [2022, 2020, 2018])
+
+    def test_streams_in_chunks_with_one_query(self):
+        """
+        Ответ собирается кусками по FLUSH_ROWS строк, а вся выборка читается одним запросом.
+        """
+        Car.objects.bulk_create(
+            Car(make='Lada', model=f'Vesta {i}', year=2021, price=1000000, owner=self.owner)
+            for i in range(export.FLUSH_ROWS + 10)
+        )
+        response = self.client.get(self.url, {'make': 'lada'})
+        with self.assertNumQueries(1):
+            chunks = list(response.streaming_content)
+        self.assertEqual(len(chunks), 2)
+        self.assertEqual(b''.join(chunks).count(b'\n'), export.FLUSH_ROWS + 10)
+
+    def test_unknown_format(self):
+        """
+        Неизвестный формат — 400.
+        """
+        response = self.client.get(self.url, {'fmt': 'xml'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_requires_authentication(self):
+        """
+        Анонимный клиент выгрузку не получает.
+        """
+        response = APIClient().get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(CARS_EXPORT={'MAX_ROWS': 2})
+    def test_row_limit(self):
+        """
+        Выборка больше CARS_EXPORT['MAX_ROWS'] строк — 400; сузив её фильтрами, выгрузку можно получить.
+        """
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('limited to 2 rows', response.json()['non_field_errors'][0])
+        rows = self.read(self.client.get(self.url, {'make': 'toyota'})).splitlines()
+        self.assertEqual(len(rows), 2)
+
+    @override_settings(
+        CARS_THROTTLE={'ENABLED': True},
+        REST_FRAMEWORK={
+            **settings.REST_FRAMEWORK,
+            'DEFAULT_THROTTLE_RATES': {'anon': '100/min', 'user': '100/min', 'dealer': '100/min', 'export': '2/min'},
+        },
+    )
+    def test_throttled(self):
+        """
+        Выгрузки ограничены ставкой 'export' на пользователя; список при этом доступен.
+        """
+        caches['default'].clear()
+        for _ in range(2):
+            self.read(self.client.get(self.url))
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(self.client.get(reverse('car-list')).status_code, status.HTTP_200_OK)
@@ -0,0 +1,105 @@
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from cars import cache
+from cars.facets import nice_step
+from cars.models import Car
+from cars.testing import APITestCase
+
+
+@override_settings(CARS_RESPONSE_CACHE={'ENABLED': True, 'ALIAS': 'cars', 'TIMEOUT': 300})
+class CarFacetsAPITestCase(APITestCase):
+    """
+    Тесты фасетов /api/cars/facets/.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'owner_password')
+        for make, model, year, price, color, available in [
+            ('Toyota', 'Camry', 2020, 1500000, 'White', True),
+            ('Toyota', 'RAV4', 2018, 2100000, 'Black', False),
+            ('Toyota', 'Corolla', 2012, 900000, 'White', True),
+            ('BMW', 'X5', 2022, 4500000, 'Black', True),
+            ('Lada', 'Vesta', 2021, 1000000, None, True),
+        ]:
+            Car.objects.create(make=make, model=model, year=year, price=price, color=color,
+                               is_available=available, description=f'{make} {model}', owner=cls.owner)
+
+    def setUp(self):
+        cache.get_cache().clear()
+        self.client = APIClient()
+        self.url = reverse('car-facets')
+
+    def test_all_facets(self):
+        """
+        Итоги, доступность, марки, цвета и гистограммы считаются по всему каталогу.
+        """
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.data
+        self.assertEqual(data['total'], 5)
+        self.assertEqual(data['is_available'], {'true': 4, 'false': 1})
+        self.assertEqual(data['make'][0], {'value': 'Toyota', 'count': 3})
+        self.assertEqual({row['value']: row['count'] for row in data['color']}, {'White': 2, 'Black': 2, None: 1})
+        self.assertEqual(data['year'], [
+            {'from': 2010, 'to': 2014, 'count': 1},
+            {'from': 2015, 'to': 2019, 'count': 1},
+            {'from': 2020, 'to': 2024, 'count': 3},
+        ])
+        prices = data['price']
+        self.assertEqual(sum(row['count'] for row in prices), 5)
+        self.assertEqual(prices[0]['from'], '500000.00')
+        self.assertEqual(prices[-1]['to'], '5000000.00')
+
+    def test_filters_and_search_apply(self):
+        """
+        Фасеты принимают те же параметры, что и список.
+        """
+        data = self.client.get(self.url, {'make': 'toyota', 'is_available': 'true'}).data
+        self.assertEqual(data['total'], 2)
+        self.assertEqual(data['make'], [{'value': 'Toyota', 'count': 2}])
+        self.assertEqual(data['color'], [{'value': 'White', 'count': 2}])
+
+        data = self.client.get(self.url, {'search': 'toyota', 'year_bucket': 1, 'price_bins': 2}).data
+        self.assertEqual(data['total'], 3)
+        self.assertEqual([row['from'] for row in data['year']], [2012, 2018, 2020])
+        self.assertEqual(sum(row['count'] for row in data['price']), 3)
+
+        data = self.client.get(self.url, {'make': 'Audi'}).data
+        self.assertEqual(data['total'], 0)
+        self.assertEqual(data['price'], [])
+
+    def test_grouped_queries_and_cache(self):
+        """
+        Один агрегат плюс по запросу на группировку; повторный запрос берётся из кэша, изменение Car его сбрасывает.
+        """
+        with self.assertNumQueries(5):
+            self.client.get(self.url)
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+
+        Car.objects.create(make='Audi', model='A4', year=2023, price=3000000, owner=self.owner)
+        data = self.client.get(self.url).data
+        self.assertEqual(data['total'], 6)
+
+    def test_invalid_params(self):
+        """
+        Некорректные параметры фасетов — 400.
+        """
+        response = self.client.get(self.url, {'price_bins': 'many'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(self.url, {'year_bucket': 0})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_nice_step(self):
+        """
+        Ширина столбца округляется до 1, 2 или 5 × 10^k.
+        """
+        self.assertEqual(nice_step(Decimal('3600000'), 10), Decimal('500000'))
+        self.assertEqual(nice_step(Decimal('150'), 10), Decimal('20'))
+        self.assertEqual(nice_step(Decimal('0'), 10), Decimal('1'))
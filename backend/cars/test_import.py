@@ -0,0 +1,163 @@
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+
+from cars.models import Car
+from cars.search import build_match_query
+from cars.testing import TestCase
+
+
+class ImportCarsCommandTestCase(TestCase):
+    """
+    Тесты команды manage.py import_cars.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.dealer = User.objects.create_user('dealer', 'dealer@example.com', 'dealer_password')
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def write(self, name, content):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(content)
+        return path
+
+    def run_import(self, path, *args):
+        stdout, stderr = StringIO(), StringIO()
+        call_command('import_cars', path, '--owner', 'dealer', *args, stdout=stdout, stderr=stderr)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_csv(self):
+        """
+        CSV импортируется пачками; пустые ячейки необязательных полей становятся NULL, поиск видит новые записи.
+        """
+        path = self.write('cars.csv', (
+            'make,model,year,price,mileage,color,description,is_available\n'
+            'Toyota,Camry,2020,1500000,30000,White,Надёжный седан,true\n'
+            'BMW,X5,2022,4500000.50,,,,false\n'
+            'Lada,Vesta,2021,1000000,,Grey,,\n'
+        ))
+        stdout, stderr = self.run_import(path, '--batch-size', '2')
+        self.assertEqual(stderr, '')
+        self.assertIn('создано 3', stdout)
+        bmw = Car.objects.get(make='BMW')
+        self.assertEqual(bmw.owner, self.dealer)
+        self.assertIsNone(bmw.mileage)
+        self.assertFalse(bmw.is_available)
+        self.assertEqual(str(bmw.price), '4500000.50')
+        self.assertTrue(Car.objects.get(make='Lada').is_available)
+        matches = Car.objects.extra(tables=['cars_car_fts'], where=[
+            'cars_car_fts.rowid = cars_car.id', 'cars_car_fts MATCH %s',
+        ], params=[build_match_query('седан')])
+        self.assertEqual([car.model for car in matches], ['Camry'])
+
+    def test_json_array_and_ndjson(self):
+        """
+        JSON-массив читается по частям, NDJSON — построчно.
+        """
+        cars = [{'make': 'Audi', 'model': f'A{i}', 'year': 2020, 'price': '3000000.00'} for i in range(50)]
+        path = self.write('cars.json', json.dumps(cars, indent=2))
+        self.run_import(path)
+        self.assertEqual(Car.objects.filter(make='Audi').count(), 50)
+
+        path = self.write('cars.ndjson', '\n'.join(json.dumps({**car, 'make': 'Kia'}) for car in cars) + '\n\n')
+        self.run_import(path)
+        self.assertEqual(Car.objects.filter(make='Kia').count(), 50)
+
+    def test_invalid_rows_are_reported_and_skipped(self):
+        """
+        Некорректные записи проверяются правилами CarSerializer, выводятся в stderr и пропускаются.
+        """
+        path = self.write('cars.ndjson', '\n'.join([
+            json.dumps({'make': 'Audi', 'model': 'A4', 'year': 2020, 'price': '3000000.00'}),
+            json.dumps({'make': 'Audi', 'model': 'A6', 'year': 'soon', 'price': '3000000.00'}),
+            '{broken',
+            json.dumps({'make': 'Audi', 'year': 2020, 'price': '3000000.00'}),
+        ]))
+        stdout, stderr = self.run_import(path)
+        self.assertEqual(Car.objects.count(), 1)
+        self.assertIn('Запись 2', stderr)
+        self.assertIn('year', stderr)
+        self.assertIn('Запись 3', stderr)
+        self.assertIn('Запись 4', stderr)
+        self.assertIn('с ошибками 3', stdout)
+
+        with self.assertRaises(CommandError):
+            self.run_import(path, '--max-errors', '1')
+
+    def test_upsert_by_external_key(self):
+        """
+        С --key записи с уже известным внешним идентификатором дилера обновляются, а не дублируются.
+        """
+        header = 'sku,make,model,year,price\n'
+        path = self.write('cars.csv', header + 'T-1,Toyota,Camry,2020,1500000\nT-2,BMW,X5,2022,4500000\n')
+        self.run_import(path, '--key', 'sku')
+        camry = Car.objects.get(external_id='T-1')
+
+        path = self.write('update.csv', header + 'T-1,Toyota,Camry,2020,1400000\nT-3,Kia,Rio,2019,900000\n')
+        stdout, _ = self.run_import(path, '--key', 'sku')
+        self.assertIn('создано 1, обновлено 1', stdout)
+        self.assertEqual(Car.objects.count(), 3)
+        updated = Car.objects.get(external_id='T-1')
+        self.assertEqual(updated.pk, camry.pk)
+        self.assertEqual(updated.price, 1400000)
+        self.assertGreater(updated.updated_at, camry.updated_at)
+
+        # Без ключа в строке запись не импортируется
+        path = self.write('nokey.csv', header + ',Lada,Vesta,2021,1000000\n')
+        _, stderr = self.run_import(path, '--key', 'sku')
+        self.assertIn('sku', stderr)
+
+    def test_dry_run(self):
+        """
+        --dry-run проверяет файл и считает записи, но ничего не пишет.
+        """
+        path = self.write('cars.csv', 'make,model,year,price\nToyota,Camry,2020,1500000\nBMW,X5,,4500000\n')
+        stdout, stderr = self.run_import(path, '--dry-run')
+        self.assertFalse(Car.objects.exists())
+        self.assertIn('создано 1', stdout)
+        self.assertIn('year', stderr)
+
+    def test_resume_from_checkpoint(self):
+        """
+        Повторный запуск с --checkpoint продолжает после последней закоммиченной пачки; по завершении файл удаляется.
+        """
+        rows = ''.join(f'Audi,A{i},2020,3000000\n' for i in range(5))
+        path = self.write('cars.csv', 'make,model,year,price\n' + rows)
+        checkpoint = os.path.join(self.directory, 'import.checkpoint')
+        with open(checkpoint, 'w', encoding='utf-8') as file:
+            json.dump({'source': os.path.abspath(path), 'position': 3,
+                       'totals': {'created': 3, 'updated': 0, 'invalid': 0}}, file)
+
+        stdout, _ = self.run_import(path, '--checkpoint', checkpoint)
+        self.assertIn('Продолжение с записи 4', stdout)
+        self.assertIn('создано 5', stdout)
+        self.assertEqual(sorted(Car.objects.values_list('model', flat=True)), ['A3', 'A4'])
+        self.assertFalse(os.path.exists(checkpoint))
+
+        other = self.write('other.csv', 'make,model,year,price\n')
+        with open(checkpoint, 'w', encoding='utf-8') as file:
+            json.dump({'source': os.path.abspath(path), 'position': 1, 'totals': {}}, file)
+        with self.assertRaises(CommandError):
+            self.run_import(other, '--checkpoint', checkpoint)
+
+    def test_checkpoint_written_after_each_batch(self):
+        """
+        Если импорт прервался, в файле позиции — номер последней записи закоммиченной пачки.
+        """
+        rows = ''.join(f'Audi,A{i},2020,3000000\n' for i in range(5))
+        path = self.write('cars.csv', 'make,model,year,price\n' + rows + 'Audi,A5,bad,1\nAudi,A6,bad,1\n')
+        checkpoint = os.path.join(self.directory, 'import.checkpoint')
+        with self.assertRaises(CommandError):
+            self.run_import(path, '--checkpoint', checkpoint, '--batch-size', '2', '--max-errors', '1')
+        with open(checkpoint, encoding='utf-8') as file:
+            self.assertEqual(json.load(file)['position'], 4)
+        self.assertEqual(Car.objects.count(), 4)
@@ -0,0 +1,201 @@
+import json
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import transaction
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from cars import jobs
+from cars.models import Car, Job
+from cars.testing import TestCase
+
+calls = []
+
+
+def record(car_id=None, **payload):
+    calls.append((car_id, payload))
+
+
+def record_batch(items):
+    calls.append(sorted(car_id for car_id, _ in items))
+
+
+def flaky(car_id=None, **payload):
+    raise RuntimeError('partner is down')
+
+
+@override_settings(CARS_JOBS={'CAR_HOOKS': ['tests.record']})
+class JobQueueTestCase(TestCase):
+    """
+    Тесты очереди фоновых задач: постановка после коммита, слияние заданий, воркер и повторы.
+    """
+    @classmethod
+    def setUpClass(cls):
+        # Тестовые задачи есть в jobs.registry только на время этих тестов
+        cls.enterClassContext(mock.patch.dict(jobs.registry))
+        jobs.task('tests.record')(record)
+        jobs.task('tests.record_batch', batch=True)(record_batch)
+        jobs.task('tests.flaky', max_attempts=2)(flaky)
+        super().setUpClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.dealer = User.objects.create_user('dealer', 'dealer@example.com', 'dealer_password')
+
+    def setUp(self):
+        calls.clear()
+
+    def create_car(self, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Car.objects.create(
+                **{'make': 'Toyota', 'model': 'Camry', 'year': 2020, 'price': 1500000, 'owner': self.dealer, **kwargs}
+            )
+
+    def run_worker(self, **kwargs):
+        return jobs.Worker(**kwargs).run(once=True)
+
+    def test_enqueued_after_commit(self):
+        """
+        Задание появляется только после коммита; выполняется воркером и удаляется из очереди.
+        """
+        with self.captureOnCommitCallbacks() as callbacks:
+            car = Car.objects.create(make='BMW', model='X5', year=2022, price=4500000, owner=self.dealer)
+            self.assertFalse(Job.objects.exists())
+        for callback in callbacks:
+            callback()
+        job = Job.objects.get()
+        self.assertEqual(
+            (job.task, job.car_id, job.payload, job.status), ('tests.record', car.pk, {'event': 'saved'}, Job.PENDING),
+        )
+
+        self.assertEqual(self.run_worker(), (1, 0))
+        self.assertEqual(calls, [(car.pk, {'event': 'saved'})])
+        self.assertFalse(Job.objects.exists())
+
+    def test_changes_of_one_car_merged(self):
+        """
+        Несколько изменений автомобиля до прихода воркера дают одно задание с последним событием.
+        """
+        car = self.create_car()
+        with self.captureOnCommitCallbacks(execute=True):
+            car.price = 1400000
+            car.save()
+        other = self.create_car(model='Corolla')
+        self.assertEqual(Job.objects.count(), 2)
+        car_id = car.pk
+        with self.captureOnCommitCallbacks(execute=True):
+            car.delete()
+        self.assertEqual(Job.objects.get(car_id=other.pk).payload, {'event': 'saved'})
+        self.assertEqual(Job.objects.get(car_id=car_id).payload, {'event': 'deleted'})
+
+    def test_rollback_enqueues_nothing(self):
+        """
+        Откат транзакции отменяет и задания.
+        """
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                Car.objects.create(make='BMW', model='X5', year=2022, price=4500000, owner=self.dealer)
+                raise RuntimeError
+        self.assertFalse(Job.objects.exists())
+
+    def test_bulk_create_enqueues_every_car(self):
+        """
+        Пакетное создание через API ставит задания на все новые автомобили одним INSERT.
+        """
+        client = APIClient()
+        client.force_authenticate(self.dealer)
+        items = [{'make': 'Audi', 'model': f'A{i}', 'year': 2020, 'price': '2000000.00'} for i in range(3)]
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.post(reverse('car-bulk'), items, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            sorted(Job.objects.values_list('car_id', flat=True)), sorted(item['id'] for item in response.data),
+        )
+
+    @override_settings(CARS_JOBS={'CAR_HOOKS': ['tests.record_batch']})
+    def test_batch_task(self):
+        """
+        Пакетная задача получает все забранные задания одним вызовом.
+        """
+        cars = [self.create_car(model=f'Model {i}') for i in range(3)]
+        self.assertEqual(self.run_worker(), (3, 0))
+        self.assertEqual(calls, [sorted(car.pk for car in cars)])
+
+    @override_settings(CARS_JOBS={'CAR_HOOKS': ['tests.flaky'], 'RETRY_DELAY': 10})
+    def test_retries(self):
+        """
+        Упавшее задание повторяется с задержкой, после последней попытки остаётся со статусом failed.
+        """
+        self.create_car()
+        with self.assertLogs('cars.jobs', 'ERROR'):
+            self.assertEqual(self.run_worker(), (0, 1))
+        job = Job.objects.get()
+        self.assertEqual((job.status, job.attempts), (Job.PENDING, 1))
+        self.assertIn('partner is down', job.last_error)
+        self.assertGreater(job.run_at, timezone.now() + timedelta(seconds=9))
+        # Срок повтора ещё не наступил
+        self.assertEqual(self.run_worker(), (0, 0))
+
+        Job.objects.update(run_at=timezone.now())
+        with self.assertLogs('cars.jobs', 'ERROR'):
+            self.run_worker()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.FAILED, 2))
+
+    def test_abandoned_job_reclaimed(self):
+        """
+        Задание воркера, упавшего посреди выполнения, подхватывается после истечения аренды.
+        """
+        car = self.create_car()
+        Job.objects.update(status=Job.RUNNING, locked_until=timezone.now() + timedelta(minutes=5), attempts=1)
+        self.assertEqual(self.run_worker(), (0, 0))
+        Job.objects.update(locked_until=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(self.run_worker(), (1, 0))
+        self.assertEqual(calls, [(car.pk, {'event': 'saved'})])
+
+    @override_settings(CARS_JOBS={'CAR_HOOKS': ['tests.record'], 'EAGER': True})
+    def test_eager(self):
+        """
+        В режиме EAGER задачи выполняются сразу после коммита, без очереди.
+        """
+        car = self.create_car()
+        self.assertEqual(calls, [(car.pk, {'event': 'saved'})])
+        self.assertFalse(Job.objects.exists())
+
+    def test_command(self):
+        """
+        manage.py run_jobs --once выполняет готовые задания и завершается.
+        """
+        self.create_car()
+        stdout = StringIO()
+        call_command('run_jobs', '--once', stdout=stdout)
+        self.assertIn('Выполнено заданий: 1, с ошибкой: 0', stdout.getvalue())
+
+    @override_settings(CARS_WEBHOOKS={'URLS': ['http://partner.example/hook']})
+    def test_notify_webhooks(self):
+        """
+        Уведомление партнёру: один POST на пачку, данные сохранённых автомобилей в формате API.
+        """
+        kept, removed = self.create_car(), self.create_car(model='Corolla')
+        removed_id = removed.pk
+        removed.delete()
+        with mock.patch('cars.tasks.urllib.request.urlopen') as urlopen:
+            jobs.execute(
+                jobs.registry['cars.notify_webhooks'],
+                [(kept.pk, {'event': 'saved'}), (removed_id, {'event': 'deleted'})],
+            )
+        request = urlopen.call_args.args[0]
+        self.assertEqual(request.full_url, 'http://partner.example/hook')
+        events = json.loads(request.data)['events']
+        self.assertEqual(
+            [(event['id'], event['event']) for event in events], [(kept.pk, 'saved'), (removed_id, 'deleted')],
+        )
+        self.assertEqual(events[0]['car']['model'], 'Camry')
+        self.assertIsNone(events[1]['car'])
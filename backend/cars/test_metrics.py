@@ -0,0 +1,156 @@
+import json
+import re
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.test import AsyncClient, SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from cars import metrics
+from cars.models import Car
+from cars.testing import APITestCase
+
+
+def parse_server_timing(value):
+    """
+    {'db': (мс, описание), 'filter': (мс, None), ...} из заголовка Server-Timing.
+    """
+    entries = {}
+    for part in value.split(', '):
+        name, *params = part.split(';')
+        params = dict(param.split('=', 1) for param in params)
+        entries[name] = (float(params['dur']), params.get('desc', '').strip('"') or None)
+    return entries
+
+
+# Кэш ответов отключён: здесь проверяется работа с базой, а не cars.cache
+@override_settings(CARS_RESPONSE_CACHE={'ENABLED': False}, CARS_METRICS={'ENABLED': True, 'SERVER_TIMING': True})
+class PerformanceMiddlewareTestCase(APITestCase):
+    """
+    Тесты замеров запросов: Server-Timing, лог, метрики Prometheus.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'owner_password')
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'admin_password')
+        for i in range(5):
+            Car.objects.create(make='Toyota', model=f'Model {i}', year=2020, price=1000000 + i, owner=cls.owner)
+
+    def setUp(self):
+        metrics.registry.reset()
+        self.client = APIClient()
+        self.list_url = reverse('car-list')
+
+    def test_server_timing_phases(self):
+        """
+        Заголовок Server-Timing содержит SQL-запросы, фазы CarViewSet и общее время.
+        """
+        with self.assertNumQueries(3) as queries:
+            response = self.client.get(self.list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        timing = parse_server_timing(response['Server-Timing'])
+        self.assertEqual(list(timing), ['db', 'filter', 'paginate', 'serialize', 'render', 'total'])
+        self.assertEqual(timing['db'][1], f'{len(queries.captured_queries)} queries')
+        self.assertGreaterEqual(timing['total'][0], max(duration for duration, _ in timing.values()))
+
+    @override_settings(CARS_METRICS={'ENABLED': True, 'SERVER_TIMING_TOKEN': 'secret'})
+    def test_server_timing_restricted(self):
+        """
+        По умолчанию Server-Timing не отдаётся; с токеном — только запросам с верным X-Server-Timing-Token.
+        """
+        self.assertNotIn('Server-Timing', self.client.get(self.list_url))
+        self.assertNotIn('Server-Timing', self.client.get(self.list_url, HTTP_X_SERVER_TIMING_TOKEN='wrong'))
+        response = self.client.get(self.list_url, HTTP_X_SERVER_TIMING_TOKEN='secret')
+        self.assertIn('total', parse_server_timing(response['Server-Timing']))
+        with override_settings(CARS_METRICS={'ENABLED': True}):
+            self.assertNotIn('Server-Timing', APIClient().get(self.list_url, HTTP_X_SERVER_TIMING_TOKEN=''))
+
+    def test_async_view_counts_queries(self):
+        """
+        Запросы асинхронного пути (потоки sync_to_async) тоже учитываются.
+        """
+        response = async_to_sync(AsyncClient().get)(reverse('car-async-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(parse_server_timing(response['Server-Timing'])['db'][1], '2 queries')
+
+    def test_structured_log(self):
+        """
+        На каждый запрос пишется строка лога с JSON-замерами.
+        """
+        with self.assertLogs('cars.metrics', 'INFO') as logs:
+            self.client.get(self.list_url, {'make': 'toyota'})
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record['view'], 'car-list')
+        self.assertEqual(record['path'], self.list_url)
+        self.assertEqual(record['status'], 200)
+        self.assertEqual(record['db_queries'], 3)
+        self.assertIn('serialize_ms', record)
+
+    def test_metrics_endpoint(self):
+        """
+        /api/metrics/ отдаёт счётчики и гистограммы в формате Prometheus и доступен только администраторам.
+        """
+        url = reverse('metrics')
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.client.force_authenticate(user=self.owner)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+
+        for _ in range(3):
+            self.client.get(self.list_url)
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        text = response.content.decode()
+        self.assertIn('cars_http_requests_total{view="car-list",method="GET",status="200"} 3\n', text)
+        self.assertIn('cars_http_db_queries_total{view="car-list",method="GET"} 9\n', text)
+        self.assertIn('cars_http_request_duration_seconds_count{view="car-list",method="GET"} 3\n', text)
+        self.assertIn('cars_http_request_duration_seconds_bucket{view="car-list",method="GET",le="+Inf"} 3\n', text)
+        self.assertRegex(text, r'cars_http_phase_duration_seconds_count\{view="car-list",method="GET",phase="serialize"\} 3\n')
+        self.assertRegex(
+            text, r'cars_http_request_duration_window_seconds\{view="car-list",method="GET",quantile="0.99"\} [\d.e-]+\n'
+        )
+        self.assertIn('# TYPE cars_response_cache_hits_total counter\n', text)
+        # Каждая строка — комментарий или «имя{метки} значение»
+        for line in text.splitlines():
+            self.assertRegex(line, r'^(# (HELP|TYPE) \w+ .+|\w+(\{.*\})? \S+)$')
+
+    @override_settings(CARS_METRICS={'ENABLED': False})
+    def test_disabled(self):
+        """
+        При отключённых метриках middleware не участвует в запросе.
+        """
+        response = self.client.get(self.list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('Server-Timing', response)
+        self.assertEqual(metrics.registry.counters['cars_http_requests_total'], {})
+
+
+class HistogramTestCase(SimpleTestCase):
+    """
+    Тесты гистограммы: накопительные счётчики и квантили за скользящее окно.
+    """
+    def test_buckets_and_window(self):
+        histogram = metrics.Histogram([0.1, 0.2, 0.4], window_seconds=60, window_slices=6)
+        for value in [0.05] * 50 + [0.15] * 40 + [1.0] * 10:
+            histogram.observe(value, now=1000)
+        self.assertEqual(histogram.counts, [50, 40, 0, 10])
+
+        counts, total = histogram.window(now=1000)
+        self.assertEqual(counts, [50, 40, 0, 10])
+        self.assertAlmostEqual(total, 18.5)
+        self.assertAlmostEqual(histogram.quantile(counts, 0.5), 0.1)
+        self.assertAlmostEqual(histogram.quantile(counts, 0.7), 0.15)
+        self.assertEqual(histogram.quantile(counts, 0.99), 0.4)  # Корзина +Inf — последняя конечная граница
+
+        # Через минуту старые срезы выпадают из окна, а накопительные счётчики остаются
+        histogram.observe(0.3, now=1061)
+        counts, _ = histogram.window(now=1061)
+        self.assertEqual(counts, [0, 0, 1, 0])
+        self.assertEqual(sum(histogram.counts), 101)
+
+    def test_label_escaping(self):
+        self.assertEqual(metrics._labels((('view', 'a"b\\c'),)), '{view="a\\"b\\\\c"}')
+        self.assertTrue(re.match(r'^NaN$', metrics._number(float('nan'))))
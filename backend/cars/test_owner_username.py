@@ -0,0 +1,98 @@
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from cars import cache
+from cars.models import Car
+from cars.testing import APITestCase
+
+
+class OwnerUsernameTestCase(APITestCase):
+    """
+    Тесты денормализованного Car.owner_username: заполнение при создании и согласованность при переименовании.
+    """
+    def setUp(self):
+        cache.get_cache().clear()
+        self.owner = User.objects.create_user('owner', 'owner@example.com', 'owner_password')
+        self.other = User.objects.create_user('other', 'other@example.com', 'other_password')
+        self.car = Car.objects.create(make='Toyota', model='Camry', year=2020, price=1500000, owner=self.owner)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.owner)
+
+    def test_filled_on_create(self):
+        """
+        Имя заполняется при save(), при пакетном создании и при смене владельца.
+        """
+        self.assertEqual(self.car.owner_username, 'owner')
+        response = self.client.post(
+            reverse('car-bulk'), [{'make': 'BMW', 'model': 'X5', 'year': 2022, 'price': '4500000.00'}], format='json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data[0]['owner'], {'username': 'owner'})
+        self.assertEqual(Car.objects.get(pk=response.data[0]['id']).owner_username, 'owner')
+
+        self.car.owner = self.other
+        self.car.save(update_fields=['owner'])
+        self.assertEqual(Car.objects.get(pk=self.car.pk).owner_username, 'other')
+
+    @override_settings(CARS_SUMMARIES={'ENABLED': False})
+    def test_owner_id_reassigned(self):
+        """
+        Смена owner_id у загруженного автомобиля (без объекта владельца) обновляет имя,
+        в том числе при save(update_fields=['owner']) и при возврате прежнего владельца.
+        """
+        car = Car.objects.get(pk=self.car.pk)
+        car.owner_id = self.other.pk
+        car.save()
+        self.assertEqual(Car.objects.get(pk=car.pk).owner_username, 'other')
+
+        car.owner_id = self.owner.pk
+        car.save()
+        self.assertEqual(Car.objects.get(pk=car.pk).owner_username, 'owner')
+
+        car = Car.objects.get(pk=self.car.pk)
+        car.owner_id = self.other.pk
+        car.save(update_fields=['owner'])
+        self.assertEqual(Car.objects.get(pk=car.pk).owner_username, 'other')
+
+    def test_rename_updates_cars(self):
+        """
+        Переименование пользователя меняет имя во всех его автомобилях и сбрасывает кэш каталога.
+        """
+        list_url = reverse('car-list')
+        self.assertEqual(self.client.get(list_url).data['results'][0]['owner'], {'username': 'owner'})
+        old_updated_at = self.car.updated_at
+
+        self.owner.username = 'renamed'
+        self.owner.save()
+        car = Car.objects.get(pk=self.car.pk)
+        self.assertEqual(car.owner_username, 'renamed')
+        self.assertGreater(car.updated_at, old_updated_at)
+        self.assertEqual(self.client.get(list_url).data['results'][0]['owner'], {'username': 'renamed'})
+        detail = self.client.get(reverse('car-detail', kwargs={'pk': self.car.pk}))
+        self.assertEqual(detail.data['owner'], {'username': 'renamed'})
+
+    @override_settings(CARS_RESPONSE_CACHE={'ENABLED': False})
+    def test_rename_changes_list_etag(self):
+        """
+        ETag списка меняется после переименования владельца (updated_at обновляется вместе с именем).
+        """
+        list_url = reverse('car-list')
+        etag = self.client.get(list_url)['ETag']
+        self.owner.username = 'renamed'
+        self.owner.save()
+        response = self.client.get(list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_unrelated_user_save_is_cheap(self):
+        """
+        Сохранение пользователя без смены имени не трогает автомобили; при update_fields без username — только сам UPDATE пользователя.
+        """
+        old_updated_at = self.car.updated_at
+        with self.assertNumQueries(1):
+            self.owner.save(update_fields=['last_login'])
+        self.owner.save()
+        self.assertEqual(Car.objects.get(pk=self.car.pk).updated_at, old_updated_at)
@@ -0,0 +1,112 @@
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from cars.models import Car
+from cars.testing import APITestCase
+
+
+# Кэш ответов отключён: здесь проверяется работа с базой, а не cars.cache
+@override_settings(CARS_RESPONSE_CACHE={'ENABLED': False})
+class CarCursorPaginationTestCase(APITestCase):
+    """
+    Тесты курсорной пагинации списка автомобилей (?pagination=cursor).
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'owner_password')
+        # Много одинаковых цен и годов, чтобы проверить уникальный tiebreaker
+        for i in range(25):
+            Car.objects.create(
+                make='Toyota', model=f'Model {i}', year=2010 + i % 3, price=1000000 + (i % 4) * 1000,
+                description=f'Car {i}', owner=cls.owner,
+            )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.list_url = reverse('car-list')
+
+    def collect(self, url):
+        """
+        Проходит по всем страницам по ссылкам next и возвращает id автомобилей в порядке выдачи.
+        """
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+            ids.extend(car['id'] for car in response.data['results'])
+            url = response.data['next']
+        return ids
+
+    def test_default_ordering_walks_all_cars(self):
+        """
+        Курсорный обход без ?ordering выдаёт все автомобили от новых к старым без повторов.
+        """
+        ids = self.collect(self.list_url + '?pagination=cursor')
+        expected = list(Car.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        self.assertEqual(ids, expected)
+
+    def test_ordering_with_duplicate_values(self):
+        """
+        При сортировке по полям с повторяющимися значениями страницы не теряют и не дублируют строки.
+        """
+        for ordering in ['price', '-price', 'year', '-year', 'created_at']:
+            with self.subTest(ordering=ordering):
+                ids = self.collect(self.list_url + f'?pagination=cursor&ordering={ordering}')
+                tiebreaker = '-id' if ordering.startswith('-') else 'id'
+                expected = list(Car.objects.order_by(ordering, tiebreaker).values_list('id', flat=True))
+                self.assertEqual(ids, expected)
+
+    def test_stable_under_concurrent_inserts(self):
+        """
+        Новые автомобили, добавленные между запросами, не сдвигают следующую страницу.
+        """
+        first = self.client.get(self.list_url + '?pagination=cursor')
+        Car.objects.create(make='BMW', model='X5', year=2024, price=5000000, owner=self.owner)
+        ids = [car['id'] for car in first.data['results']] + self.collect(first.data['next'])
+        self.assertEqual(len(ids), len(set(ids)))
+        self.assertEqual(len(ids), 25)
+
+    def test_previous_link(self):
+        """
+        Ссылка previous возвращает на предыдущую страницу.
+        """
+        first = self.client.get(self.list_url + '?pagination=cursor&ordering=price')
+        self.assertIsNone(first.data['previous'])
+        second = self.client.get(first.data['next'])
+        back = self.client.get(second.data['previous'])
+        self.assertEqual(
+            [car['id'] for car in back.data['results']],
+            [car['id'] for car in first.data['results']],
+        )
+
+    def test_no_count_query(self):
+        """
+        Курсорная страница загружается одним запросом, без COUNT(*).
+        """
+        first = self.client.get(self.list_url + '?pagination=cursor')
+        with self.assertNumQueries(1):
+            response = self.client.get(first.data['next'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_invalid_cursor(self):
+        """
+        Испорченный курсор или курсор от другой сортировки даёт 404.
+        """
+        response = self.client.get(self.list_url + '?pagination=cursor&cursor=garbage')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        first = self.client.get(self.list_url + '?pagination=cursor&ordering=price')
+        response = self.client.get(first.data['next'].replace('ordering=price', 'ordering=year'))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_page_number_mode_still_default(self):
+        """
+        Без ?pagination=cursor список по-прежнему отдаёт count и номера страниц.
+        """
+        response = self.client.get(self.list_url + '?page=2')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 25)
+        self.assertEqual(len(response.data['results']), 10)
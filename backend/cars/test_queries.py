@@ -0,0 +1,107 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.test import APIClient
+
+from cars.models import Car
+from cars.testing import APITestCase
+
+
+# Кэш ответов отключён: здесь проверяется работа с базой, а не cars.cache
+@override_settings(CARS_RESPONSE_CACHE={'ENABLED': False})
+class CarQueryCountTestCase(APITestCase):
+    """
+    Регрессионные тесты на количество SQL-запросов в CarViewSet.
+    Число запросов не должно зависеть от количества автомобилей на странице (нет N+1).
+    """
+    # Бюджеты запросов для каждого сценария
+    LIST_QUERIES = 3      # валидаторы ETag (max(updated_at) + count) + COUNT(*) для пагинации + выборка страницы
+    RETRIEVE_QUERIES = 2  # updated_at для ETag + выборка автомобиля (имя владельца — в самой строке)
+    UPDATE_QUERIES = 5    # выборка автомобиля + UPDATE + по одному upsert в каждую из трёх сводок (cars/summaries.py)
+
+    @classmethod
+    def setUpTestData(cls):
+        # Несколько владельцев, чтобы N+1 по owner был заметен
+        cls.owners = [
+            User.objects.create_user(f'owner{i}', f'owner{i}@example.com', 'owner_password')
+            for i in range(5)
+        ]
+        for i in range(30):
+            Car.objects.create(
+                make='Toyota' if i % 2 else 'BMW', model=f'Model {i}', year=2000 + i % 20,
+                price=1000000 + i * 1000, mileage=10000 * i, color='Black',
+                description=f'Car number {i}', is_available=bool(i % 3),
+                owner=cls.owners[i % len(cls.owners)],
+            )
+        cls.car = Car.objects.filter(owner=cls.owners[0]).first()
+
+    def setUp(self):
+        self.anon_client = APIClient()
+        self.owner_client = APIClient()
+        self.owner_client.force_authenticate(user=self.owners[0])
+        self.list_url = reverse('car-list')
+        self.detail_url = reverse('car-detail', kwargs={'pk': self.car.pk})
+
+    def test_list_query_budget(self):
+        """
+        Список автомобилей укладывается в фиксированный бюджет запросов.
+        """
+        with self.assertNumQueries(self.LIST_QUERIES):
+            response = self.anon_client.get(self.list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 10)
+
+    def test_list_query_budget_independent_of_page_size(self):
+        """
+        Число запросов не растёт вместе с количеством строк в ответе.
+        """
+        with mock.patch.object(PageNumberPagination, 'page_size', 30):
+            with self.assertNumQueries(self.LIST_QUERIES):
+                response = self.anon_client.get(self.list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 30)
+
+    def test_list_reads_only_cars_table(self):
+        """
+        Страница списка выбирается из одной таблицы cars_car, без JOIN с auth_user.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = self.anon_client.get(self.list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0]['owner'], {'username': self.owners[4].username})
+        for query in queries.captured_queries:
+            self.assertNotIn('auth_user', query['sql'])
+
+    def test_filtered_list_query_budget(self):
+        """
+        Фильтрация, поиск и сортировка не добавляют запросов.
+        """
+        url = self.list_url + '?make=toyota&is_available=true&year_min=2005&ordering=-price&search=Car'
+        with self.assertNumQueries(self.LIST_QUERIES):
+            response = self.anon_client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['results'])
+
+    def test_retrieve_query_budget(self):
+        """
+        Детальная информация об автомобиле загружается одним запросом.
+        """
+        with self.assertNumQueries(self.RETRIEVE_QUERIES):
+            response = self.anon_client.get(self.detail_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['owner']['username'], self.owners[0].username)
+
+    def test_update_query_budget(self):
+        """
+        Обновление владельцем (проверка IsOwner + сохранение + ответ) укладывается в бюджет.
+        """
+        with self.assertNumQueries(self.UPDATE_QUERIES):
+            response = self.owner_client.patch(self.detail_url, {'price': '999999.00'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['owner']['username'], self.owners[0].username)
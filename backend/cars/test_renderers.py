@@ -0,0 +1,172 @@
+import gzip
+import json
+import unittest
+from datetime import datetime, timezone
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+
+from cars import compression
+from cars.models import Car
+from cars.renderers import CompactJSONRenderer, FastJSONRenderer, columnar, msgpack
+from cars.testing import APITestCase
+
+
+class FastJSONRendererTestCase(unittest.TestCase):
+    """
+    Тесты FastJSONRenderer: вывод побайтно совпадает с JSONRenderer DRF.
+    """
+    data = {
+        'price': Decimal('1500000.00'),
+        'created_at': datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc),
+        'owner': {'username': 'Пётр'},
+        'tags': ['a b', None, True, 1.5],
+        1: 'non-string key',
+    }
+
+    def test_matches_drf(self):
+        """
+        Decimal, datetime, юникод, U+2028 и нестроковые ключи кодируются как в DRF, с orjson и без него.
+        """
+        expected = JSONRenderer().render(self.data)
+        self.assertEqual(FastJSONRenderer().render(self.data), expected)
+        with mock.patch('cars.renderers.orjson', None):
+            self.assertEqual(FastJSONRenderer().render(self.data), expected)
+
+    def test_indent(self):
+        """
+        Запрошенный отступ (Accept: application/json; indent=2) обрабатывается как в DRF.
+        """
+        media_type = 'application/json; indent=2'
+        self.assertEqual(
+            FastJSONRenderer().render(self.data, media_type), JSONRenderer().render(self.data, media_type),
+        )
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+
+    def test_columnar(self):
+        """
+        Страница превращается в имена полей и массивы значений; новые ключи дописываются, прочее не меняется.
+        """
+        page = {'count': 2, 'next': None, 'results': [{'id': 1, 'make': 'BMW'}, {'id': 2, 'model': 'X5'}]}
+        self.assertEqual(columnar(page), {
+            'count': 2, 'next': None, 'fields': ['id', 'make', 'model'], 'rows': [[1, 'BMW', None], [2, None, 'X5']],
+        })
+        self.assertEqual(columnar([]), {'fields': [], 'rows': []})
+        for data in ({'id': 1}, {'detail': 'Not found.'}, ['a', 'b']):
+            self.assertEqual(columnar(data), data)
+
+
+# Кэш ответов отключён, чтобы каждый формат строился из базы
+@override_settings(CARS_RESPONSE_CACHE={'ENABLED': False})
+class EncodingTestCase(APITestCase):
+    """
+    Тесты согласования формата ответов и сжатия.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'owner_password')
+        Car.objects.bulk_create([
+            Car(make='Toyota', model='Camry', year=2015 + i, price=1000000 + i, owner=cls.owner,
+                owner_username='owner', description='Надёжный семейный седан ' * 5)
+            for i in range(5)
+        ])
+        cls.url = reverse('car-list')
+
+    def test_compact_list(self):
+        """
+        ?format=compact и Accept: application/vnd.cars.compact+json дают те же данные в столбцовом виде.
+        """
+        regular = self.client.get(self.url).json()
+        for response in (
+            self.client.get(self.url, {'format': 'compact'}),
+            self.client.get(self.url, HTTP_ACCEPT=CompactJSONRenderer.media_type),
+        ):
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response['Content-Type'], CompactJSONRenderer.media_type)
+            data = json.loads(response.content)
+            self.assertEqual(data['count'], regular['count'])
+            self.assertEqual([dict(zip(data['fields'], row)) for row in data['rows']], regular['results'])
+            self.assertLess(len(response.content), len(json.dumps(regular, ensure_ascii=False).encode()))
+        self.assertIn('Accept', response['Vary'])
+
+        detail_url = reverse('car-detail', args=[regular['results'][0]['id']])
+        response = self.client.get(detail_url, {'format': 'compact'})
+        self.assertEqual(json.loads(response.content), self.client.get(detail_url).json())
+
+    def test_etag_per_format(self):
+        """
+        У каждого формата свой ETag; ETag одного формата не даёт 304 для другого.
+        """
+        detail_url = reverse('car-detail', args=[Car.objects.first().pk])
+        for url in (self.url, detail_url):
+            etag = self.client.get(url)['ETag']
+            compact = self.client.get(url, HTTP_ACCEPT=CompactJSONRenderer.media_type)
+            self.assertNotEqual(compact['ETag'], etag)
+            response = self.client.get(url, HTTP_ACCEPT=CompactJSONRenderer.media_type, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            response = self.client.get(
+                url, HTTP_ACCEPT=CompactJSONRenderer.media_type, HTTP_IF_NONE_MATCH=compact['ETag'],
+            )
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    @unittest.skipIf(msgpack is None, 'msgpack не установлен')
+    def test_msgpack(self):
+        """
+        MessagePack декодируется в те же данные, что и JSON.
+        """
+        response = self.client.get(self.url, HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        self.assertEqual(msgpack.unpackb(response.content), self.client.get(self.url).json())
+
+    def test_gzip(self):
+        """
+        Ответ больше порога сжимается, Vary и слабый ETag выставлены, условный запрос с ним даёт 304.
+        """
+        plain = self.client.get(self.url)
+        self.assertFalse(plain.has_header('Content-Encoding'))
+        self.assertIn('Accept-Encoding', plain['Vary'])
+
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        self.assertEqual(int(response['Content-Length']), len(response.content))
+        self.assertEqual(response['ETag'], 'W/' + plain['ETag'])
+
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_threshold(self):
+        """
+        Ответы меньше MIN_SIZE и отказ клиента (gzip;q=0) оставляют тело несжатым.
+        """
+        response = self.client.get(reverse('car-detail', args=[Car.objects.first().pk]), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip;q=0, identity')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_streaming_export(self):
+        """
+        Потоковая выгрузка сжимается по кускам и распаковывается в исходный NDJSON.
+        """
+        self.client.force_authenticate(user=self.owner)
+        plain = b''.join(self.client.get(reverse('car-export')).streaming_content)
+        response = self.client.get(reverse('car-export'), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)), plain)
+
+    def test_choose_encoding(self):
+        """
+        Выбор кодировки учитывает q-значения и *.
+        """
+        with mock.patch.dict(compression.ENCODINGS, {'br': None, 'gzip': None}, clear=True):
+            self.assertEqual(compression.choose_encoding('gzip, br'), 'br')
+            self.assertEqual(compression.choose_encoding('br;q=0.5, gzip'), 'gzip')
+            self.assertEqual(compression.choose_encoding('*'), 'br')
+            self.assertEqual(compression.choose_encoding('*, br;q=0'), 'gzip')
+            self.assertIsNone(compression.choose_encoding('identity'))
+            self.assertIsNone(compression.choose_encoding(''))
@@ -0,0 +1,186 @@
+import copy
+import time
+import warnings
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connections
+from django.test import AsyncClient, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from cars import cache, routers
+from cars.models import Car
+from cars.testing import TransactionTestCase
+
+
+def reload_databases():
+    # ConnectionHandler запоминает settings.DATABASES при первом обращении; сбрасываем обе копии
+    connections._settings = None
+    connections.__dict__.pop('settings', None)
+
+
+def sync_replica():
+    for alias in ('default', 'replica'):
+        connections[alias].ensure_connection()
+    connections['default'].connection.backup(connections['replica'].connection)
+
+
+@override_settings(
+    CARS_READ_REPLICAS={'ALIASES': ['replica'], 'STICKY_SECONDS': 10},
+    # Кэш ответов отключён: здесь проверяется, из какой базы читаются данные
+    CARS_RESPONSE_CACHE={'ENABLED': False},
+)
+class ReplicaRoutingTestCase(TransactionTestCase):
+    """
+    Тесты чтения каталога с реплики и read-your-writes после записи.
+    """
+    @classmethod
+    def setUpClass(cls):
+        # Вторая база-«реплика» существует только на время этих тестов: отдельная SQLite-база с той же схемой.
+        # Репликацию заменяет sync_replica() — полная копия основной базы через SQLite backup API.
+        # Django не перенастраивает соединения при override_settings(DATABASES=...) и предупреждает об этом,
+        # поэтому список алиасов в django.db.connections сбрасывается и тестовая база создаётся здесь.
+        # В databases алиас добавляется тоже здесь: запускатель тестов проверяет объявленные базы до setUpClass.
+        cls.replica_settings = override_settings(DATABASES={
+            **settings.DATABASES, 'replica': {**copy.deepcopy(settings.DATABASES['default']), 'NAME': 'replica.sqlite3'},
+        })
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            cls.replica_settings.enable()
+        reload_databases()
+        connections['replica'].creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        cls.databases = {'default', 'replica'}
+        try:
+            super().setUpClass()
+        except Exception:
+            cls.drop_replica()
+            raise
+
+    @classmethod
+    def tearDownClass(cls):
+        try:
+            super().tearDownClass()
+        finally:
+            cls.drop_replica()
+
+    @classmethod
+    def drop_replica(cls):
+        connections['replica'].creation.destroy_test_db('replica.sqlite3', verbosity=0)
+        del connections['replica']
+        del cls.databases
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            cls.replica_settings.disable()
+        reload_databases()
+
+    def setUp(self):
+        cache.get_cache().clear()
+        self.owner = User.objects.create_user('owner', 'owner@example.com', 'owner_password')
+        self.other = User.objects.create_user('other', 'other@example.com', 'other_password')
+        self.car = Car.objects.create(make='Toyota', model='Camry', year=2020, price=1500000, owner=self.owner)
+        sync_replica()
+        self.anon_client = APIClient()
+        self.owner_client = APIClient()
+        self.owner_client.force_authenticate(user=self.owner)
+        self.other_client = APIClient()
+        self.other_client.force_authenticate(user=self.other)
+        self.list_url = reverse('car-list')
+
+    def create_car(self, client=None):
+        response = (client or self.owner_client).post(
+            self.list_url, {'make': 'BMW', 'model': 'X5', 'year': 2022, 'price': '4500000.00'}, format='json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response.data['id']
+
+    def test_reads_go_to_replica_until_synced(self):
+        """
+        Чтения каталога идут на реплику: запись видна другим только после репликации.
+        """
+        pk = self.create_car()
+        self.assertTrue(Car.objects.using('default').filter(pk=pk).exists())
+        self.assertFalse(Car.objects.using('replica').filter(pk=pk).exists())
+
+        self.assertEqual(self.anon_client.get(self.list_url).data['count'], 1)
+        self.assertEqual(self.other_client.get(self.list_url).data['count'], 1)
+        response = self.anon_client.get(reverse('car-detail', kwargs={'pk': pk}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        sync_replica()
+        self.assertEqual(self.anon_client.get(self.list_url).data['count'], 2)
+
+    def test_read_your_writes(self):
+        """
+        Пользователь, который только что писал, читает с основной базы; после окна — снова с реплики.
+        """
+        pk = self.create_car()
+        self.assertEqual(self.owner_client.get(self.list_url).data['count'], 2)
+        response = self.owner_client.get(reverse('car-detail', kwargs={'pk': pk}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # Окно истекло (метки в кэше нет) — пользователь снова читает с реплики
+        cache.get_cache().delete(routers._pin_key(self.owner.pk))
+        self.assertEqual(self.owner_client.get(self.list_url).data['count'], 1)
+
+    def test_writes_go_to_primary(self):
+        """
+        Изменение и удаление выполняются на основной базе, реплика не меняется до синхронизации.
+        """
+        url = reverse('car-detail', kwargs={'pk': self.car.pk})
+        response = self.owner_client.patch(url, {'price': '1000.00'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Car.objects.using('default').get(pk=self.car.pk).price, 1000)
+        self.assertEqual(Car.objects.using('replica').get(pk=self.car.pk).price, 1500000)
+
+        response = self.owner_client.delete(url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Car.objects.using('default').exists())
+        self.assertTrue(Car.objects.using('replica').exists())
+
+    def test_export_facets_and_async_use_replica(self):
+        """
+        Выгрузка, фасеты и асинхронный список тоже читают с реплики.
+        """
+        self.create_car()
+        response = self.other_client.get(reverse('car-export'))
+        self.assertEqual(b''.join(response.streaming_content).count(b'\n'), 1)
+        self.assertEqual(self.anon_client.get(reverse('car-facets')).data['total'], 1)
+
+        response = async_to_sync(AsyncClient().get)(reverse('car-async-list'))
+        self.assertEqual(response.json()['count'], 1)
+
+    def test_code_outside_viewset_reads_primary(self):
+        """
+        Вне запросов каталога (админка, команды, ORM) чтение идёт с основной базы.
+        """
+        Car.objects.create(make='Lada', model='Vesta', year=2021, price=1000000, owner=self.owner)
+        self.assertEqual(Car.objects.count(), 2)
+        admin_client = APIClient()
+        admin_client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'admin_password'))
+        response = admin_client.get(reverse('admin:cars_car_changelist'))
+        self.assertContains(response, 'Vesta')
+
+    @override_settings(CARS_RESPONSE_CACHE={'ENABLED': True, 'ALIAS': 'cars', 'TIMEOUT': 300})
+    def test_replica_reads_cached_briefly(self):
+        """
+        Запись закрепляет за основной базой только автора; общий кэш ответов продолжает работать,
+        но прочитанное с реплики живёт в нём не дольше STICKY_SECONDS и не переживает синхронизацию.
+        """
+        self.create_car()
+        self.assertEqual(self.anon_client.get(self.list_url)['X-Cache'], 'MISS')
+        response = self.other_client.get(self.list_url)
+        self.assertEqual((response['X-Cache'], response.data['count']), ('HIT', 1))
+
+        sync_replica()
+        with mock.patch('time.time', return_value=time.time() + 11):
+            response = self.anon_client.get(self.list_url)
+        self.assertEqual((response['X-Cache'], response.data['count']), ('MISS', 2))
+
+        # Автор записи не получает из кэша прочитанное с реплики до синхронизации
+        self.create_car()
+        self.assertEqual(self.anon_client.get(self.list_url).data['count'], 2)
+        self.assertEqual(self.owner_client.get(self.list_url).data['count'], 3)
@@ -0,0 +1,107 @@
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from cars.models import Car
+from cars.search import build_match_query
+from cars.testing import APITestCase
+
+
+# Кэш ответов отключён: здесь проверяется работа с базой, а не cars.cache
+@override_settings(CARS_RESPONSE_CACHE={'ENABLED': False})
+class CarFullTextSearchTestCase(APITestCase):
+    """
+    Тесты полнотекстового поиска (?search=) по индексу FTS5.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'owner_password')
+        cls.camry = Car.objects.create(
+            make='Toyota', model='Camry', year=2020, price=1500000,
+            description='Reliable family sedan', owner=cls.owner,
+        )
+        cls.land_cruiser = Car.objects.create(
+            make='Toyota', model='Land Cruiser', year=2019, price=6000000,
+            description='Reliable SUV, very reliable engine', owner=cls.owner, is_available=False,
+        )
+        cls.x5 = Car.objects.create(
+            make='BMW', model='X5', year=2022, price=4500000,
+            description='Luxury SUV', owner=cls.owner,
+        )
+        cls.vesta = Car.objects.create(
+            make='Лада', model='Веста', year=2021, price=1200000,
+            description='Надёжный седан', owner=cls.owner,
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.list_url = reverse('car-list')
+
+    def search(self, query, **params):
+        params['search'] = query
+        response = self.client.get(self.list_url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [car['id'] for car in response.data['results']]
+
+    def test_build_match_query(self):
+        """
+        Пользовательский ввод превращается в безопасный префиксный AND-запрос.
+        """
+        self.assertEqual(build_match_query('Toyota  "Camry'), '"Toyota"* "Camry"*')
+        self.assertIsNone(build_match_query(' -*" '))
+
+    def test_search_across_fields(self):
+        """
+        Поиск идёт по марке, модели и описанию.
+        """
+        self.assertEqual(set(self.search('toyota')), {self.camry.pk, self.land_cruiser.pk})
+        self.assertEqual(self.search('camry'), [self.camry.pk])
+        self.assertEqual(self.search('luxury'), [self.x5.pk])
+
+    def test_prefix_and_multi_term(self):
+        """
+        Слова ищутся по префиксу, и все слова запроса должны присутствовать.
+        """
+        self.assertEqual(set(self.search('relia')), {self.camry.pk, self.land_cruiser.pk})
+        self.assertEqual(self.search('toyota suv'), [self.land_cruiser.pk])
+        self.assertEqual(self.search('toyota luxury'), [])
+
+    def test_unicode_case_insensitive(self):
+        """
+        Кириллица ищется без учёта регистра.
+        """
+        self.assertEqual(self.search('ВЕСТА'), [self.vesta.pk])
+        self.assertEqual(self.search('надёжный'), [self.vesta.pk])
+
+    def test_ranking(self):
+        """
+        Без ?ordering более релевантные объявления идут первыми.
+        """
+        self.assertEqual(self.search('reliable'), [self.land_cruiser.pk, self.camry.pk])
+
+    def test_explicit_ordering_and_filters(self):
+        """
+        Поиск сочетается с CarFilter и явной сортировкой.
+        """
+        self.assertEqual(self.search('suv', ordering='price'), [self.x5.pk, self.land_cruiser.pk])
+        self.assertEqual(self.search('suv', is_available='true'), [self.x5.pk])
+
+    def test_index_follows_writes(self):
+        """
+        Индекс обновляется при создании, изменении (в том числе queryset.update) и удалении автомобиля.
+        """
+        car = Car.objects.create(make='Audi', model='Q7', year=2023, price=7000000, owner=self.owner)
+        self.assertEqual(self.search('audi'), [car.pk])
+
+        car.description = 'Quattro diesel'
+        car.save()
+        self.assertEqual(self.search('quattro'), [car.pk])
+
+        Car.objects.filter(pk=car.pk).update(model='Q8')
+        self.assertEqual(self.search('q8'), [car.pk])
+        self.assertEqual(self.search('q7'), [])
+
+        car.delete()
+        self.assertEqual(self.search('audi'), [])
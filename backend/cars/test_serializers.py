@@ -0,0 +1,79 @@
+import json
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from cars.models import Car
+from cars.serializers import CarReadSerializer, CarSerializer
+from cars.testing import APITestCase
+
+
+# Кэш ответов отключён: здесь проверяется работа с базой, а не cars.cache
+@override_settings(CARS_RESPONSE_CACHE={'ENABLED': False})
+class CarReadSerializerTestCase(APITestCase):
+    """
+    CarReadSerializer должен давать тот же JSON, что и CarSerializer.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'owner_password')
+        Car.objects.create(
+            make='Toyota', model='Camry', year=2020, price=1500000, mileage=30000, color='White',
+            description='Надёжный седан', owner=cls.owner,
+        )
+        Car.objects.create(make='BMW', model='X5', year=2022, price=Decimal('4500000.5'), is_available=False,
+                           owner=cls.owner)
+        Car.objects.create(make='Lada', model='Vesta', year=2021, price=Decimal('999.99'), owner=cls.owner)
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def assertSameJSON(self, queryset):
+        renderer = JSONRenderer()
+        expected = renderer.render(CarSerializer(queryset.select_related('owner'), many=True).data)
+        rows = queryset.values(*CarReadSerializer.value_fields)
+        self.assertEqual(renderer.render(CarReadSerializer(rows, many=True).data), expected)
+
+    def test_byte_identical_output(self):
+        """
+        Ключи, порядок, цена строкой, даты в ISO 8601 и вложенный owner совпадают побайтно.
+        """
+        self.assertSameJSON(Car.objects.order_by('pk'))
+
+    @override_settings(TIME_ZONE='Europe/Moscow')
+    def test_byte_identical_output_in_local_time_zone(self):
+        """
+        Даты переводятся в текущий часовой пояс так же, как в DateTimeField.
+        """
+        self.assertSameJSON(Car.objects.order_by('pk'))
+        row = CarReadSerializer(Car.objects.values(*CarReadSerializer.value_fields).first()).data
+        self.assertTrue(row['created_at'].endswith('+03:00'))
+
+    def test_views_use_read_serializer(self):
+        """
+        list и retrieve отдают тот же ответ, что и полный сериализатор, и в обоих режимах пагинации.
+        """
+        response = self.client.get(reverse('car-list'), {'ordering': 'price'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        expected = CarSerializer(Car.objects.select_related('owner').order_by('price'), many=True).data
+        self.assertEqual(response.json()['results'], json.loads(JSONRenderer().render(expected)))
+
+        response = self.client.get(reverse('car-list'), {'pagination': 'cursor', 'ordering': 'price'})
+        self.assertEqual([car['price'] for car in response.json()['results']], ['999.99', '1500000.00', '4500000.50'])
+
+        car = Car.objects.get(make='BMW')
+        response = self.client.get(reverse('car-detail', kwargs={'pk': car.pk}))
+        self.assertEqual(response.content, JSONRenderer().render(CarSerializer(car).data))
+
+    def test_schema_still_describes_car_fields(self):
+        """
+        Схема Swagger по-прежнему строится по полям CarSerializer.
+        """
+        response = self.client.get('/swagger/?format=openapi')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('price', response.json()['definitions']['Car']['properties'])
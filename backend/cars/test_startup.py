@@ -0,0 +1,59 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from django.test import SimpleTestCase
+from django.urls import reverse
+
+from cars import prewarm
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Загрузка воркера в профиле settings_api в отдельном процессе: какие модули импортированы после старта
+API_WORKER = '''
+import json, sys
+import car_dealership_backend.wsgi
+from django.conf import settings
+print(json.dumps({
+    'apps': settings.INSTALLED_APPS,
+    'drf_yasg_views': 'drf_yasg.views' in sys.modules,
+    'cars_admin': 'cars.admin' in sys.modules,
+    'resolver_populated': __import__('django.urls', fromlist=['get_resolver']).get_resolver()._populated,
+}))
+'''
+
+
+class StartupTestCase(SimpleTestCase):
+    """
+    Тесты быстрого старта воркеров: ленивая документация, прогрев и профиль settings_api.
+    """
+    def test_warm_up(self):
+        """
+        Прогрев обходит все маршруты и представления DRF; маршруты документации на месте.
+        """
+        stats = prewarm.warm_up()
+        self.assertGreater(stats['routes'], 10)
+        self.assertGreaterEqual(stats['views'], 5)
+        self.assertEqual(reverse('schema-swagger-ui'), '/swagger/')
+
+    def test_api_profile(self):
+        """
+        settings_api без админки и сессий проходит проверки, прогревает URL-резолвер при старте
+        и не импортирует drf_yasg.views и админку cars.
+        """
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': 'car_dealership_backend.settings_api'}
+        check = subprocess.run(
+            [sys.executable, 'manage.py', 'check'], cwd=BACKEND_DIR, env=env, capture_output=True, text=True,
+        )
+        self.assertEqual(check.returncode, 0, check.stderr)
+        worker = subprocess.run(
+            [sys.executable, '-c', API_WORKER], cwd=BACKEND_DIR, env=env, capture_output=True, text=True,
+        )
+        self.assertEqual(worker.returncode, 0, worker.stderr)
+        state = json.loads(worker.stdout)
+        self.assertNotIn('django.contrib.admin', state['apps'])
+        self.assertFalse(state['drf_yasg_views'])
+        self.assertFalse(state['cars_admin'])
+        self.assertTrue(state['resolver_populated'])
@@ -0,0 +1,233 @@
+import os
+import random
+import shutil
+import tempfile
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from cars import summaries
+from cars.models import Car, OwnerSummary, PriceSummary, YearSummary
+from cars.testing import TestCase
+
+MODELS = [('Toyota', 'Camry'), ('Toyota', 'Corolla'), ('BMW', 'X5'), ('Lada', 'Vesta')]
+YEARS = [2018, 2019, 2020]
+
+
+class SummaryTestCase(TestCase):
+    """
+    Тесты сводных таблиц статистики: инкрементальное обновление совпадает с полным пересчётом.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.owners = [User.objects.create_user(f'dealer{i}', f'dealer{i}@example.com', 'password') for i in range(3)]
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'admin_password')
+
+    def assertSummariesMatch(self):
+        for summary in summaries.SUMMARIES:
+            self.assertEqual(summary.stored(), summary.compute(), summary.model.__name__)
+
+    def random_values(self, rng):
+        make, model = rng.choice(MODELS)
+        return {
+            'make': make,
+            'model': model,
+            'year': rng.choice(YEARS),
+            'price': Decimal(rng.randrange(500000, 5000000)) / 100,
+            'mileage': rng.choice([None, rng.randrange(0, 200000)]),
+            'is_available': rng.random() < 0.7,
+        }
+
+    def api_client(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+    def test_random_orm_mutations(self):
+        """
+        Случайные создания, изменения (в том числе с update_fields, смену владельца и экземпляры без загрузки)
+        и удаления через ORM дают те же сводки, что и полный пересчёт.
+        """
+        rng = random.Random(21)
+        for step in range(150):
+            ids = list(Car.objects.values_list('pk', flat=True))
+            action = rng.choice([
+                'create', 'create', 'update', 'update_fields', 'update_unloaded', 'owner', 'delete', 'delete_unloaded',
+            ])
+            if action == 'create' or not ids:
+                Car.objects.create(owner=rng.choice(self.owners), **self.random_values(rng))
+            elif action == 'update':
+                car = Car.objects.get(pk=rng.choice(ids))
+                for name, value in self.random_values(rng).items():
+                    setattr(car, name, value)
+                car.save()
+                # Повторное сохранение того же экземпляра вычитает уже записанные значения
+                car.price += 1
+                car.save()
+            elif action == 'update_fields':
+                car = Car.objects.get(pk=rng.choice(ids))
+                values = self.random_values(rng)
+                fields = rng.sample(sorted(values), 2)
+                for name, value in values.items():
+                    setattr(car, name, value)
+                car.save(update_fields=fields)
+                if rng.random() < 0.5:
+                    # Остальные изменённые поля записываются следующим полным сохранением
+                    car.save()
+            elif action == 'update_unloaded':
+                car = Car.objects.only('id', 'price').get(pk=rng.choice(ids))
+                car.price = Decimal(rng.randrange(500000, 5000000)) / 100
+                car.save()
+            elif action == 'owner':
+                car = Car.objects.get(pk=rng.choice(ids))
+                car.owner = rng.choice(self.owners)
+                car.save()
+            elif action == 'delete_unloaded':
+                Car.objects.only('id').get(pk=rng.choice(ids)).delete()
+            else:
+                Car.objects.get(pk=rng.choice(ids)).delete()
+            if step % 25 == 0:
+                self.assertSummariesMatch()
+        self.assertSummariesMatch()
+
+    def test_random_api_mutations(self):
+        """
+        Случайные одиночные и пакетные операции через API (POST, PATCH, DELETE, /bulk/) сходятся с пересчётом.
+        """
+        rng = random.Random(2021)
+        for step in range(40):
+            owner = rng.choice(self.owners)
+            client = self.api_client(owner)
+            own = list(Car.objects.filter(owner=owner).values_list('pk', flat=True))
+            action = rng.choice(['create', 'bulk_create', 'patch', 'bulk_update', 'delete', 'bulk_delete'])
+            if action in ('create', 'bulk_create') or not own:
+                items = [
+                    {**values, 'price': str(values['price'])}
+                    for values in (self.random_values(rng) for _ in range(rng.randint(1, 5)))
+                ]
+                if action == 'create':
+                    response = client.post(reverse('car-list'), items[0], format='json')
+                else:
+                    response = client.post(reverse('car-bulk'), items, format='json')
+                self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            elif action == 'patch':
+                values = self.random_values(rng)
+                response = client.patch(
+                    reverse('car-detail', args=[rng.choice(own)]),
+                    {'year': values['year'], 'price': str(values['price']), 'is_available': values['is_available']},
+                    format='json',
+                )
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+            elif action == 'bulk_update':
+                items = [
+                    {'id': pk, 'model': rng.choice(MODELS)[1], 'mileage': rng.choice([None, rng.randrange(200000)])}
+                    for pk in rng.sample(own, min(len(own), 3))
+                ]
+                response = client.patch(reverse('car-bulk'), items, format='json')
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+            elif action == 'delete':
+                response = client.delete(reverse('car-detail', args=[rng.choice(own)]))
+                self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+            else:
+                response = client.delete(reverse('car-bulk'), rng.sample(own, min(len(own), 3)), format='json')
+                self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertTrue(Car.objects.exists())
+        self.assertSummariesMatch()
+
+    def test_empty_groups_removed(self):
+        """
+        Группа, из которой ушёл последний автомобиль, удаляется; удаление владельца удаляет его сводку.
+        """
+        car = Car.objects.create(make='BMW', model='X5', year=2022, price=4500000, owner=self.owners[0])
+        self.assertTrue(PriceSummary.objects.filter(make='BMW', year=2022).exists())
+        car.year = 2023
+        car.save()
+        self.assertEqual(list(YearSummary.objects.values_list('year', flat=True)), [2023])
+        self.owners[0].delete()
+        self.assertFalse(PriceSummary.objects.exists())
+        self.assertFalse(OwnerSummary.objects.exists())
+
+    def test_bulk_delete_applies_once(self):
+        """
+        Пакетное удаление применяет изменения сводок одним проходом: по запросу на группу, а не на автомобиль.
+        """
+        owner = self.owners[0]
+        Car.objects.bulk_create([
+            Car(make='Lada', model='Vesta', year=2020, price=1000000, owner=owner, owner_username=owner.username)
+            for _ in range(20)
+        ])
+        summaries.rebuild()
+        ids = list(Car.objects.values_list('pk', flat=True))
+        # Проверка прав и загрузка для удаления (2 SELECT), DELETE, по upsert и DELETE опустевших групп
+        # на каждую из трёх сводок, SAVEPOINT/RELEASE — при любом числе автомобилей
+        with self.assertNumQueries(2 + 1 + 3 * 2 + 2):
+            response = self.api_client(owner).delete(reverse('car-bulk'), ids, format='json')
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertSummariesMatch()
+
+    def test_import_updates_summaries(self):
+        """
+        import_cars (bulk_create и UPDATE в обход сигналов) тоже обновляет сводки.
+        """
+        Car.objects.create(
+            make='Toyota', model='Camry', year=2019, price=1500000, owner=self.owners[0], external_id='A1',
+        )
+        rows = (
+            'external_id,make,model,year,price,mileage\n'
+            'A1,Toyota,Camry,2020,1600000,30000\n'
+            'A2,BMW,X5,2021,4500000,\n'
+        )
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'cars.csv')
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(rows)
+        call_command('import_cars', path, '--owner', 'dealer0', '--key', 'external_id', stdout=StringIO())
+        self.assertEqual(Car.objects.count(), 2)
+        self.assertSummariesMatch()
+
+    def test_rebuild_command(self):
+        """
+        rebuild_summaries исправляет расхождение после QuerySet.update, --check его находит.
+        """
+        Car.objects.create(make='Toyota', model='Camry', year=2019, price=1500000, owner=self.owners[0])
+        Car.objects.update(price=2000000)
+        stdout = StringIO()
+        call_command('rebuild_summaries', '--check', stdout=stdout)
+        self.assertIn('Расходятся', stdout.getvalue())
+        call_command('rebuild_summaries', stdout=StringIO())
+        self.assertSummariesMatch()
+        self.assertEqual(YearSummary.objects.get().price_sum, Decimal('2000000'))
+
+    def test_stats_api(self):
+        """
+        /api/stats/: средние из сумм, фильтры; статистика владельцев только для администраторов.
+        """
+        owner = self.owners[0]
+        for price, mileage, year in ((1000000, 10000, 2019), (2000000, None, 2019), (3000000, 40000, 2020)):
+            Car.objects.create(make='Toyota', model='Camry', year=year, price=price, mileage=mileage, owner=owner)
+        Car.objects.create(make='BMW', model='X5', year=2020, price=5000000, owner=owner, is_available=False)
+
+        client = APIClient()
+        response = client.get(reverse('stats-prices-list'), {'make': 'toyota'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'], [
+            {'make': 'Toyota', 'model': 'Camry', 'year': 2019, 'cars': 2, 'avg_price': '1500000.00', 'avg_mileage': 10000},
+            {'make': 'Toyota', 'model': 'Camry', 'year': 2020, 'cars': 1, 'avg_price': '3000000.00', 'avg_mileage': 40000},
+        ])
+
+        response = client.get(reverse('stats-years-list'), {'year_min': 2020})
+        self.assertEqual(response.data['results'], [
+            {'year': 2020, 'cars': 2, 'avg_price': '4000000.00', 'avg_mileage': 40000},
+        ])
+
+        self.assertEqual(client.get(reverse('stats-owners-list')).status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.api_client(self.admin).get(reverse('stats-owners-list'))
+        self.assertEqual(response.data['results'], [
+            {'owner': owner.username, 'cars': 4, 'available_cars': 3, 'avg_price': '2750000.00'},
+        ])
@@ -0,0 +1,182 @@
+import threading
+import time
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth.models import Group, User
+from django.core.cache import caches
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+
+from cars import cache
+from cars.models import Car
+from cars.throttling import SlidingWindowThrottle
+from cars.testing import APITestCase
+
+RATES = {'anon': '3/min', 'user': '5/min', 'dealer': '10/min'}
+
+
+@override_settings(
+    CARS_THROTTLE={'ENABLED': True},
+    REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': RATES},
+)
+class ThrottleTestCase(APITestCase):
+    """
+    Тесты ограничения частоты: группы клиентов и скользящее окно.
+    """
+    def setUp(self):
+        caches['default'].clear()
+        cache.get_cache().clear()
+        self.user = User.objects.create_user('buyer', 'buyer@example.com', 'buyer_password')
+        self.dealer = User.objects.create_user('dealer', 'dealer@example.com', 'dealer_password')
+        self.dealer.groups.add(Group.objects.create(name='dealers'))
+        Car.objects.create(make='Toyota', model='Camry', year=2020, price=1500000, owner=self.dealer)
+        self.url = reverse('car-list')
+
+    def statuses(self, client, count, **extra):
+        return [client.get(self.url, **extra).status_code for _ in range(count)]
+
+    def test_anonymous_by_ip(self):
+        """
+        Анонимный клиент ограничен по IP: сверх ставки — 429 с Retry-After, другой адрес считается отдельно.
+        """
+        client = APIClient()
+        self.assertEqual(self.statuses(client, 4), [200, 200, 200, 429])
+        response = client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertGreater(int(response['Retry-After']), 0)
+        self.assertEqual(self.statuses(client, 1, REMOTE_ADDR='10.0.0.2'), [200])
+
+    def test_user_and_dealer_rates(self):
+        """
+        Пользователь и дилер ограничиваются каждый своей ставкой, независимо от анонимных запросов.
+        """
+        self.statuses(APIClient(), 3)
+        user_client, dealer_client = APIClient(), APIClient()
+        user_client.force_authenticate(self.user)
+        dealer_client.force_authenticate(self.dealer)
+        self.assertEqual(self.statuses(user_client, 6), [200] * 5 + [429])
+        self.assertEqual(self.statuses(dealer_client, 11), [200] * 10 + [429])
+
+    def test_sliding_window(self):
+        """
+        Запросы прошлого интервала учитываются с весом оставшейся доли окна.
+        """
+        client = APIClient()
+        with mock.patch.object(SlidingWindowThrottle, 'timer', mock.Mock(return_value=600.0)):
+            self.assertEqual(self.statuses(client, 3), [200] * 3)
+        # Середина следующего интервала: 3 * 0.5 + 0 < 3, свободно ещё одно место, затем 3 * 0.5 + 2 >= 3
+        with mock.patch.object(SlidingWindowThrottle, 'timer', mock.Mock(return_value=690.0)):
+            self.assertEqual(self.statuses(client, 2), [200, 200])
+            response = client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        # Вес прошлого интервала должен упасть до 1 / 3: через 10 секунд
+        self.assertEqual(response['Retry-After'], '10')
+
+    @override_settings(CARS_THROTTLE={'ENABLED': False})
+    def test_disabled(self):
+        """
+        При ENABLED = False запросы не ограничиваются.
+        """
+        self.assertEqual(self.statuses(APIClient(), 5), [200] * 5)
+
+
+class SingleFlightTestCase(SimpleTestCase):
+    """
+    Тесты объединения одинаковых одновременных вычислений.
+    """
+    def run_concurrently(self, flights, compute, count=5):
+        results, barrier = [], threading.Barrier(count)
+
+        def call():
+            barrier.wait(5)
+            results.append(flights.do('key', compute, timeout=5))
+
+        threads = [threading.Thread(target=call) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        return threads, results
+
+    def test_followers_share_result(self):
+        """
+        Пока ведущий считает, остальные ждут и получают его результат; compute выполняется один раз.
+        """
+        flights, release, calls = cache.SingleFlight(), threading.Event(), []
+
+        def compute():
+            calls.append(1)
+            release.wait(5)
+            return 'result'
+
+        threads, results = self.run_concurrently(flights, compute)
+        # Потоки стартуют одновременно (Barrier); даём ждущим дойти до flights.do, пока ведущий занят
+        time.sleep(0.2)
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(sorted(results, key=lambda item: item[1]), [('result', False)] * 4 + [('result', True)])
+        self.assertEqual(flights.calls, {})
+
+    def test_leader_failure(self):
+        """
+        Если ведущий упал, ждавшие считают сами, а не получают его исключение.
+        """
+        flights = cache.SingleFlight()
+        started, release = threading.Event(), threading.Event()
+
+        def failing():
+            started.set()
+            release.wait(5)
+            raise RuntimeError
+
+        leader = threading.Thread(target=lambda: self.assertRaises(RuntimeError, flights.do, 'key', failing, 5))
+        leader.start()
+        started.wait(5)
+        follower_result = []
+        follower = threading.Thread(target=lambda: follower_result.append(flights.do('key', lambda: 'own', 5)))
+        follower.start()
+        time.sleep(0.2)
+        release.set()
+        leader.join()
+        follower.join()
+        self.assertEqual(follower_result, [('own', True)])
+
+
+class CoalescedResponseTestCase(APITestCase):
+    """
+    Ответ ждавшего запроса в cached_response.
+    """
+    def setUp(self):
+        cache.get_cache().clear()
+        owner = User.objects.create_user('owner')
+        Car.objects.create(make='Toyota', model='Camry', year=2020, price=1500000, owner=owner)
+
+    def test_follower_gets_leader_data(self):
+        """
+        Ждавший анонимный запрос отдаёт данные ведущего с X-Cache: COALESCED и учитывается в статистике.
+        """
+        def do(key, compute, timeout):
+            # Ответ списка «приходит» от ведущего, валидаторы ETag считаются как обычно
+            if ':list:' in key:
+                return Response({'count': 42}), False
+            return compute(), True
+
+        with mock.patch.object(cache.flights, 'do', side_effect=do):
+            response = self.client.get(reverse('car-list'))
+        self.assertEqual(response['X-Cache'], 'COALESCED')
+        self.assertEqual(response.json(), {'count': 42})
+        self.assertEqual(cache.stats()[cache.COALESCED], 1)
+
+    def test_authenticated_not_coalesced(self):
+        """
+        Запросы пользователей не объединяются: после записи им нужны данные с основной базы.
+        """
+        self.client.force_authenticate(User.objects.get())
+        with mock.patch.object(cache.flights, 'do') as do:
+            response = self.client.get(reverse('car-list'))
+        do.assert_not_called()
+        self.assertEqual(response['X-Cache'], 'MISS')
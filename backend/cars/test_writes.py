@@ -0,0 +1,112 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from cars.models import Car
+from cars.testing import APITestCase
+
+
+# Кэш ответов отключён: здесь проверяется работа с базой, а не cars.cache
+@override_settings(CARS_RESPONSE_CACHE={'ENABLED': False})
+class CarWritePathTestCase(APITestCase):
+    """
+    Тесты записи через CarViewSet: запись только изменённых полей и минимальные ответы.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'owner_password')
+        cls.car = Car.objects.create(
+            make='Toyota', model='Camry', year=2020, price=1500000, color='Black', owner=cls.owner,
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+        self.list_url = reverse('car-list')
+        self.detail_url = reverse('car-detail', args=[self.car.pk])
+
+    def test_unchanged_update_does_not_write(self):
+        """
+        PATCH с теми же значениями не пишет в базу: один SELECT, updated_at прежний.
+        """
+        with self.assertNumQueries(1):
+            response = self.client.patch(self.detail_url, {'year': 2020, 'price': '1500000.00'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Car.objects.get(pk=self.car.pk).updated_at, self.car.updated_at)
+
+    def test_only_changed_fields_written(self):
+        """
+        UPDATE содержит только изменившиеся поля и updated_at; поля вне сводок не трогают сводные таблицы.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(self.detail_url, {'color': 'White', 'year': 2020}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        updates = [query['sql'] for query in queries.captured_queries if query['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"color"', updates[0])
+        self.assertNotIn('"year"', updates[0])
+        self.assertFalse([query for query in queries.captured_queries if 'summary' in query['sql']])
+        self.assertEqual(response.data['color'], 'White')
+
+    def test_full_response_matches_read(self):
+        """
+        Ответ на создание и изменение совпадает с тем, что затем отдаёт GET.
+        """
+        response = self.client.post(
+            self.list_url, {'make': 'BMW', 'model': 'X5', 'year': 2022, 'price': '4500000'}, format='json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        detail_url = reverse('car-detail', args=[response.data['id']])
+        self.assertEqual(response.data, self.client.get(detail_url).data)
+
+        response = self.client.patch(detail_url, {'mileage': 1000}, format='json')
+        self.assertEqual(response.data, self.client.get(detail_url).data)
+
+    def test_minimal_create(self):
+        """
+        POST с Prefer: return=minimal или ?minimal: 201 без тела, адрес нового автомобиля в Location.
+        """
+        data = {'make': 'BMW', 'model': 'X5', 'year': 2022, 'price': '4500000'}
+        response = self.client.post(self.list_url, data, format='json', HTTP_PREFER='respond-async, return=minimal')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['Preference-Applied'], 'return=minimal')
+        car = Car.objects.get(make='BMW')
+        self.assertEqual(response['Location'], 'http://testserver' + reverse('car-detail', args=[car.pk]))
+
+        response = self.client.post(self.list_url + '?minimal', data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.content, b'')
+        self.assertNotIn('Preference-Applied', response)
+
+    def test_minimal_update(self):
+        """
+        PATCH с ?minimal: 204 без тела с ETag новой версии (тот же, что отдаёт GET).
+        """
+        with self.assertNumQueries(5):
+            # SELECT + UPDATE + по upsert в три сводки; ответ не требует запросов
+            response = self.client.patch(self.detail_url + '?minimal', {'price': '1400000.00'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['ETag'], self.client.get(self.detail_url)['ETag'])
+
+    def test_minimal_validation_errors(self):
+        """
+        Ошибки проверки в минимальном режиме отдаются как обычно.
+        """
+        response = self.client.patch(self.detail_url, {'year': 'old'}, format='json', HTTP_PREFER='return=minimal')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('year', response.data)
+
+    def test_minimal_update_requires_owner(self):
+        """
+        Минимальный режим не обходит проверку прав.
+        """
+        other = User.objects.create_user('other', 'other@example.com', 'other_password')
+        self.client.force_authenticate(other)
+        response = self.client.patch(self.detail_url + '?minimal', {'price': '1.00'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
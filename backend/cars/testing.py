@@ -0,0 +1,25 @@
+from django.test import TestCase as DjangoTestCase
+from django.test import TransactionTestCase as DjangoTransactionTestCase
+from django.test import override_settings
+from rest_framework.test import APITestCase as DRFAPITestCase
+
+# Базовые классы тестов приложения cars. Ограничение частоты (cars/throttling.py) в них выключено:
+# тесты шлют десятки запросов с одного адреса, а счётчики в кэше 'default' переживают отдельный тест,
+# так что без этого результат зависел бы от порядка запуска. Тесты троттлинга включают его своим
+# override_settings(CARS_THROTTLE={'ENABLED': True}), который дополняет настройки базового класса.
+NO_THROTTLE = override_settings(CARS_THROTTLE={'ENABLED': False})
+
+
+@NO_THROTTLE
+class TestCase(DjangoTestCase):
+    pass
+
+
+@NO_THROTTLE
+class TransactionTestCase(DjangoTransactionTestCase):
+    pass
+
+
+@NO_THROTTLE
+class APITestCase(DRFAPITestCase):
+    pass
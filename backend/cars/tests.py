@@ -1,8 +1,9 @@
-from rest_framework.test import APITestCase, APIClient
+from rest_framework.test import APIClient
 from rest_framework import status
 from django.urls import reverse
 from django.contrib.auth.models import User
 from cars.models import Car
+from cars.testing import APITestCase
 
 class CarAPITestCase(APITestCase):
     """
@@ -0,0 +1,147 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+# Ограничение частоты запросов (settings.CARS_THROTTLE, ставки — REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']).
+# Клиенты делятся на три группы: анонимные (по IP, scope 'anon'), пользователи с токеном или сессией ('user')
+# и дилеры — участники группы DEALER_GROUP ('dealer'); каждый запрос проверяет ровно одна из них.
+# Выгрузка каталога (CarViewSet.export) дополнительно ограничена своей ставкой 'export' на пользователя.
+# SimpleRateThrottle из DRF хранит список отметок времени всех запросов клиента и на каждый запрос читает
+# и перезаписывает его целиком. Здесь — скользящее окно из двух счётчиков (текущий и предыдущий
+# интервал длиной в период ставки): предыдущий учитывается с весом непрошедшей доли окна.
+# На запрос — одно чтение get_many и один incr, память на клиента постоянна.
+DEFAULTS = {
+    'ENABLED': True,
+    'ALIAS': 'default',  # Алиас из settings.CACHES; при нескольких воркерах нужен общий бэкенд
+    'KEY_PREFIX': 'throttle',
+    'DEALER_GROUP': 'dealers',
+    'DEALER_CACHE_SECONDS': 300,  # Столько секунд кэшируется принадлежность пользователя к группе дилеров
+}
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'CARS_THROTTLE', {})}
+
+
+def is_dealer(request):
+    """
+    Состоит ли пользователь запроса в группе дилеров. Ответ кэшируется, чтобы не делать запрос к auth_group
+    на каждый вызов; смена группы вступает в силу в течение DEALER_CACHE_SECONDS.
+    """
+    if hasattr(request, '_cars_dealer'):
+        return request._cars_dealer
+    config, user = get_config(), request.user
+    cache, key = caches[config['ALIAS']], f'{config["KEY_PREFIX"]}:dealer:{user.pk}'
+    dealer = cache.get(key)
+    if dealer is None:
+        dealer = user.groups.filter(name=config['DEALER_GROUP']).exists()
+        cache.set(key, dealer, config['DEALER_CACHE_SECONDS'])
+    request._cars_dealer = dealer
+    return dealer
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """
+    Базовый класс: ставка по scope, счётчики скользящего окна в кэше CARS_THROTTLE['ALIAS'].
+    Подклассы определяют get_ident_for(request) — идентификатор клиента или None, если группа не его.
+    """
+    def get_rate(self):
+        # Ставки читаются при создании троттлинга, а не при импорте модуля, как в SimpleRateThrottle
+        try:
+            return api_settings.DEFAULT_THROTTLE_RATES[self.scope]
+        except KeyError:
+            raise ImproperlyConfigured(f"No default throttle rate set for '{self.scope}' scope")
+
+    def get_cache_key(self, request, view):
+        ident = self.get_ident_for(request)
+        if ident is None:
+            return None
+        return f'{get_config()["KEY_PREFIX"]}:{self.scope}:{ident}'
+
+    def allow_request(self, request, view):
+        config = get_config()
+        if self.rate is None or not config['ENABLED']:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        cache = caches[config['ALIAS']]
+        self.now = self.timer()
+        window = int(self.now // self.duration)
+        current, previous = f'{self.key}:{window}', f'{self.key}:{window - 1}'
+        counts = cache.get_many([current, previous])
+        self.current_count, self.previous_count = counts.get(current, 0), counts.get(previous, 0)
+        self.elapsed = self.now / self.duration - window  # Прошедшая доля текущего интервала
+        if self.previous_count * (1 - self.elapsed) + self.current_count >= self.num_requests:
+            return self.throttle_failure()
+
+        # Счётчик живёт два интервала: текущий и следующий, где он станет предыдущим
+        if not cache.add(current, 1, timeout=2 * self.duration):
+            try:
+                cache.incr(current)
+            except ValueError:
+                cache.set(current, 1, timeout=2 * self.duration)
+        return True
+
+    def wait(self):
+        """
+        Через сколько секунд оценка окна опустится ниже ставки, если клиент больше ничего не отправит.
+        """
+        if self.current_count >= self.num_requests:
+            # Текущий интервал исчерпан: ждать его конца и ту долю следующего, за которую вес счётчика упадёт
+            fraction = 1 - self.elapsed + 1 - self.num_requests / self.current_count
+        else:
+            # Вес предыдущего интервала должен упасть настолько, чтобы освободился один запрос
+            fraction = 1 - (self.num_requests - self.current_count) / self.previous_count - self.elapsed
+        return max(round(fraction * self.duration, 3), 0.001)
+
+
+class AnonCatalogueThrottle(SlidingWindowThrottle):
+    """
+    Анонимные клиенты, по IP (с учётом X-Forwarded-For и NUM_PROXIES, как в DRF).
+    """
+    scope = 'anon'
+
+    def get_ident_for(self, request):
+        if request.user and request.user.is_authenticated:
+            return None
+        return self.get_ident(request)
+
+
+class UserCatalogueThrottle(SlidingWindowThrottle):
+    """
+    Аутентифицированные пользователи, кроме дилеров, по id пользователя.
+    """
+    scope = 'user'
+
+    def get_ident_for(self, request):
+        if not (request.user and request.user.is_authenticated) or is_dealer(request):
+            return None
+        return request.user.pk
+
+
+class DealerThrottle(SlidingWindowThrottle):
+    """
+    Дилеры (интеграции складов) с повышенной ставкой, по id пользователя.
+    """
+    scope = 'dealer'
+
+    def get_ident_for(self, request):
+        if not (request.user and request.user.is_authenticated) or not is_dealer(request):
+            return None
+        return request.user.pk
+
+
+class ExportThrottle(SlidingWindowThrottle):
+    """
+    Выгрузка всего каталога (/api/cars/export/), по id пользователя, поверх ставки его группы.
+    """
+    scope = 'export'
+
+    def get_ident_for(self, request):
+        if not (request.user and request.user.is_authenticated):
+            return None
+        return request.user.pk
@@ -1,11 +1,21 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import CarViewSet # Импортируем наш ViewSet
+from .views import CarViewSet, MetricsView, OwnerSummaryViewSet, PriceSummaryViewSet, YearSummaryViewSet
+from .async_views import AsyncCarDetailView, AsyncCarListView
 
 # Создаем роутер для автоматической генерации URL-адресов для ViewSet
 router = DefaultRouter()
 router.register(r'cars', CarViewSet) # Регистрируем CarViewSet под префиксом 'cars'
+# Статистика каталога из сводных таблиц (см. cars/summaries.py)
+router.register(r'stats/prices', PriceSummaryViewSet, basename='stats-prices')
+router.register(r'stats/years', YearSummaryViewSet, basename='stats-years')
+router.register(r'stats/owners', OwnerSummaryViewSet, basename='stats-owners')
 
 urlpatterns = [
     path('', include(router.urls)), # Включаем URL-адреса, сгенерированные роутером
+    # Асинхронный путь чтения для ASGI (см. cars/async_views.py)
+    path('async/cars/', AsyncCarListView.as_view(), name='car-async-list'),
+    path('async/cars/<pk>/', AsyncCarDetailView.as_view(), name='car-async-detail'),
+    # Метрики производительности для Prometheus (см. cars/metrics.py)
+    path('metrics/', MetricsView.as_view(), name='metrics'),
 ]
\ No newline at end of file
@@ -1,31 +1,398 @@
-from rest_framework import viewsets, permissions
-from .models import Car
-from .serializers import CarSerializer
+from django_filters.rest_framework import DjangoFilterBackend
+from django.db import transaction
+from django.utils.cache import patch_vary_headers
+from rest_framework import viewsets, permissions, filters, status, exceptions
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from rest_framework.reverse import reverse
+from rest_framework.settings import api_settings
+from rest_framework.views import APIView
+from . import cache, conditional, export, facets, jobs, metrics, routers, summaries
+from .models import Car, OwnerSummary, PriceSummary, YearSummary
+from .serializers import (
+    CarReadSerializer, CarSerializer, OwnerSummarySerializer, PriceSummarySerializer, YearSummarySerializer,
+)
 from .permissions import IsOwner # Импортируем наш новый класс разрешений
-from .filters import CarFilter
+from .filters import CarFilter, PriceSummaryFilter, YearSummaryFilter
+from .pagination import CarPagination
+from .renderers import CATALOGUE_RENDERERS, PrometheusRenderer
+from .search import CarSearchFilter
+from .throttling import ExportThrottle
 
 class CarViewSet(viewsets.ModelViewSet):
     """
     API-представление для модели Car.
     Предоставляет CRUD-операции (создание, чтение, обновление, удаление) для автомобилей.
     """
-    queryset = Car.objects.all().order_by('-created_at') # Получаем все автомобили, отсортированные по дате создания
+    # Получаем все автомобили, отсортированные по дате создания.
+    # Имя владельца хранится в самой строке (Car.owner_username), поэтому JOIN с auth_user не нужен
+    queryset = Car.objects.order_by('-created_at')
     serializer_class = CarSerializer # Используем наш CarSerializer для преобразования данных
+    # SearchFilter заменён на полнотекстовый CarSearchFilter (индекс FTS5 вместо LIKE '%...%')
+    filter_backends = [DjangoFilterBackend, CarSearchFilter, filters.OrderingFilter]
     filterset_class = CarFilter # Класс фильтров
-    search_fields = ['make', 'model', 'description'] # Поля для SearchFilter
+    pagination_class = CarPagination # Постраничная пагинация или курсорная (?pagination=cursor)
+    search_fields = ['make', 'model', 'description'] # Поля для поиска (индексируются в cars_car_fts)
     ordering_fields = ['price', 'year', 'created_at'] # Поля для OrderingFilter
+    # Кроме JSON — столбцовый ?format=compact и, если установлен msgpack, ?format=msgpack (см. cars/renderers.py)
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, *CATALOGUE_RENDERERS]
+    # Для чтения строки выбираются через .values() и сериализуются облегчённым CarReadSerializer
+    read_actions = ['list', 'retrieve']
+    read_serializer_class = CarReadSerializer
+
+    # Действия только для чтения, которые можно обслуживать с реплик (см. cars/routers.py)
+    replica_actions = ['list', 'retrieve', 'export', 'facets']
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        # Аутентификация уже выполнена: недавно писавший пользователь читает с основной базы
+        self.read_db = routers.read_alias(request.user) if self.action in self.replica_actions else None
+        self.read_db_token = routers.set_read_db(self.read_db)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, 'read_db_token', None)
+        if token is not None:
+            routers.reset_read_db(token)
+            self.read_db_token = None
+        if request.method not in permissions.SAFE_METHODS and response.status_code < 400:
+            routers.mark_write(request.user)
+        response = super().finalize_response(request, response, *args, **kwargs)
+        # Формат выбирается и по Accept: общие кэши должны хранить форматы раздельно
+        patch_vary_headers(response, ['Accept'])
+        return response
+
+    def filter_queryset(self, queryset):
+        # Фазы filter / paginate попадают в Server-Timing и метрики (cars/metrics.py)
+        with metrics.phase('filter'):
+            return super().filter_queryset(queryset)
+
+    def paginate_queryset(self, queryset):
+        with metrics.phase('paginate'):
+            return super().paginate_queryset(queryset)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in self.read_actions:
+            return queryset.values(*self.read_serializer_class.value_fields)
+        return queryset
+
+    def get_serializer_class(self):
+        # drf_yasg строит схему по полям CarSerializer (swagger_fake_view), поэтому там оставляем его
+        if self.action in self.read_actions and not getattr(self, 'swagger_fake_view', False):
+            return self.read_serializer_class
+        return super().get_serializer_class()
+
+    # Права доступа по действиям. Таблица общая для всех запросов: get_permissions только создаёт экземпляры
+    # и не переназначает self.permission_classes на каждый запрос
+    owner_or_admin = [permissions.IsAdminUser | IsOwner]
+    action_permissions = {
+        # Для создания автомобиля - пользователь должен быть аутентифицирован (IsAuthenticated).
+        # В пакетных операциях права владельца проверяются одним запросом на весь набор (см. bulk)
+        'create': [permissions.IsAuthenticated],
+        'bulk': [permissions.IsAuthenticated],
+        # Для обновления или удаления - пользователь должен быть владельцем автомобиля или иметь права администратора.
+        # IsOwner сравнивает owner_id, не загружая владельца
+        'update': owner_or_admin,
+        'partial_update': owner_or_admin,
+        'destroy': owner_or_admin,
+        # Выгрузка всего каталога одним ответом - только для аутентифицированных пользователей
+        # (частоту дополнительно ограничивает ExportThrottle, см. get_throttles)
+        'export': [permissions.IsAuthenticated],
+        # Служебная статистика кэша - только для администраторов
+        'cache_stats': [permissions.IsAdminUser],
+    }
+    # Для чтения (list, retrieve) - любой может просматривать
+    permission_classes = [permissions.AllowAny]
 
     def get_permissions(self):
         """
-        Настройка прав доступа в зависимости от действия.
-        """
-        if self.action == 'create':
-            # Для создания автомобиля - пользователь должен быть аутентифицирован (IsAuthenticated)
-            self.permission_classes = [permissions.IsAuthenticated]
-        elif self.action in ['update', 'partial_update', 'destroy']:
-            # Для обновления или удаления - пользователь должен быть владельцем автомобиля или иметь права администратора
-            self.permission_classes = [permissions.IsAdminUser | IsOwner]
-        else:
-            # Для чтения (list, retrieve) - любой может просматривать
-            self.permission_classes = [permissions.AllowAny]
-        return [permission() for permission in self.permission_classes]
\ No newline at end of file
+        Настройка прав доступа в зависимости от действия (action_permissions).
+        """
+        return [permission() for permission in self.action_permissions.get(self.action, self.permission_classes)]
+
+    def get_throttles(self):
+        # Выгрузка каталога, кроме общей ставки группы клиента, ограничена своей ставкой 'export'
+        throttles = super().get_throttles()
+        if self.action == 'export':
+            throttles.append(ExportThrottle())
+        return throttles
+
+    def list(self, request, *args, **kwargs):
+        """
+        Список автомобилей. Поддерживает условные запросы по ETag (If-None-Match),
+        а ответы кэшируются до следующего изменения каталога (см. cars/cache.py).
+        """
+        handler = super().list
+        return conditional.conditional_response(
+            request,
+            validators=lambda: conditional.list_validators(self, request),
+            respond=lambda: cache.cached_response(self, request, handler, *args, **kwargs),
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Детальная информация об автомобиле; условные запросы и кэш работают так же, как для списка.
+        """
+        handler = super().retrieve
+        return conditional.conditional_response(
+            request,
+            validators=lambda: conditional.detail_validators(self, request),
+            respond=lambda: cache.cached_response(self, request, handler, *args, **kwargs),
+        )
+
+    def create(self, request, *args, **kwargs):
+        """
+        Создание автомобиля. С ?minimal или заголовком Prefer: return=minimal ответ — 201 без тела
+        с адресом нового автомобиля в Location: клиенту, которому данные не нужны, не сериализуем их.
+        """
+        if not _prefers_minimal(request):
+            return super().create(request, *args, **kwargs)
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        self.perform_create(serializer)
+        car = serializer.instance
+        return _minimal_response(
+            request, car, status.HTTP_201_CREATED, Location=reverse('car-detail', args=[car.pk], request=request),
+        )
+
+    def update(self, request, *args, **kwargs):
+        """
+        Изменение автомобиля (PUT/PATCH). Записываются только изменившиеся поля (см. CarSerializer.update).
+        С ?minimal или Prefer: return=minimal ответ — 204 без тела с ETag новой версии.
+        """
+        if not _prefers_minimal(request):
+            return super().update(request, *args, **kwargs)
+        serializer = self.get_serializer(self.get_object(), data=request.data, partial=kwargs.get('partial', False))
+        serializer.is_valid(raise_exception=True)
+        self.perform_update(serializer)
+        return _minimal_response(request, serializer.instance, status.HTTP_204_NO_CONTENT)
+
+    @action(detail=False, methods=['get'], url_path='cache-stats')
+    def cache_stats(self, request):
+        """
+        Счётчики попаданий и промахов кэша ответов каталога.
+        """
+        return Response(cache.stats())
+
+    @action(detail=False, methods=['get'])
+    def facets(self, request):
+        """
+        Счётчики для панели фильтров по тем же параметрам, что и список: всего, в наличии / нет,
+        самые частые марки и цвета, гистограммы по годам (?year_bucket=5) и ценам (?price_bins=10).
+        Результат кэшируется до следующего изменения каталога.
+        """
+        options = {
+            'limit': facets.int_param(request, 'facet_limit', facets.FACET_LIMIT, 1, 500),
+            'price_bins': facets.int_param(request, 'price_bins', facets.PRICE_BINS, 1, 100),
+            'year_bucket': facets.int_param(request, 'year_bucket', facets.YEAR_BUCKET, 1, 50),
+        }
+        queryset = self.filter_queryset(self.get_queryset())
+        return Response(cache.cached_value(request, 'facets', lambda: facets.compute_facets(queryset, **options)))
+
+    @action(detail=False, methods=['get'], url_path='export')
+    def export(self, request):
+        """
+        Потоковая выгрузка всего отфильтрованного каталога: ?fmt=ndjson (по умолчанию) или ?fmt=csv.
+        Принимает те же параметры фильтрации, поиска и сортировки, что и список, но без пагинации.
+        Доступна только аутентифицированным пользователям и ограничена ставкой 'export';
+        при заданном CARS_EXPORT['MAX_ROWS'] выборка больше него — 400.
+        (Параметр называется fmt, потому что ?format= в DRF выбирает рендерер ответа.)
+        """
+        export_format = request.query_params.get('fmt', 'ndjson')
+        if export_format not in export.FORMATS:
+            return Response(
+                {'fmt': [f'Choose one of: {", ".join(export.FORMATS)}.']}, status=status.HTTP_400_BAD_REQUEST
+            )
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.read_db:
+            # Строки читаются уже после выхода из представления, когда контекст роутера сброшен
+            queryset = queryset.using(self.read_db)
+        max_rows = export.get_config()['MAX_ROWS']
+        # COUNT(*) по подзапросу с LIMIT: стоимость проверки не растёт вместе с каталогом
+        if max_rows is not None and queryset.order_by()[:max_rows + 1].count() > max_rows:
+            return Response(
+                {'non_field_errors': [f'Export is limited to {max_rows} rows. Narrow the results with filters.']},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return export.export_response(queryset, export_format)
+
+    bulk_max_items = 10000 # Максимум автомобилей в одном пакетном запросе
+
+    @action(detail=False, methods=['post', 'patch', 'delete'], url_path='bulk')
+    def bulk(self, request):
+        """
+        Пакетная синхронизация склада дилера.
+        POST — массив новых автомобилей; PATCH — массив частичных изменений с 'id';
+        DELETE — массив id (или {"ids": [...]}).
+        Операция атомарна: при любой ошибке ничего не записывается, а в ответе — ошибки по каждому элементу
+        в том же порядке, что и во входном массиве ({} для корректных элементов).
+        """
+        data = request.data
+        if request.method == 'DELETE' and isinstance(data, dict):
+            data = data.get('ids')
+        if not isinstance(data, list) or not data:
+            return Response(
+                {'non_field_errors': ['Expected a non-empty list of items.']}, status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(data) > self.bulk_max_items:
+            return Response(
+                {'non_field_errors': [f'Ensure this list has no more than {self.bulk_max_items} items.']},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if request.method == 'POST':
+            return self._bulk_create(data)
+        if request.method == 'PATCH':
+            return self._bulk_update(data)
+        return self._bulk_destroy(data)
+
+    def _bulk_create(self, data):
+        serializer = self.get_serializer(data=data, many=True)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            cars = serializer.save()
+            cache.invalidate()
+            # bulk_create и _update_rows идут в обход сигналов Car, поэтому сводки обновляются здесь
+            summaries.record([(None, summaries.row(car)) for car in cars])
+            jobs.car_changed([car.pk for car in cars])
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    def _bulk_update(self, data):
+        ids = [item.get('id') if isinstance(item, dict) else None for item in data]
+        cars = self._bulk_fetch(ids)
+        errors, status_code = self._bulk_access_errors(ids, cars)
+        if errors:
+            return Response(errors, status=status_code)
+
+        serializer = self.get_serializer(cars, data=data, many=True, partial=True)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            serializer.save()
+            cache.invalidate()
+            summaries.record([(summaries.loaded_row(car), summaries.row(car)) for car in cars.values()])
+            jobs.car_changed(list(cars))
+        return Response(serializer.data)
+
+    def _bulk_destroy(self, ids):
+        cars = self._bulk_fetch(ids, fields=['id', 'owner_id'])
+        errors, status_code = self._bulk_access_errors(ids, cars)
+        if errors:
+            return Response(errors, status=status_code)
+        # Сигналы удаления копят изменения сводок, и те применяются одним проходом на всю пачку
+        with transaction.atomic(), summaries.batch():
+            Car.objects.filter(pk__in=list(cars)).delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    def _bulk_fetch(self, ids, fields=None):
+        """
+        Загружает все затронутые автомобили одним запросом: {id: Car}.
+        """
+        queryset = Car.objects.filter(pk__in=[pk for pk in ids if _is_id(pk)]).order_by()
+        if fields:
+            queryset = queryset.only(*fields)
+        return {car.pk: car for car in queryset}
+
+    def _bulk_access_errors(self, ids, cars):
+        """
+        Проверяет существование и права (IsAdminUser | IsOwner) для всего набора сразу.
+        Возвращает (ошибки по элементам, код ответа) или ([], None), если всё в порядке.
+        """
+        user = self.request.user
+        errors, codes = [], set()
+        for pk in ids:
+            if not _is_id(pk):
+                errors.append({'id': ['A valid integer is required.']})
+                codes.add(status.HTTP_400_BAD_REQUEST)
+            elif pk not in cars:
+                errors.append({'id': [exceptions.NotFound.default_detail]})
+                codes.add(status.HTTP_404_NOT_FOUND)
+            elif not user.is_staff and cars[pk].owner_id != user.pk:
+                errors.append({'id': [exceptions.PermissionDenied.default_detail]})
+                codes.add(status.HTTP_403_FORBIDDEN)
+            else:
+                errors.append({})
+        if not codes:
+            return [], None
+        # Если ошибки разные, отдаём самую «строгую»: 403, затем 404, затем 400
+        return errors, max(codes)
+
+
+class PriceSummaryViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Статистика каталога по марке, модели и году: число автомобилей, средние цена и пробег.
+    Читается из сводной таблицы, которая обновляется при каждом изменении автомобиля (cars/summaries.py),
+    поэтому запрос не агрегирует cars_car.
+    """
+    queryset = PriceSummary.objects.order_by('make', 'model', 'year')
+    serializer_class = PriceSummarySerializer
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filterset_class = PriceSummaryFilter
+    ordering_fields = ['make', 'model', 'year', 'cars']
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, *CATALOGUE_RENDERERS]
+
+
+class YearSummaryViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Статистика каталога по году выпуска: число автомобилей, средние цена и пробег.
+    """
+    queryset = YearSummary.objects.order_by('year')
+    serializer_class = YearSummarySerializer
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filterset_class = YearSummaryFilter
+    ordering_fields = ['year', 'cars']
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, *CATALOGUE_RENDERERS]
+
+
+class OwnerSummaryViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Склады владельцев: всего автомобилей, в наличии и средняя цена (только для администраторов).
+    """
+    queryset = OwnerSummary.objects.select_related('owner').order_by('-cars', 'owner_id')
+    serializer_class = OwnerSummarySerializer
+    permission_classes = [permissions.IsAdminUser]
+    filter_backends = [filters.OrderingFilter]
+    ordering_fields = ['cars', 'available_cars']
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, *CATALOGUE_RENDERERS]
+
+
+class MetricsView(APIView):
+    """
+    Метрики производительности запросов и кэша каталога в формате Prometheus (только для администраторов).
+    """
+    permission_classes = [permissions.IsAdminUser]
+    renderer_classes = [PrometheusRenderer]
+    swagger_schema = None # Служебная точка, в документацию API не попадает
+
+    def get(self, request):
+        counters = cache.stats()
+        extra = [
+            ('cars_response_cache_hits_total', 'counter', 'Response cache hits.', counters[cache.HIT]),
+            ('cars_response_cache_misses_total', 'counter', 'Response cache misses.', counters[cache.MISS]),
+            ('cars_response_cache_coalesced_total', 'counter', 'Misses served from a concurrent identical request.',
+             counters[cache.COALESCED]),
+            ('cars_response_cache_hit_ratio', 'gauge', 'Response cache hit ratio.', counters['hit_ratio']),
+        ]
+        return Response(metrics.registry.render(extra), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+def _is_id(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _prefers_minimal(request):
+    """
+    Клиент просит ответ без тела: параметр ?minimal или заголовок Prefer: return=minimal (RFC 7240).
+    """
+    if 'minimal' in request.query_params:
+        return True
+    preferences = request.headers.get('Prefer', '')
+    return any(
+        preference.split(';')[0].replace(' ', '').lower() == 'return=minimal' for preference in preferences.split(',')
+    )
+
+
+def _minimal_response(request, car, status_code, **headers):
+    response = Response(status=status_code, headers=headers)
+    response['ETag'] = conditional.car_etag(car.pk, car.updated_at)
+    if 'Prefer' in request.headers:
+        response['Preference-Applied'] = 'return=minimal'
+    return response